@@ -13,6 +13,24 @@ class Settings(BaseSettings):
     APP_VERSION: str = "0.0.1"
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    EXECUTOR_MAX_WORKERS: int = 4
+    STREAMING_THRESHOLD_BYTES: int = 2 * 1024 * 1024 * 1024
+    INLINE_RESULT_MAX_ROWS: int = 10_000
+    RESULTS_MAX_BYTES: int = 1024 * 1024 * 1024
+    RESULTS_TTL_SECONDS: float = 24 * 60 * 60
+    INCREMENTAL_STATS_ENABLED: bool = True
+    CATALOG_ENABLED: bool = True
+    CATALOG_MAX_BYTES: int = 64 * 1024 * 1024
+    CATALOG_TTL_SECONDS: float = 7 * 24 * 60 * 60
+    CONVERSION_MODE: str = "background"
+    CONVERSION_MIN_BYTES: int = 16 * 1024 * 1024
+    CONVERSION_MAX_BYTES: int = 8 * 1024 * 1024 * 1024
+    CSV_INFER_SCHEMA_ROWS: int = 10_000
+    SCHEMA_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    PLANNER_ENABLED: bool = True
+    MEMORY_BUDGET_BYTES: int = 4 * 1024 * 1024 * 1024
     model_config = SettingsConfigDict(extra="allow")
 
     @property
@@ -62,3 +80,6 @@ class Settings(BaseSettings):
             logger.warning(f"Invalid storage path: {e}")
 
         return None
+
+
+settings = Settings()
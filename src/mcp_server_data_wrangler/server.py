@@ -1,15 +1,22 @@
+import functools
 from typing import Any, Callable, Coroutine
 
 from mcp import stdio_server, types
 from mcp.server import InitializationOptions, NotificationOptions, Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
+from pydantic import AnyUrl
 
-from .configurations import Settings
+from .configurations import settings
 from .make_logger import make_logger
+from .tools.executor import run_blocking
+from .tools.planner import compute_with_plan
+from .tools.result_catalog import UNCATALOGED_TOOLS, compute_with_catalog
+from .tools.result_store import PARQUET_MIME_TYPE, list_result_resources, read_result_resource
+from .tools.serialization import dumps
 from .tools.tools import MCPServerDataWrangler
 
 logger = make_logger(__name__)
 
-settings = Settings()
 server = Server(settings.APP_NAME)
 
 
@@ -23,6 +30,33 @@ async def list_prompts() -> list[types.Prompt]:
     return []
 
 
+@server.list_resources()
+async def list_resources() -> list[types.Resource]:
+    """List tool results stored as resources by the data-wrangler MCP server.
+
+    Returns:
+        List of stored result resources.
+    """
+    return await run_blocking(list_result_resources)
+
+
+@server.read_resource()
+async def read_resource(uri: AnyUrl) -> list[ReadResourceContents]:
+    """Read a tool result stored as a resource.
+
+    Args:
+        uri: URI of the resource.
+
+    Returns:
+        Content of the resource.
+
+    Raises:
+        ValueError: If the resource does not exist.
+    """
+    content = await run_blocking(read_result_resource, str(uri))
+    return [ReadResourceContents(content=content, mime_type=PARQUET_MIME_TYPE)]
+
+
 @server.list_tools()
 async def list_tools() -> list[types.Tool]:
     """List available tools for the data-wrangler MCP server.
@@ -60,6 +94,17 @@ async def call_tool(
     if tool_name not in tool_handlers:
         raise ValueError(f"Tool {tool_name} not found")
 
+    # Calls are planned to fit the memory budget, and results of tools on unchanged input files are
+    # answered from the persistent catalog
+    tool_to_compute = MCPServerDataWrangler.tool_to_compute()
+    if tool_name in tool_to_compute:
+        compute = functools.partial(compute_with_plan, tool_name, tool_to_compute[tool_name])
+        if settings.CATALOG_ENABLED and tool_name not in UNCATALOGED_TOOLS:
+            result = await run_blocking(compute_with_catalog, tool_name, compute, arguments)
+        else:
+            result = await run_blocking(compute, arguments)
+        return [types.TextContent(type="text", text=dumps(result))]
+
     return await tool_handlers[tool_name](arguments)
 
 
@@ -1,27 +1,48 @@
-from .data_count import DataCountInputSchema, handle_data_count
+from .batch import BatchInputSchema, handle_batch
+from .catalog import CatalogInputSchema, compute_catalog, handle_catalog
+from .data_count import DataCountInputSchema, compute_data_count, handle_data_count
 from .data_estimated_size import (
     DataEstimatedSizeInputSchema,
+    compute_data_estimated_size,
     handle_data_estimated_size,
 )
-from .data_max import DataMaxInputSchema, handle_data_max, handle_data_max_horizontal
+from .data_max import (
+    DataMaxInputSchema,
+    compute_data_max,
+    compute_data_max_horizontal,
+    handle_data_max,
+    handle_data_max_horizontal,
+)
 from .data_mean import (
     DataMeanInputSchema,
+    compute_data_mean,
+    compute_data_mean_horizontal,
     handle_data_mean,
     handle_data_mean_horizontal,
 )
-from .data_median import DataMedianInputSchema, handle_data_median
-from .data_min import DataMinInputSchema, handle_data_min, handle_data_min_horizontal
-from .data_product import DataProductInputSchema, handle_data_product
-from .data_quantile import DataQuantileInputSchema, handle_data_quantile
-from .data_schema import DataSchemaInputSchema, handle_data_schema
-from .data_shape import DataShapeInputSchema, handle_data_shape
-from .data_std import DataStdInputSchema, handle_data_std
-from .data_var import DataVarInputSchema, handle_data_var
-from .describe_data import DescribeDataInputSchema, handle_describe_data
+from .data_median import DataMedianInputSchema, compute_data_median, handle_data_median
+from .data_min import (
+    DataMinInputSchema,
+    compute_data_min,
+    compute_data_min_horizontal,
+    handle_data_min,
+    handle_data_min_horizontal,
+)
+from .data_n_unique import DataNUniqueInputSchema, compute_data_n_unique, handle_data_n_unique
+from .data_product import DataProductInputSchema, compute_data_product, handle_data_product
+from .data_profile import DataProfileInputSchema, compute_data_profile, handle_data_profile
+from .data_quantile import DataQuantileInputSchema, compute_data_quantile, handle_data_quantile
+from .data_schema import DataSchemaInputSchema, compute_data_schema, handle_data_schema
+from .data_shape import DataShapeInputSchema, compute_data_shape, handle_data_shape
+from .data_std import DataStdInputSchema, compute_data_std, handle_data_std
+from .data_var import DataVarInputSchema, compute_data_var, handle_data_var
+from .describe_data import DescribeDataInputSchema, compute_describe_data, handle_describe_data
 from .model import Data
 from .tools import MCPServerDataWrangler
 
 __all__ = [
+    "BatchInputSchema",
+    "CatalogInputSchema",
     "Data",
     "DataCountInputSchema",
     "DataEstimatedSizeInputSchema",
@@ -29,13 +50,36 @@ __all__ = [
     "DataMinInputSchema",
     "DataMeanInputSchema",
     "DataMedianInputSchema",
+    "DataNUniqueInputSchema",
     "DataSchemaInputSchema",
     "DataShapeInputSchema",
     "DescribeDataInputSchema",
     "DataProductInputSchema",
+    "DataProfileInputSchema",
     "DataQuantileInputSchema",
     "MCPServerDataWrangler",
     "DataStdInputSchema",
+    "compute_catalog",
+    "compute_data_count",
+    "compute_data_estimated_size",
+    "compute_data_max",
+    "compute_data_max_horizontal",
+    "compute_data_mean",
+    "compute_data_mean_horizontal",
+    "compute_data_median",
+    "compute_data_min",
+    "compute_data_min_horizontal",
+    "compute_data_n_unique",
+    "compute_data_product",
+    "compute_data_profile",
+    "compute_data_quantile",
+    "compute_data_schema",
+    "compute_data_shape",
+    "compute_data_std",
+    "compute_data_var",
+    "compute_describe_data",
+    "handle_batch",
+    "handle_catalog",
     "handle_data_count",
     "handle_data_estimated_size",
     "handle_data_max",
@@ -45,10 +89,12 @@ __all__ = [
     "handle_data_median",
     "handle_data_min",
     "handle_data_min_horizontal",
+    "handle_data_n_unique",
     "handle_data_schema",
     "handle_data_shape",
     "handle_describe_data",
     "handle_data_product",
+    "handle_data_profile",
     "handle_data_quantile",
     "handle_data_std",
     "tools",
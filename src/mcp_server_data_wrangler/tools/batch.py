@@ -0,0 +1,132 @@
+import asyncio
+import functools
+from typing import Any, Dict, List
+
+from mcp import types
+from pydantic import BaseModel, ConfigDict, Field
+
+from ..make_logger import make_logger
+from ..utils import str_utils
+from .executor import run_blocking
+from .model import Data
+from .planner import compute_with_plan
+from .result_catalog import compute_with_catalog
+from .serialization import dumps
+
+logger = make_logger(__name__)
+
+
+class BatchEntry(BaseModel):
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+    )
+
+    tool: str = Field(description="Name of the tool to call")
+    arguments: Dict[str, Any] = Field(description="Arguments to pass to the tool")
+
+
+class BatchInputSchema(BaseModel):
+    model_config = ConfigDict(
+        validate_assignment=True,
+        frozen=True,
+        extra="forbid",
+    )
+
+    entries: List[BatchEntry] = Field(description="Tool calls to run")
+
+    @staticmethod
+    def input_schema() -> dict:
+        return {
+            "type": "object",
+            "properties": {
+                "entries": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "tool": {
+                                "type": "string",
+                                "description": "Name of the tool to call",
+                            },
+                            "arguments": {
+                                "type": "object",
+                                "description": "Arguments to pass to the tool",
+                            },
+                        },
+                        "required": ["tool", "arguments"],
+                    },
+                    "description": "Tool calls to run. Calls on the same input file share a single load of the file",
+                },
+            },
+            "required": ["entries"],
+        }
+
+    @staticmethod
+    def from_schema(entries: List[Dict[str, Any]]) -> "BatchInputSchema":
+        return BatchInputSchema(entries=[BatchEntry(**entry) for entry in entries])
+
+    @staticmethod
+    def from_args(arguments: dict[str, Any]) -> "BatchInputSchema":
+        entries = arguments["entries"]
+        return BatchInputSchema.from_schema(entries=entries)
+
+
+def compute_batch_group(entries: list[tuple[int, BatchEntry]]) -> list[tuple[int, dict[str, Any]]]:
+    """Run the batch entries that read the same input file, loading the file once.
+
+    Args:
+        entries: Batch entries with their position in the batch.
+
+    Returns:
+        list[tuple[int, dict[str, Any]]]: The result of each entry with its position in the batch.
+    """
+    from .tools import MCPServerDataWrangler
+
+    tool_to_compute = MCPServerDataWrangler.tool_to_compute()
+    results = []
+    with Data.shared_loads():
+        for index, entry in entries:
+            try:
+                if entry.tool not in tool_to_compute:
+                    raise ValueError(f"Tool {entry.tool} not found")
+                compute = functools.partial(compute_with_plan, entry.tool, tool_to_compute[entry.tool])
+                result = {
+                    "tool": entry.tool,
+                    "result": compute_with_catalog(entry.tool, compute, entry.arguments),
+                }
+            except Exception as e:
+                logger.error(f"Error running batch entry {index} ({entry.tool}): {e}")
+                result = {"tool": entry.tool, "error": f"Failed to run {entry.tool}.", "message": str(e)}
+            results.append((index, result))
+    return results
+
+
+async def handle_batch(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    batch_input = BatchInputSchema.from_args(arguments)
+
+    # Entries on the same file run in order on one worker; different files run in parallel
+    groups: dict[str, list[tuple[int, BatchEntry]]] = {}
+    for index, entry in enumerate(batch_input.entries):
+        file_path = str_utils.strip_string(str(entry.arguments.get("input_data_file_path", "")))
+        groups.setdefault(file_path, []).append((index, entry))
+    group_results = await asyncio.gather(*(run_blocking(compute_batch_group, group) for group in groups.values()))
+
+    results: list[dict[str, Any]] = [{} for _ in batch_input.entries]
+    for group_result in group_results:
+        for index, result in group_result:
+            results[index] = result
+
+    return [
+        types.TextContent(
+            type="text",
+            text=dumps(
+                {
+                    "description": "Results of the batched tool calls, in the order they were requested",
+                    "results": results,
+                }
+            ),
+        )
+    ]
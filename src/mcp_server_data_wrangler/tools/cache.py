@@ -0,0 +1,173 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple
+
+import polars as pl
+
+from ..configurations import settings
+from ..make_logger import make_logger
+from ..utils import str_utils
+from .dataset import dataset_files, is_dataset
+
+logger = make_logger(__name__)
+
+
+class FileFingerprint(NamedTuple):
+    path: str
+    size: int
+    mtime_ns: int
+
+    @staticmethod
+    def from_path(file_path: str) -> "FileFingerprint":
+        """Fingerprint a file by its resolved path, size and modification time.
+
+        Args:
+            file_path: Path to the file.
+
+        Returns:
+            FileFingerprint: Fingerprint that changes whenever the file is rewritten or appended to.
+        """
+        if is_dataset(file_path):
+            return FileFingerprint.from_dataset(file_path)
+        path = os.path.realpath(file_path)
+        stat = os.stat(path)
+        return FileFingerprint(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+    @staticmethod
+    def from_dataset(file_path: str) -> "FileFingerprint":
+        """Fingerprint a directory or glob of files by its total size and latest modification time.
+
+        The directories holding the files are included, since adding, removing or renaming a file
+        updates the modification time of its directory.
+
+        Args:
+            file_path: Directory or glob pattern.
+
+        Returns:
+            FileFingerprint: Fingerprint that changes whenever a file of the dataset changes.
+        """
+        files = dataset_files(file_path)
+        stats = [os.stat(path) for path in files]
+        directories = {os.path.dirname(path) for path in files}
+        mtime_ns = max([stat.st_mtime_ns for stat in stats] + [os.stat(path).st_mtime_ns for path in directories])
+        return FileFingerprint(
+            path=os.path.abspath(str_utils.strip_string(file_path)),
+            size=sum(stat.st_size for stat in stats),
+            mtime_ns=mtime_ns,
+        )
+
+
+class DataFrameCache:
+    """Process-wide LRU cache of loaded DataFrames bounded by their estimated in-memory size."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[FileFingerprint, tuple[pl.DataFrame, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: FileFingerprint) -> pl.DataFrame | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: FileFingerprint, df: pl.DataFrame) -> bool:
+        """Insert a DataFrame, evicting least recently used entries to stay within the byte budget.
+
+        Args:
+            key: Fingerprint of the file the DataFrame was loaded from.
+            df: Loaded DataFrame.
+
+        Returns:
+            bool: True if the DataFrame was cached, False if it is larger than the whole budget.
+        """
+        size = int(df.estimated_size())
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {key.path}: {size} bytes exceeds the cache budget of {self.max_bytes} bytes")
+            return False
+        with self._lock:
+            # Entries for older versions of the same file can never be hit again
+            for stale in [k for k in self._entries if k.path == key.path and k != key]:
+                self._remove(stale)
+            if key in self._entries:
+                self._remove(key)
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = (df, size)
+            self.current_bytes += size
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key: FileFingerprint) -> None:
+        _, size = self._entries.pop(key)
+        self.current_bytes -= size
+
+
+def mark_used(path: Path) -> None:
+    """Record a use of a file stored under STORAGE_PATH, whose modification time evict_files orders by.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    os.utime(path)
+
+
+def evict_files(
+    directory: Path, pattern: str, max_bytes: int, keep: Path | None = None, max_age_seconds: float | None = None
+) -> None:
+    """Delete the files of a directory least recently used first, until they fit a byte limit.
+
+    Args:
+        directory: Directory holding the files.
+        pattern: Glob pattern of the files, e.g. *.parquet.
+        max_bytes: Total size of the files to stay within.
+        keep: File never deleted, such as the one just written.
+        max_age_seconds: Files unused for longer are deleted whatever their total size.
+    """
+    files = []
+    for path in directory.glob(pattern):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        files.append((stat.st_mtime_ns, stat.st_size, path))
+    expired_ns = time.time_ns() - int(max_age_seconds * 1e9) if max_age_seconds is not None else 0
+    total = sum(size for _, size, _ in files)
+    for mtime_ns, size, path in sorted(files):
+        if mtime_ns >= expired_ns and total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        path.unlink(missing_ok=True)
+        total -= size
+        logger.debug(f"Evicted {path}")
+
+
+dataframe_cache = DataFrameCache(max_bytes=settings.CACHE_MAX_BYTES)
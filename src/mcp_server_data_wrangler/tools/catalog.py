@@ -0,0 +1,120 @@
+from typing import Any, Optional
+
+from mcp import types
+from pydantic import BaseModel, ConfigDict, Field
+
+from .executor import run_blocking
+from .result_catalog import get_catalog
+from .serialization import dumps
+
+CATALOG_ACTIONS = ["stats", "list", "purge"]
+
+
+class CatalogInputSchema(BaseModel):
+    model_config = ConfigDict(
+        validate_assignment=True,
+        frozen=True,
+        extra="forbid",
+    )
+
+    action: str = Field(default="stats", description="One of: 'stats', 'list', 'purge'")
+    tool: Optional[str] = Field(default=None, description="Only results of this tool")
+    input_data_file_path: Optional[str] = Field(default=None, description="Only results for this input file")
+    expired_only: bool = Field(default=False, description="Only purge results past their time to live")
+    limit: int = Field(default=100, description="Maximum number of results to list", ge=1)
+
+    @staticmethod
+    def input_schema() -> dict:
+        return {
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "enum": CATALOG_ACTIONS,
+                    "description": "'stats' reports the size of the result catalog, 'list' shows stored results "
+                    "and 'purge' deletes them",
+                    "default": "stats",
+                },
+                "tool": {
+                    "type": "string",
+                    "description": "Only list or purge results of this tool",
+                },
+                "input_data_file_path": {
+                    "type": "string",
+                    "description": "Only list or purge results for this input file",
+                },
+                "expired_only": {
+                    "type": "boolean",
+                    "description": "Only purge results past their time to live",
+                    "default": False,
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results to list, most recently used first",
+                    "minimum": 1,
+                    "default": 100,
+                },
+            },
+        }
+
+    @staticmethod
+    def from_schema(
+        action: str = "stats",
+        tool: Optional[str] = None,
+        input_data_file_path: Optional[str] = None,
+        expired_only: bool = False,
+        limit: int = 100,
+    ) -> "CatalogInputSchema":
+        if action not in CATALOG_ACTIONS:
+            raise ValueError(f"Invalid action: {action}")
+        return CatalogInputSchema(
+            action=action,
+            tool=tool,
+            input_data_file_path=input_data_file_path,
+            expired_only=expired_only,
+            limit=limit,
+        )
+
+    @staticmethod
+    def from_args(arguments: dict[str, Any]) -> "CatalogInputSchema":
+        return CatalogInputSchema.from_schema(
+            action=arguments.get("action", "stats"),
+            tool=arguments.get("tool"),
+            input_data_file_path=arguments.get("input_data_file_path"),
+            expired_only=arguments.get("expired_only", False),
+            limit=arguments.get("limit", 100),
+        )
+
+
+def compute_catalog(arguments: dict[str, Any]) -> dict[str, Any]:
+    catalog_input = CatalogInputSchema.from_args(arguments)
+    catalog = get_catalog()
+    if catalog_input.action == "list":
+        return {
+            "description": "Results stored in the catalog, most recently used first",
+            "results": catalog.entries(
+                tool=catalog_input.tool,
+                file_path=catalog_input.input_data_file_path,
+                limit=catalog_input.limit,
+            ),
+        }
+    if catalog_input.action == "purge":
+        purged = catalog.purge(
+            tool=catalog_input.tool,
+            file_path=catalog_input.input_data_file_path,
+            expired_only=catalog_input.expired_only,
+        )
+        return {"description": "Results deleted from the catalog", "purged": purged, **catalog.stats()}
+    return {"description": "Size and limits of the result catalog", **catalog.stats()}
+
+
+async def handle_catalog(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    catalog_dict = await run_blocking(compute_catalog, arguments)
+    return [
+        types.TextContent(
+            type="text",
+            text=dumps(catalog_dict),
+        )
+    ]
@@ -1,10 +1,17 @@
-import json
 from typing import Any
 
 from mcp import types
 from pydantic import ConfigDict
 
+from .dataset import dataset_properties
+from .executor import run_blocking
+from .incremental import INCREMENTAL_PATH, incremental_file_stats
 from .model import Data
+from .parquet_metadata import SCAN_PATH, ParquetFooter, aggregate_with_footer, has_parquet_footer
+from .predicate import filter_properties
+from .projection import projection_properties
+from .schema_cache import dtypes_properties
+from .serialization import dumps
 
 
 class DataCountInputSchema(Data):
@@ -22,37 +29,103 @@ class DataCountInputSchema(Data):
             "properties": {
                 "input_data_file_path": {
                     "type": "string",
-                    "description": "Path to the input data file",
+                    "description": "Path to the input data file, or a directory or glob of files",
+                },
+                **dataset_properties(),
+                **projection_properties(),
+                **filter_properties(),
+                **dtypes_properties(),
+                "streaming": {
+                    "type": "boolean",
+                    "description": "Aggregate in batches with the streaming engine so files larger than memory can be "
+                    "processed. Chosen automatically from the file size when omitted",
                 },
             },
         }
 
     @staticmethod
-    def from_schema(input_data_file_path: str) -> "DataCountInputSchema":
-        data = Data.from_file(input_data_file_path)
-        return DataCountInputSchema(df=data.df)
+    def from_schema(
+        input_data_file_path: str,
+        streaming: bool | None = None,
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> "DataCountInputSchema":
+        data = Data.from_file(
+            input_data_file_path,
+            streaming=streaming,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
+        return DataCountInputSchema(lf=data.lf, streaming=data.streaming)
 
     @staticmethod
     def from_args(arguments: dict[str, Any]) -> "DataCountInputSchema":
         input_data_file_path = arguments["input_data_file_path"]
-        return DataCountInputSchema.from_schema(input_data_file_path=input_data_file_path)
+        partitions = arguments.get("partitions")
+        columns = arguments.get("columns")
+        row_filter = arguments.get("filter")
+        dtypes = arguments.get("dtypes")
+        streaming = arguments.get("streaming")
+        return DataCountInputSchema.from_schema(
+            input_data_file_path=input_data_file_path,
+            streaming=streaming,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
 
 
-async def handle_data_count(
-    arguments: dict[str, Any],
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-    data_count_input = DataCountInputSchema.from_args(arguments)
-    count_df = data_count_input.df.count()
+def compute_data_count(arguments: dict[str, Any]) -> dict[str, Any]:
+    input_data_file_path = arguments["input_data_file_path"]
+    if has_parquet_footer(
+        input_data_file_path, arguments.get("partitions"), arguments.get("filter"), arguments.get("dtypes")
+    ):
+        footer = ParquetFooter.from_file(input_data_file_path)
+        counts, path = aggregate_with_footer(
+            input_data_file_path,
+            footer,
+            {col: footer.num_rows - null_count for col, null_count in footer.null_counts.items()},
+            lambda lf: lf.count(),
+            streaming=arguments.get("streaming"),
+            columns=arguments.get("columns"),
+        )
+    elif (
+        stats := incremental_file_stats(
+            input_data_file_path,
+            arguments.get("partitions"),
+            arguments.get("columns"),
+            arguments.get("filter"),
+            arguments.get("dtypes"),
+        )
+    ) is not None:
+        counts, path = {col: col_stats.non_null for col, col_stats in stats.columns.items()}, INCREMENTAL_PATH
+    else:
+        data_count_input = DataCountInputSchema.from_args(arguments)
+        count_df = data_count_input.collect(data_count_input.lf.count())
+        counts, path = dict(zip(count_df.columns, count_df.row(0))), SCAN_PATH
 
     # Convert the DataFrame to a dictionary format
     count_dict = {
         "description": "Number of non-null elements for each column",
-        "counts": {col: int(val) for col, val in zip(count_df.columns, count_df.row(0))},
+        "counts": {col: int(val) for col, val in counts.items()},
+        "execution_path": path,
     }
 
+    return count_dict
+
+
+async def handle_data_count(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    count_dict = await run_blocking(compute_data_count, arguments)
     return [
         types.TextContent(
             type="text",
-            text=json.dumps(count_dict),
+            text=dumps(count_dict),
         )
     ]
@@ -1,10 +1,17 @@
-import json
 from typing import Any
 
 from mcp import types
 from pydantic import ConfigDict, Field
 
+from .dataset import dataset_properties
+from .executor import run_blocking
 from .model import Data
+from .parquet_metadata import SCAN_PATH
+from .predicate import filter_properties
+from .projection import projection_properties
+from .schema_cache import dtypes_properties
+from .serialization import dumps
+from .size_estimate import PREFIX_PATH, SIZE_UNITS, SizeEstimate, estimate_file_size, scale_size
 
 
 class DataEstimatedSizeInputSchema(Data):
@@ -27,11 +34,15 @@ class DataEstimatedSizeInputSchema(Data):
             "properties": {
                 "input_data_file_path": {
                     "type": "string",
-                    "description": "Path to the input data file",
+                    "description": "Path to the input data file, or a directory or glob of files",
                 },
+                **dataset_properties(),
+                **projection_properties(),
+                **filter_properties(),
+                **dtypes_properties(),
                 "unit": {
                     "type": "string",
-                    "enum": ["b", "kb", "mb", "gb", "tb"],
+                    "enum": SIZE_UNITS,
                     "description": "Unit for the estimated size",
                     "default": "b",
                 },
@@ -42,38 +53,74 @@ class DataEstimatedSizeInputSchema(Data):
     def from_schema(
         input_data_file_path: str,
         unit: str = "b",
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
     ) -> "DataEstimatedSizeInputSchema":
-        data = Data.from_file(input_data_file_path)
+        data = Data.from_file(
+            input_data_file_path, partitions=partitions, columns=columns, row_filter=row_filter, dtypes=dtypes
+        )
         return DataEstimatedSizeInputSchema(
-            df=data.df,
+            lf=data.lf,
+            streaming=data.streaming,
             unit=unit,
         )
 
     @staticmethod
     def from_args(arguments: dict[str, Any]) -> "DataEstimatedSizeInputSchema":
         input_data_file_path = arguments["input_data_file_path"]
+        partitions = arguments.get("partitions")
+        columns = arguments.get("columns")
+        row_filter = arguments.get("filter")
+        dtypes = arguments.get("dtypes")
         unit = arguments.get("unit", "b")
         return DataEstimatedSizeInputSchema.from_schema(
             input_data_file_path=input_data_file_path,
             unit=unit,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
         )
 
 
-async def handle_data_estimated_size(
-    arguments: dict[str, Any],
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-    data_estimated_size_input = DataEstimatedSizeInputSchema.from_args(arguments)
-    estimated_size = data_estimated_size_input.df.estimated_size(unit=data_estimated_size_input.unit)
+def compute_data_estimated_size(arguments: dict[str, Any]) -> dict[str, Any]:
+    unit = arguments.get("unit", "b")
+    estimate = estimate_file_size(
+        arguments["input_data_file_path"],
+        arguments.get("partitions"),
+        arguments.get("columns"),
+        arguments.get("filter"),
+        arguments.get("dtypes"),
+    )
+    if estimate is not None:
+        path = PREFIX_PATH
+    else:
+        data_estimated_size_input = DataEstimatedSizeInputSchema.from_args(arguments)
+        df = data_estimated_size_input.collect(data_estimated_size_input.lf)
+        estimate = SizeEstimate(column_sizes={col: df[col].estimated_size() for col in df.columns}, exact=True)
+        path = SCAN_PATH
 
     result_dict = {
         "description": "Estimated size of the input data",
-        "size": estimated_size,
-        "unit": data_estimated_size_input.unit,
+        "size": scale_size(estimate.total, unit),
+        "unit": unit,
+        "column_sizes": {col: scale_size(size, unit) for col, size in estimate.column_sizes.items()},
+        "exact": estimate.exact,
+        "execution_path": path,
     }
 
+    return result_dict
+
+
+async def handle_data_estimated_size(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    result_dict = await run_blocking(compute_data_estimated_size, arguments)
     return [
         types.TextContent(
             type="text",
-            text=json.dumps(result_dict),
+            text=dumps(result_dict),
         )
     ]
@@ -1,11 +1,20 @@
-import json
 from typing import Any
 
+import polars as pl
 from mcp import types
-from pydantic import ConfigDict
+from pydantic import ConfigDict, Field
 
 from ..make_logger import make_logger
+from .dataset import dataset_properties
+from .executor import run_blocking
+from .incremental import INCREMENTAL_PATH, incremental_file_stats
 from .model import Data
+from .parquet_metadata import SCAN_PATH, ParquetFooter, aggregate_with_footer, has_parquet_footer
+from .predicate import filter_properties
+from .projection import projection_properties
+from .result_store import OUTPUT_MODES, should_spill, spill_result
+from .schema_cache import dtypes_properties
+from .serialization import dumps, series_to_list, to_json_value
 
 logger = make_logger(__name__)
 
@@ -18,6 +27,11 @@ class DataMaxInputSchema(Data):
         arbitrary_types_allowed=True,
     )
 
+    output: str = Field(
+        default="auto",
+        description="How per-row results of the horizontal variant are returned. One of: 'auto', 'inline', 'resource'",
+    )
+
     @staticmethod
     def input_schema() -> dict:
         return {
@@ -25,71 +39,153 @@ class DataMaxInputSchema(Data):
             "properties": {
                 "input_data_file_path": {
                     "type": "string",
-                    "description": "Path to the input data file",
+                    "description": "Path to the input data file, or a directory or glob of files",
+                },
+                **dataset_properties(),
+                **projection_properties(),
+                **filter_properties(),
+                **dtypes_properties(),
+                "streaming": {
+                    "type": "boolean",
+                    "description": "Aggregate in batches with the streaming engine so files larger than memory can be "
+                    "processed. Chosen automatically from the file size when omitted",
+                },
+                "output": {
+                    "type": "string",
+                    "enum": OUTPUT_MODES,
+                    "description": "How the per-row results of the horizontal variant are returned: inline JSON, or a "
+                    "Parquet resource with a summary. 'auto' uses a resource for large results",
+                    "default": "auto",
                 },
             },
         }
 
     @staticmethod
-    def from_schema(input_data_file_path: str) -> "DataMaxInputSchema":
-        data = Data.from_file(input_data_file_path)
-        return DataMaxInputSchema(df=data.df)
+    def from_schema(
+        input_data_file_path: str,
+        streaming: bool | None = None,
+        output: str = "auto",
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> "DataMaxInputSchema":
+        data = Data.from_file(
+            input_data_file_path,
+            streaming=streaming,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
+        return DataMaxInputSchema(
+            lf=data.lf,
+            streaming=data.streaming,
+            output=output,
+        )
 
     @staticmethod
     def from_args(arguments: dict[str, Any]) -> "DataMaxInputSchema":
         input_data_file_path = arguments["input_data_file_path"]
-        return DataMaxInputSchema.from_schema(input_data_file_path=input_data_file_path)
+        partitions = arguments.get("partitions")
+        columns = arguments.get("columns")
+        row_filter = arguments.get("filter")
+        dtypes = arguments.get("dtypes")
+        streaming = arguments.get("streaming")
+        output = arguments.get("output", "auto")
+        return DataMaxInputSchema.from_schema(
+            input_data_file_path=input_data_file_path,
+            streaming=streaming,
+            output=output,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
 
 
-async def handle_data_max(
-    arguments: dict[str, Any],
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-    data_max_input = DataMaxInputSchema.from_args(arguments)
-    max_df = data_max_input.df.max()
+def compute_data_max(arguments: dict[str, Any]) -> dict[str, Any]:
+    input_data_file_path = arguments["input_data_file_path"]
+    if has_parquet_footer(
+        input_data_file_path, arguments.get("partitions"), arguments.get("filter"), arguments.get("dtypes")
+    ):
+        footer = ParquetFooter.from_file(input_data_file_path)
+        max_values, path = aggregate_with_footer(
+            input_data_file_path,
+            footer,
+            footer.max_values,
+            lambda lf: lf.max(),
+            streaming=arguments.get("streaming"),
+            columns=arguments.get("columns"),
+        )
+    elif (
+        stats := incremental_file_stats(
+            input_data_file_path,
+            arguments.get("partitions"),
+            arguments.get("columns"),
+            arguments.get("filter"),
+            arguments.get("dtypes"),
+        )
+    ) is not None:
+        max_values, path = {col: col_stats.max for col, col_stats in stats.columns.items()}, INCREMENTAL_PATH
+    else:
+        data_max_input = DataMaxInputSchema.from_args(arguments)
+        max_df = data_max_input.collect(data_max_input.lf.max())
+        max_values, path = dict(zip(max_df.columns, max_df.row(0))), SCAN_PATH
 
     # Convert the DataFrame to a dictionary format
     max_dict = {
         "description": "Maximum values for each column",
-        "max_values": {col: str(val) if val is not None else None for col, val in zip(max_df.columns, max_df.row(0))},
+        "max_values": {col: to_json_value(val) for col, val in max_values.items()},
+        "execution_path": path,
     }
 
+    return max_dict
+
+
+async def handle_data_max(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    max_dict = await run_blocking(compute_data_max, arguments)
     return [
         types.TextContent(
             type="text",
-            text=json.dumps(max_dict),
+            text=dumps(max_dict),
         )
     ]
 
 
-async def handle_data_max_horizontal(
-    arguments: dict[str, Any],
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+def compute_data_max_horizontal(arguments: dict[str, Any]) -> dict[str, Any]:
     data_max_input = DataMaxInputSchema.from_args(arguments)
     try:
-        max_horizontal_df = data_max_input.df.max_horizontal()
+        max_horizontal_df = data_max_input.collect(data_max_input.lf.select(pl.max_horizontal(pl.all()))).to_series()
+
+        if should_spill(max_horizontal_df.len(), data_max_input.output):
+            return {
+                "description": "Maximum values across columns for each row",
+                **spill_result(max_horizontal_df, "data_max_horizontal"),
+            }
 
         # Convert the DataFrame to a dictionary format
-        max_horizontal_dict = {
+        return {
             "description": "Maximum values across columns for each row",
-            "max_values": {str(i): str(val) if val is not None else None for i, val in enumerate(max_horizontal_df)},
+            "max_values": dict(zip(map(str, range(max_horizontal_df.len())), series_to_list(max_horizontal_df))),
         }
-
-        return [
-            types.TextContent(
-                type="text",
-                text=json.dumps(max_horizontal_dict),
-            )
-        ]
     except Exception as e:
         logger.error(f"Error calculating max: {e}")
-        return [
-            types.TextContent(
-                type="text",
-                text=json.dumps(
-                    {
-                        "error": "Failed to calculate max values.",
-                        "message": str(e),
-                    }
-                ),
-            )
-        ]
+        return {
+            "error": "Failed to calculate max values.",
+            "message": str(e),
+        }
+
+
+async def handle_data_max_horizontal(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    max_horizontal_dict = await run_blocking(compute_data_max_horizontal, arguments)
+    return [
+        types.TextContent(
+            type="text",
+            text=dumps(max_horizontal_dict),
+        )
+    ]
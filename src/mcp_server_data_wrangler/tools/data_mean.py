@@ -1,11 +1,21 @@
-import json
 from typing import Any
 
+import polars as pl
 from mcp import types
-from pydantic import ConfigDict
+from pydantic import ConfigDict, Field
 
 from ..make_logger import make_logger
+from .dataset import dataset_properties
+from .executor import run_blocking
+from .incremental import INCREMENTAL_PATH, incremental_file_stats
 from .model import Data
+from .parquet_metadata import SCAN_PATH
+from .predicate import filter_properties
+from .projection import projection_properties
+from .result_store import OUTPUT_MODES, should_spill, spill_result
+from .sampling import SampleSpec, estimate_means, estimates_to_dict, sample_file, sample_properties
+from .schema_cache import dtypes_properties
+from .serialization import dumps, row_to_dict, series_to_list, to_json_value
 
 logger = make_logger(__name__)
 
@@ -18,6 +28,11 @@ class DataMeanInputSchema(Data):
         arbitrary_types_allowed=True,
     )
 
+    output: str = Field(
+        default="auto",
+        description="How per-row results of the horizontal variant are returned. One of: 'auto', 'inline', 'resource'",
+    )
+
     @staticmethod
     def input_schema() -> dict:
         return {
@@ -25,73 +40,173 @@ class DataMeanInputSchema(Data):
             "properties": {
                 "input_data_file_path": {
                     "type": "string",
-                    "description": "Path to the input data file",
+                    "description": "Path to the input data file, or a directory or glob of files",
+                },
+                **dataset_properties(),
+                **projection_properties(),
+                **filter_properties(),
+                **dtypes_properties(),
+                "streaming": {
+                    "type": "boolean",
+                    "description": "Aggregate in batches with the streaming engine so files larger than memory can be "
+                    "processed. Chosen automatically from the file size when omitted",
+                },
+                "output": {
+                    "type": "string",
+                    "enum": OUTPUT_MODES,
+                    "description": "How the per-row results of the horizontal variant are returned: inline JSON, or a "
+                    "Parquet resource with a summary. 'auto' uses a resource for large results",
+                    "default": "auto",
                 },
+                **sample_properties(),
             },
         }
 
     @staticmethod
-    def from_schema(input_data_file_path: str) -> "DataMeanInputSchema":
-        data = Data.from_file(input_data_file_path)
-        return DataMeanInputSchema(df=data.df)
+    def from_schema(
+        input_data_file_path: str,
+        streaming: bool | None = None,
+        output: str = "auto",
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> "DataMeanInputSchema":
+        data = Data.from_file(
+            input_data_file_path,
+            streaming=streaming,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
+        return DataMeanInputSchema(
+            lf=data.lf,
+            streaming=data.streaming,
+            output=output,
+        )
 
     @staticmethod
     def from_args(arguments: dict[str, Any]) -> "DataMeanInputSchema":
         input_data_file_path = arguments["input_data_file_path"]
-        return DataMeanInputSchema.from_schema(input_data_file_path=input_data_file_path)
+        partitions = arguments.get("partitions")
+        columns = arguments.get("columns")
+        row_filter = arguments.get("filter")
+        dtypes = arguments.get("dtypes")
+        streaming = arguments.get("streaming")
+        output = arguments.get("output", "auto")
+        return DataMeanInputSchema.from_schema(
+            input_data_file_path=input_data_file_path,
+            streaming=streaming,
+            output=output,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
 
 
-async def handle_data_mean(
-    arguments: dict[str, Any],
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-    data_mean_input = DataMeanInputSchema.from_args(arguments)
-    mean_df = data_mean_input.df.mean()
+def compute_data_mean(arguments: dict[str, Any]) -> dict[str, Any]:
+    sample_spec = SampleSpec.from_args(arguments)
+    if sample_spec is not None:
+        return compute_sampled_mean(
+            arguments["input_data_file_path"],
+            sample_spec,
+            arguments.get("partitions"),
+            arguments.get("columns"),
+            arguments.get("filter"),
+            arguments.get("dtypes"),
+        )
+
+    stats = incremental_file_stats(
+        arguments["input_data_file_path"],
+        arguments.get("partitions"),
+        arguments.get("columns"),
+        arguments.get("filter"),
+        arguments.get("dtypes"),
+    )
+    if stats is not None:
+        mean_values = {col: to_json_value(col_stats.mean()) for col, col_stats in stats.columns.items()}
+        path = INCREMENTAL_PATH
+    else:
+        data_mean_input = DataMeanInputSchema.from_args(arguments)
+        mean_values = row_to_dict(data_mean_input.collect(data_mean_input.lf.mean()))
+        path = SCAN_PATH
 
     # Convert the DataFrame to a dictionary format
     mean_dict = {
         "description": "Mean values for each column",
-        "mean_values": {
-            col: str(val) if val is not None else None for col, val in zip(mean_df.columns, mean_df.row(0))
-        },
+        "mean_values": mean_values,
+        "execution_path": path,
     }
 
+    return mean_dict
+
+
+def compute_sampled_mean(
+    input_data_file_path: str,
+    sample_spec: SampleSpec,
+    partitions: dict[str, Any] | None = None,
+    columns: list[str | dict[str, str]] | None = None,
+    row_filter: dict[str, Any] | None = None,
+    dtypes: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    sample = sample_file(input_data_file_path, sample_spec, partitions, columns, row_filter, dtypes)
+    estimates = estimates_to_dict(estimate_means(sample), sample.critical_value)
+    return {
+        "description": "Mean values for each column estimated from a random sample",
+        "mean_values": estimates["values"],
+        "standard_errors": estimates["standard_errors"],
+        "confidence_intervals": estimates["confidence_intervals"],
+        "sample": sample.summary(),
+    }
+
+
+async def handle_data_mean(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    mean_dict = await run_blocking(compute_data_mean, arguments)
     return [
         types.TextContent(
             type="text",
-            text=json.dumps(mean_dict),
+            text=dumps(mean_dict),
         )
     ]
 
 
-async def handle_data_mean_horizontal(
-    arguments: dict[str, Any],
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+def compute_data_mean_horizontal(arguments: dict[str, Any]) -> dict[str, Any]:
     data_mean_input = DataMeanInputSchema.from_args(arguments)
     try:
-        mean_horizontal_df = data_mean_input.df.mean_horizontal()
+        mean_horizontal_df = data_mean_input.collect(
+            data_mean_input.lf.select(pl.mean_horizontal(pl.all()))
+        ).to_series()
+
+        if should_spill(mean_horizontal_df.len(), data_mean_input.output):
+            return {
+                "description": "Mean values across columns for each row",
+                **spill_result(mean_horizontal_df, "data_mean_horizontal"),
+            }
 
         # Convert the DataFrame to a dictionary format
-        mean_horizontal_dict = {
+        return {
             "description": "Mean values across columns for each row",
-            "mean_values": {str(i): str(val) if val is not None else None for i, val in enumerate(mean_horizontal_df)},
+            "mean_values": dict(zip(map(str, range(mean_horizontal_df.len())), series_to_list(mean_horizontal_df))),
         }
-
-        return [
-            types.TextContent(
-                type="text",
-                text=json.dumps(mean_horizontal_dict),
-            )
-        ]
     except Exception as e:
         logger.error(f"Error calculating mean: {e}")
-        return [
-            types.TextContent(
-                type="text",
-                text=json.dumps(
-                    {
-                        "error": "Failed to calculate mean values.",
-                        "message": str(e),
-                    }
-                ),
-            )
-        ]
+        return {
+            "error": "Failed to calculate mean values.",
+            "message": str(e),
+        }
+
+
+async def handle_data_mean_horizontal(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    mean_horizontal_dict = await run_blocking(compute_data_mean_horizontal, arguments)
+    return [
+        types.TextContent(
+            type="text",
+            text=dumps(mean_horizontal_dict),
+        )
+    ]
@@ -1,11 +1,17 @@
-import json
 from typing import Any
 
 from mcp import types
-from pydantic import ConfigDict
+from pydantic import ConfigDict, Field
 
 from ..make_logger import make_logger
+from .dataset import dataset_properties
+from .executor import run_blocking
 from .model import Data
+from .predicate import filter_properties
+from .projection import projection_properties
+from .quantiles import approximate_quantile_frame
+from .schema_cache import dtypes_properties
+from .serialization import dumps, row_to_dict
 
 logger = make_logger(__name__)
 
@@ -18,6 +24,14 @@ class DataMedianInputSchema(Data):
         arbitrary_types_allowed=True,
     )
 
+    approximate: bool = Field(
+        default=False,
+        description="Estimate the median with KLL sketches built in one streaming pass instead of sorting",
+    )
+    rank_error: float = Field(
+        default=0.01, description="Target normalized rank error of the approximate median", gt=0.0, lt=1.0
+    )
+
     @staticmethod
     def input_schema() -> dict:
         return {
@@ -25,39 +39,101 @@ class DataMedianInputSchema(Data):
             "properties": {
                 "input_data_file_path": {
                     "type": "string",
-                    "description": "Path to the input data file",
+                    "description": "Path to the input data file, or a directory or glob of files",
+                },
+                **dataset_properties(),
+                **projection_properties(),
+                **filter_properties(),
+                **dtypes_properties(),
+                "approximate": {
+                    "type": "boolean",
+                    "description": "Estimate the median of numeric columns with mergeable KLL sketches built in one "
+                    "streaming pass, using memory bounded by rank_error instead of the input size",
+                    "default": False,
+                },
+                "rank_error": {
+                    "type": "number",
+                    "description": "Target normalized rank error of the approximate median, e.g. 0.01 for 1%",
+                    "exclusiveMinimum": 0.0,
+                    "exclusiveMaximum": 1.0,
+                    "default": 0.01,
                 },
             },
         }
 
     @staticmethod
-    def from_schema(input_data_file_path: str) -> "DataMedianInputSchema":
-        data = Data.from_file(input_data_file_path)
-        return DataMedianInputSchema(df=data.df)
+    def from_schema(
+        input_data_file_path: str,
+        approximate: bool = False,
+        rank_error: float = 0.01,
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> "DataMedianInputSchema":
+        data = Data.from_file(
+            input_data_file_path,
+            streaming=True if approximate else None,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
+        return DataMedianInputSchema(
+            lf=data.lf,
+            streaming=data.streaming,
+            approximate=approximate,
+            rank_error=rank_error,
+        )
 
     @staticmethod
     def from_args(arguments: dict[str, Any]) -> "DataMedianInputSchema":
         input_data_file_path = arguments["input_data_file_path"]
-        return DataMedianInputSchema.from_schema(input_data_file_path=input_data_file_path)
+        partitions = arguments.get("partitions")
+        columns = arguments.get("columns")
+        row_filter = arguments.get("filter")
+        dtypes = arguments.get("dtypes")
+        approximate = arguments.get("approximate", False)
+        rank_error = arguments.get("rank_error", 0.01)
+        return DataMedianInputSchema.from_schema(
+            input_data_file_path=input_data_file_path,
+            approximate=approximate,
+            rank_error=rank_error,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
 
 
-async def handle_data_median(
-    arguments: dict[str, Any],
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+def compute_data_median(arguments: dict[str, Any]) -> dict[str, Any]:
     data_median_input = DataMedianInputSchema.from_args(arguments)
-    median_df = data_median_input.df.median()
+    if data_median_input.approximate:
+        median_df, rank_error = approximate_quantile_frame(data_median_input, [0.5], data_median_input.rank_error)
+        return {
+            "description": "Approximate median values for each column",
+            "median_values": row_to_dict(median_df),
+            "approximate": True,
+            "rank_error": rank_error,
+        }
+    median_df = data_median_input.collect(data_median_input.lf.median())
 
     # Convert the DataFrame to a dictionary format
     median_dict = {
         "description": "Median values for each column",
-        "median_values": {
-            col: str(val) if val is not None else None for col, val in zip(median_df.columns, median_df.row(0))
-        },
+        "median_values": row_to_dict(median_df),
     }
 
+    return median_dict
+
+
+async def handle_data_median(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    median_dict = await run_blocking(compute_data_median, arguments)
     return [
         types.TextContent(
             type="text",
-            text=json.dumps(median_dict),
+            text=dumps(median_dict),
         )
     ]
@@ -1,11 +1,20 @@
-import json
 from typing import Any
 
+import polars as pl
 from mcp import types
-from pydantic import ConfigDict
+from pydantic import ConfigDict, Field
 
 from ..make_logger import make_logger
+from .dataset import dataset_properties
+from .executor import run_blocking
+from .incremental import INCREMENTAL_PATH, incremental_file_stats
 from .model import Data
+from .parquet_metadata import SCAN_PATH, ParquetFooter, aggregate_with_footer, has_parquet_footer
+from .predicate import filter_properties
+from .projection import projection_properties
+from .result_store import OUTPUT_MODES, should_spill, spill_result
+from .schema_cache import dtypes_properties
+from .serialization import dumps, series_to_list, to_json_value
 
 logger = make_logger(__name__)
 
@@ -18,6 +27,11 @@ class DataMinInputSchema(Data):
         arbitrary_types_allowed=True,
     )
 
+    output: str = Field(
+        default="auto",
+        description="How per-row results of the horizontal variant are returned. One of: 'auto', 'inline', 'resource'",
+    )
+
     @staticmethod
     def input_schema() -> dict:
         return {
@@ -25,71 +39,153 @@ class DataMinInputSchema(Data):
             "properties": {
                 "input_data_file_path": {
                     "type": "string",
-                    "description": "Path to the input data file",
+                    "description": "Path to the input data file, or a directory or glob of files",
+                },
+                **dataset_properties(),
+                **projection_properties(),
+                **filter_properties(),
+                **dtypes_properties(),
+                "streaming": {
+                    "type": "boolean",
+                    "description": "Aggregate in batches with the streaming engine so files larger than memory can be "
+                    "processed. Chosen automatically from the file size when omitted",
+                },
+                "output": {
+                    "type": "string",
+                    "enum": OUTPUT_MODES,
+                    "description": "How the per-row results of the horizontal variant are returned: inline JSON, or a "
+                    "Parquet resource with a summary. 'auto' uses a resource for large results",
+                    "default": "auto",
                 },
             },
         }
 
     @staticmethod
-    def from_schema(input_data_file_path: str) -> "DataMinInputSchema":
-        data = Data.from_file(input_data_file_path)
-        return DataMinInputSchema(df=data.df)
+    def from_schema(
+        input_data_file_path: str,
+        streaming: bool | None = None,
+        output: str = "auto",
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> "DataMinInputSchema":
+        data = Data.from_file(
+            input_data_file_path,
+            streaming=streaming,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
+        return DataMinInputSchema(
+            lf=data.lf,
+            streaming=data.streaming,
+            output=output,
+        )
 
     @staticmethod
     def from_args(arguments: dict[str, Any]) -> "DataMinInputSchema":
         input_data_file_path = arguments["input_data_file_path"]
-        return DataMinInputSchema.from_schema(input_data_file_path=input_data_file_path)
+        partitions = arguments.get("partitions")
+        columns = arguments.get("columns")
+        row_filter = arguments.get("filter")
+        dtypes = arguments.get("dtypes")
+        streaming = arguments.get("streaming")
+        output = arguments.get("output", "auto")
+        return DataMinInputSchema.from_schema(
+            input_data_file_path=input_data_file_path,
+            streaming=streaming,
+            output=output,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
 
 
-async def handle_data_min(
-    arguments: dict[str, Any],
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-    data_min_input = DataMinInputSchema.from_args(arguments)
-    min_df = data_min_input.df.min()
+def compute_data_min(arguments: dict[str, Any]) -> dict[str, Any]:
+    input_data_file_path = arguments["input_data_file_path"]
+    if has_parquet_footer(
+        input_data_file_path, arguments.get("partitions"), arguments.get("filter"), arguments.get("dtypes")
+    ):
+        footer = ParquetFooter.from_file(input_data_file_path)
+        min_values, path = aggregate_with_footer(
+            input_data_file_path,
+            footer,
+            footer.min_values,
+            lambda lf: lf.min(),
+            streaming=arguments.get("streaming"),
+            columns=arguments.get("columns"),
+        )
+    elif (
+        stats := incremental_file_stats(
+            input_data_file_path,
+            arguments.get("partitions"),
+            arguments.get("columns"),
+            arguments.get("filter"),
+            arguments.get("dtypes"),
+        )
+    ) is not None:
+        min_values, path = {col: col_stats.min for col, col_stats in stats.columns.items()}, INCREMENTAL_PATH
+    else:
+        data_min_input = DataMinInputSchema.from_args(arguments)
+        min_df = data_min_input.collect(data_min_input.lf.min())
+        min_values, path = dict(zip(min_df.columns, min_df.row(0))), SCAN_PATH
 
     # Convert the DataFrame to a dictionary format
     min_dict = {
         "description": "Minimum values for each column",
-        "min_values": {col: str(val) if val is not None else None for col, val in zip(min_df.columns, min_df.row(0))},
+        "min_values": {col: to_json_value(val) for col, val in min_values.items()},
+        "execution_path": path,
     }
 
+    return min_dict
+
+
+async def handle_data_min(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    min_dict = await run_blocking(compute_data_min, arguments)
     return [
         types.TextContent(
             type="text",
-            text=json.dumps(min_dict),
+            text=dumps(min_dict),
         )
     ]
 
 
-async def handle_data_min_horizontal(
-    arguments: dict[str, Any],
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+def compute_data_min_horizontal(arguments: dict[str, Any]) -> dict[str, Any]:
     data_min_input = DataMinInputSchema.from_args(arguments)
     try:
-        min_horizontal_df = data_min_input.df.min_horizontal()
+        min_horizontal_df = data_min_input.collect(data_min_input.lf.select(pl.min_horizontal(pl.all()))).to_series()
+
+        if should_spill(min_horizontal_df.len(), data_min_input.output):
+            return {
+                "description": "Minimum values across columns for each row",
+                **spill_result(min_horizontal_df, "data_min_horizontal"),
+            }
 
         # Convert the DataFrame to a dictionary format
-        min_horizontal_dict = {
+        return {
             "description": "Minimum values across columns for each row",
-            "min_values": {str(i): str(val) if val is not None else None for i, val in enumerate(min_horizontal_df)},
+            "min_values": dict(zip(map(str, range(min_horizontal_df.len())), series_to_list(min_horizontal_df))),
         }
-
-        return [
-            types.TextContent(
-                type="text",
-                text=json.dumps(min_horizontal_dict),
-            )
-        ]
     except Exception as e:
         logger.error(f"Error calculating min: {e}")
-        return [
-            types.TextContent(
-                type="text",
-                text=json.dumps(
-                    {
-                        "error": "Failed to calculate min values.",
-                        "message": str(e),
-                    }
-                ),
-            )
-        ]
+        return {
+            "error": "Failed to calculate min values.",
+            "message": str(e),
+        }
+
+
+async def handle_data_min_horizontal(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    min_horizontal_dict = await run_blocking(compute_data_min_horizontal, arguments)
+    return [
+        types.TextContent(
+            type="text",
+            text=dumps(min_horizontal_dict),
+        )
+    ]
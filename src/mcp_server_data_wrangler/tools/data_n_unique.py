@@ -0,0 +1,178 @@
+import threading
+from typing import Any
+
+import polars as pl
+from mcp import types
+from pydantic import ConfigDict, Field
+
+from ..make_logger import make_logger
+from .dataset import dataset_properties
+from .executor import run_blocking
+from .model import Data
+from .predicate import filter_properties
+from .projection import projection_properties
+from .schema_cache import dtypes_properties
+from .serialization import dumps, row_to_dict
+from .sketches import HLL_MAX_PRECISION, HLL_MIN_PRECISION, HyperLogLog
+
+logger = make_logger(__name__)
+
+# Seed of the value hashes fed to the HyperLogLog sketches, fixed so batches hash alike
+HASH_SEED = 0
+
+
+class DataNUniqueInputSchema(Data):
+    model_config = ConfigDict(
+        validate_assignment=True,
+        frozen=True,
+        extra="forbid",
+        arbitrary_types_allowed=True,
+    )
+
+    approximate: bool = Field(
+        default=False,
+        description="Estimate the number of unique values with HyperLogLog sketches built in one streaming pass",
+    )
+    precision: int = Field(
+        default=14,
+        description="Number of bits used to pick a HyperLogLog register. The sketch uses 2^precision bytes per column",
+        ge=HLL_MIN_PRECISION,
+        le=HLL_MAX_PRECISION,
+    )
+
+    @staticmethod
+    def input_schema() -> dict:
+        return {
+            "type": "object",
+            "properties": {
+                "input_data_file_path": {
+                    "type": "string",
+                    "description": "Path to the input data file, or a directory or glob of files",
+                },
+                **dataset_properties(),
+                **projection_properties(),
+                **filter_properties(),
+                **dtypes_properties(),
+                "approximate": {
+                    "type": "boolean",
+                    "description": "Estimate the number of unique values with HyperLogLog sketches built in one "
+                    "streaming pass, so files larger than memory can be processed. Nulls count as one value",
+                    "default": False,
+                },
+                "precision": {
+                    "type": "integer",
+                    "description": "HyperLogLog precision. Higher values use 2^precision bytes per column and give a "
+                    "relative standard error of 1.04 / sqrt(2^precision)",
+                    "minimum": HLL_MIN_PRECISION,
+                    "maximum": HLL_MAX_PRECISION,
+                    "default": 14,
+                },
+            },
+            "required": ["input_data_file_path"],
+        }
+
+    @staticmethod
+    def from_schema(
+        input_data_file_path: str,
+        approximate: bool = False,
+        precision: int = 14,
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> "DataNUniqueInputSchema":
+        data = Data.from_file(
+            input_data_file_path,
+            streaming=True if approximate else None,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
+        return DataNUniqueInputSchema(
+            lf=data.lf,
+            streaming=data.streaming,
+            approximate=approximate,
+            precision=precision,
+        )
+
+    @staticmethod
+    def from_args(arguments: dict[str, Any]) -> "DataNUniqueInputSchema":
+        input_data_file_path = arguments["input_data_file_path"]
+        partitions = arguments.get("partitions")
+        columns = arguments.get("columns")
+        row_filter = arguments.get("filter")
+        dtypes = arguments.get("dtypes")
+        approximate = arguments.get("approximate", False)
+        precision = arguments.get("precision", 14)
+        return DataNUniqueInputSchema.from_schema(
+            input_data_file_path=input_data_file_path,
+            approximate=approximate,
+            precision=precision,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
+
+
+def approximate_n_unique(data_n_unique_input: DataNUniqueInputSchema) -> dict[str, int]:
+    """Estimate the number of unique values of every column in one streaming pass.
+
+    Polars hashes the values as part of the streaming query, so each batch reaches Python as
+    UInt64 columns. Every batch fills its own sketches, which are merged into one per column.
+
+    Args:
+        data_n_unique_input: Data and sketch precision.
+
+    Returns:
+        dict[str, int]: Estimated number of unique values for each column.
+    """
+    columns = data_n_unique_input.lf.collect_schema().names()
+    precision = data_n_unique_input.precision
+    sketches = {col: HyperLogLog(precision) for col in columns}
+    lock = threading.Lock()
+
+    def update(batch: pl.DataFrame) -> None:
+        batch_sketches = {col: HyperLogLog(precision) for col in columns}
+        for col, sketch in batch_sketches.items():
+            sketch.update(batch[col].to_numpy())
+        with lock:
+            for col, sketch in batch_sketches.items():
+                sketches[col].merge(sketch)
+
+    data_n_unique_input.for_each_batch(data_n_unique_input.lf.select(pl.all().hash(seed=HASH_SEED)), update)
+    return {col: sketch.estimate() for col, sketch in sketches.items()}
+
+
+def compute_data_n_unique(arguments: dict[str, Any]) -> dict[str, Any]:
+    data_n_unique_input = DataNUniqueInputSchema.from_args(arguments)
+    if data_n_unique_input.approximate:
+        return {
+            "description": "Approximate number of unique values for each column",
+            "n_unique": approximate_n_unique(data_n_unique_input),
+            "approximate": True,
+            "relative_error": HyperLogLog(data_n_unique_input.precision).relative_error(),
+        }
+
+    n_unique_df = data_n_unique_input.collect(data_n_unique_input.lf.select(pl.all().n_unique()))
+
+    # Convert the DataFrame to a dictionary format
+    n_unique_dict = {
+        "description": "Number of unique values for each column",
+        "n_unique": row_to_dict(n_unique_df),
+    }
+
+    return n_unique_dict
+
+
+async def handle_data_n_unique(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    n_unique_dict = await run_blocking(compute_data_n_unique, arguments)
+    return [
+        types.TextContent(
+            type="text",
+            text=dumps(n_unique_dict),
+        )
+    ]
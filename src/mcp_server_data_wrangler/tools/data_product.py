@@ -1,11 +1,17 @@
-import json
 from typing import Any
 
+import polars as pl
 from mcp import types
 from pydantic import ConfigDict
 
 from ..make_logger import make_logger
+from .dataset import dataset_properties
+from .executor import run_blocking
 from .model import Data
+from .predicate import filter_properties
+from .projection import projection_properties
+from .schema_cache import dtypes_properties
+from .serialization import dumps, row_to_dict
 
 logger = make_logger(__name__)
 
@@ -25,39 +31,87 @@ class DataProductInputSchema(Data):
             "properties": {
                 "input_data_file_path": {
                     "type": "string",
-                    "description": "Path to the input data file",
+                    "description": "Path to the input data file, or a directory or glob of files",
+                },
+                **dataset_properties(),
+                **projection_properties(),
+                **filter_properties(),
+                **dtypes_properties(),
+                "streaming": {
+                    "type": "boolean",
+                    "description": "Aggregate in batches with the streaming engine so files larger than memory can be "
+                    "processed. Chosen automatically from the file size when omitted",
                 },
             },
         }
 
     @staticmethod
-    def from_schema(input_data_file_path: str) -> "DataProductInputSchema":
-        data = Data.from_file(input_data_file_path)
-        return DataProductInputSchema(df=data.df)
+    def from_schema(
+        input_data_file_path: str,
+        streaming: bool | None = None,
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> "DataProductInputSchema":
+        data = Data.from_file(
+            input_data_file_path,
+            streaming=streaming,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
+        return DataProductInputSchema(lf=data.lf, streaming=data.streaming)
 
     @staticmethod
     def from_args(arguments: dict[str, Any]) -> "DataProductInputSchema":
         input_data_file_path = arguments["input_data_file_path"]
-        return DataProductInputSchema.from_schema(input_data_file_path=input_data_file_path)
+        partitions = arguments.get("partitions")
+        columns = arguments.get("columns")
+        row_filter = arguments.get("filter")
+        dtypes = arguments.get("dtypes")
+        streaming = arguments.get("streaming")
+        return DataProductInputSchema.from_schema(
+            input_data_file_path=input_data_file_path,
+            streaming=streaming,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
 
 
-async def handle_data_product(
-    arguments: dict[str, Any],
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+def product_query(lf: pl.LazyFrame) -> pl.LazyFrame:
+    # LazyFrame has no product(); mirror DataFrame.product, which nulls out non-numeric columns
+    return lf.select(
+        [
+            pl.col(name).product() if dtype.is_numeric() or dtype == pl.Boolean else pl.lit(None).alias(name)
+            for name, dtype in lf.collect_schema().items()
+        ]
+    )
+
+
+def compute_data_product(arguments: dict[str, Any]) -> dict[str, Any]:
     data_product_input = DataProductInputSchema.from_args(arguments)
-    product_df = data_product_input.df.product()
+    product_df = data_product_input.collect(product_query(data_product_input.lf))
 
     # Convert the DataFrame to a dictionary format
     product_dict = {
         "description": "Product values for each column",
-        "product_values": {
-            col: str(val) if val is not None else None for col, val in zip(product_df.columns, product_df.row(0))
-        },
+        "product_values": row_to_dict(product_df),
     }
 
+    return product_dict
+
+
+async def handle_data_product(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    product_dict = await run_blocking(compute_data_product, arguments)
     return [
         types.TextContent(
             type="text",
-            text=json.dumps(product_dict),
+            text=dumps(product_dict),
         )
     ]
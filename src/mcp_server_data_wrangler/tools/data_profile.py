@@ -0,0 +1,214 @@
+from typing import Any, Callable, List
+
+import polars as pl
+from mcp import types
+from pydantic import ConfigDict, Field
+
+from ..make_logger import make_logger
+from .data_product import product_query
+from .dataset import dataset_properties
+from .executor import run_blocking
+from .model import Data
+from .predicate import filter_properties
+from .projection import projection_properties
+from .quantiles import multi_quantile_query, quantile_frame
+from .schema_cache import dtypes_properties
+from .serialization import dumps, row_to_dict
+
+logger = make_logger(__name__)
+
+# Statistic name -> (response key, query builder) with the same response keys as the individual tools
+PROFILE_STATISTICS: dict[str, tuple[str, Callable[["DataProfileInputSchema"], pl.LazyFrame]]] = {
+    "count": ("counts", lambda data: data.lf.count()),
+    "max": ("max_values", lambda data: data.lf.max()),
+    "min": ("min_values", lambda data: data.lf.min()),
+    "mean": ("mean_values", lambda data: data.lf.mean()),
+    "median": ("median_values", lambda data: data.lf.median()),
+    "product": ("product_values", lambda data: product_query(data.lf)),
+    "std": ("std_values", lambda data: data.lf.std(ddof=data.ddof)),
+    "var": ("var_values", lambda data: data.lf.var(ddof=data.ddof)),
+}
+
+
+class DataProfileInputSchema(Data):
+    model_config = ConfigDict(
+        validate_assignment=True,
+        frozen=True,
+        extra="forbid",
+        arbitrary_types_allowed=True,
+    )
+
+    statistics: List[str] = Field(
+        default=["count", "mean", "std", "min", "max", "median"],
+        description="Statistics to compute. Any of: "
+        "'count', 'max', 'min', 'mean', 'median', 'product', 'quantile', 'std', 'var'",
+    )
+    quantiles: List[float] = Field(
+        default=[0.25, 0.5, 0.75],
+        description="Quantiles to compute when 'quantile' is requested. All values must be in the range [0, 1].",
+    )
+    interpolation: str = Field(
+        default="nearest",
+        description="Interpolation method for quantile. One of: 'nearest', 'higher', 'lower', 'midpoint', 'linear'",
+    )
+    ddof: int = Field(
+        default=1, description="Delta Degrees of Freedom: the divisor used in the calculation is N - ddof", ge=0
+    )
+
+    @staticmethod
+    def input_schema() -> dict:
+        return {
+            "type": "object",
+            "properties": {
+                "input_data_file_path": {
+                    "type": "string",
+                    "description": "Path to the input data file, or a directory or glob of files",
+                },
+                **dataset_properties(),
+                **projection_properties(),
+                **filter_properties(),
+                **dtypes_properties(),
+                "statistics": {
+                    "type": "array",
+                    "items": {
+                        "type": "string",
+                        "enum": [*PROFILE_STATISTICS, "quantile"],
+                    },
+                    "description": "Statistics to compute in a single read of the input data",
+                    "default": ["count", "mean", "std", "min", "max", "median"],
+                },
+                "quantiles": {
+                    "type": "array",
+                    "items": {"type": "number", "minimum": 0.0, "maximum": 1.0},
+                    "description": "Quantiles to compute when 'quantile' is requested",
+                    "default": [0.25, 0.5, 0.75],
+                },
+                "interpolation": {
+                    "type": "string",
+                    "description": "Interpolation method for quantile",
+                    "enum": ["nearest", "higher", "lower", "midpoint", "linear"],
+                    "default": "nearest",
+                },
+                "ddof": {
+                    "type": "integer",
+                    "description": "Delta Degrees of Freedom for std and var: the divisor used in the calculation is "
+                    "N - ddof",
+                    "minimum": 0,
+                    "default": 1,
+                },
+                "streaming": {
+                    "type": "boolean",
+                    "description": "Aggregate in batches with the streaming engine so files larger than memory can be "
+                    "processed. Chosen automatically from the file size when omitted",
+                },
+            },
+            "required": ["input_data_file_path"],
+        }
+
+    @staticmethod
+    def from_schema(
+        input_data_file_path: str,
+        statistics: List[str] = ["count", "mean", "std", "min", "max", "median"],
+        quantiles: List[float] = [0.25, 0.5, 0.75],
+        interpolation: str = "nearest",
+        ddof: int = 1,
+        streaming: bool | None = None,
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> "DataProfileInputSchema":
+        for statistic in statistics:
+            if statistic not in PROFILE_STATISTICS and statistic != "quantile":
+                raise ValueError(f"Invalid statistic: {statistic}")
+        data = Data.from_file(
+            input_data_file_path,
+            streaming=streaming,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
+        return DataProfileInputSchema(
+            lf=data.lf,
+            streaming=data.streaming,
+            statistics=statistics,
+            quantiles=quantiles,
+            interpolation=interpolation,
+            ddof=ddof,
+        )
+
+    @staticmethod
+    def from_args(arguments: dict[str, Any]) -> "DataProfileInputSchema":
+        input_data_file_path = arguments["input_data_file_path"]
+        partitions = arguments.get("partitions")
+        columns = arguments.get("columns")
+        row_filter = arguments.get("filter")
+        dtypes = arguments.get("dtypes")
+        statistics = arguments.get("statistics", ["count", "mean", "std", "min", "max", "median"])
+        quantiles = arguments.get("quantiles", [0.25, 0.5, 0.75])
+        interpolation = arguments.get("interpolation", "nearest")
+        ddof = arguments.get("ddof", 1)
+        streaming = arguments.get("streaming")
+        return DataProfileInputSchema.from_schema(
+            input_data_file_path=input_data_file_path,
+            statistics=statistics,
+            quantiles=quantiles,
+            interpolation=interpolation,
+            ddof=ddof,
+            streaming=streaming,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
+
+
+def compute_data_profile(arguments: dict[str, Any]) -> dict[str, Any]:
+    data_profile_input = DataProfileInputSchema.from_args(arguments)
+
+    # Build every statistic as a query over the same scan and run them together,
+    # so the input is read once and the shared subplan is executed once
+    keys: list[str] = []
+    queries: list[pl.LazyFrame] = []
+    for statistic in dict.fromkeys(data_profile_input.statistics):
+        if statistic == "quantile":
+            keys.append("quantile_values")
+            queries.append(
+                multi_quantile_query(
+                    data_profile_input.lf,
+                    data_profile_input.quantiles,
+                    data_profile_input.interpolation,
+                )
+            )
+        else:
+            key, build_query = PROFILE_STATISTICS[statistic]
+            keys.append(key)
+            queries.append(build_query(data_profile_input))
+    result_dfs = data_profile_input.collect_all(queries)
+
+    # Convert the DataFrames to a dictionary format
+    profile_dict: dict[str, Any] = {"description": "Profile of the input data"}
+    for key, result_df in zip(keys, result_dfs):
+        if key == "quantile_values":
+            quantiles = data_profile_input.quantiles
+            quantile_df = quantile_frame(
+                result_df, data_profile_input.lf.collect_schema(), quantiles, data_profile_input.interpolation
+            )
+            profile_dict[key] = {str(quantile): row_to_dict(quantile_df, k) for k, quantile in enumerate(quantiles)}
+        else:
+            profile_dict[key] = row_to_dict(result_df)
+
+    return profile_dict
+
+
+async def handle_data_profile(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    profile_dict = await run_blocking(compute_data_profile, arguments)
+    return [
+        types.TextContent(
+            type="text",
+            text=dumps(profile_dict),
+        )
+    ]
@@ -1,11 +1,18 @@
-import json
-from typing import Any
+from typing import Any, List, Optional
 
 from mcp import types
 from pydantic import ConfigDict, Field
 
 from ..make_logger import make_logger
+from .dataset import dataset_properties
+from .executor import run_blocking
 from .model import Data
+from .predicate import filter_properties
+from .projection import projection_properties
+from .quantiles import approximate_quantile_frame, multi_quantile_query, quantile_frame
+from .sampling import SampleSpec, estimate_quantiles, sample_file, sample_properties
+from .schema_cache import dtypes_properties
+from .serialization import dumps, row_to_dict
 
 logger = make_logger(__name__)
 
@@ -19,10 +26,22 @@ class DataQuantileInputSchema(Data):
     )
 
     quantile: float = Field(default=0.5, description="Quantile value between 0.0 and 1.0", gt=0.0, lt=1.0)
+    quantiles: Optional[List[float]] = Field(
+        default=None,
+        description="Quantile values between 0.0 and 1.0, computed together from one sort of each column. "
+        "Takes precedence over quantile",
+    )
     interpolation: str = Field(
         default="nearest",
         description="Interpolation method for quantile. One of: 'nearest', 'higher', 'lower', 'midpoint', 'linear'",
     )
+    approximate: bool = Field(
+        default=False,
+        description="Estimate the quantiles with KLL sketches built in one streaming pass instead of sorting",
+    )
+    rank_error: float = Field(
+        default=0.01, description="Target normalized rank error of approximate quantiles", gt=0.0, lt=1.0
+    )
 
     @staticmethod
     def input_schema() -> dict:
@@ -31,8 +50,12 @@ class DataQuantileInputSchema(Data):
             "properties": {
                 "input_data_file_path": {
                     "type": "string",
-                    "description": "Path to the input data file",
+                    "description": "Path to the input data file, or a directory or glob of files",
                 },
+                **dataset_properties(),
+                **projection_properties(),
+                **filter_properties(),
+                **dtypes_properties(),
                 "quantile": {
                     "type": "number",
                     "description": "Quantile between 0.0 and 1.0",
@@ -40,59 +63,196 @@ class DataQuantileInputSchema(Data):
                     "maximum": 1.0,
                     "default": 0.5,
                 },
+                "quantiles": {
+                    "type": "array",
+                    "items": {"type": "number", "minimum": 0.0, "maximum": 1.0},
+                    "description": "Quantiles between 0.0 and 1.0, computed together in a single pass. "
+                    "Use instead of quantile to get several quantiles at once",
+                },
                 "interpolation": {
                     "type": "string",
                     "description": "Interpolation method",
                     "enum": ["nearest", "higher", "lower", "midpoint", "linear"],
                     "default": "nearest",
                 },
+                "approximate": {
+                    "type": "boolean",
+                    "description": "Estimate the quantiles of numeric columns with mergeable KLL sketches built in one "
+                    "streaming pass, using memory bounded by rank_error instead of the input size. "
+                    "interpolation is ignored and each estimate is a value of the column",
+                    "default": False,
+                },
+                "rank_error": {
+                    "type": "number",
+                    "description": "Target normalized rank error of approximate quantiles, e.g. 0.01 for 1%",
+                    "exclusiveMinimum": 0.0,
+                    "exclusiveMaximum": 1.0,
+                    "default": 0.01,
+                },
+                **sample_properties(),
             },
-            "required": ["input_data_file_path", "quantile"],
+            "required": ["input_data_file_path"],
         }
 
     @staticmethod
     def from_schema(
-        input_data_file_path: str, quantile: float, interpolation: str = "nearest"
+        input_data_file_path: str,
+        quantile: float = 0.5,
+        quantiles: Optional[List[float]] = None,
+        interpolation: str = "nearest",
+        approximate: bool = False,
+        rank_error: float = 0.01,
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
     ) -> "DataQuantileInputSchema":
-        data = Data.from_file(input_data_file_path)
+        data = Data.from_file(
+            input_data_file_path,
+            streaming=True if approximate else None,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
         return DataQuantileInputSchema(
-            df=data.df,
+            lf=data.lf,
+            streaming=data.streaming,
             quantile=quantile,
+            quantiles=quantiles,
             interpolation=interpolation,
+            approximate=approximate,
+            rank_error=rank_error,
         )
 
     @staticmethod
     def from_args(arguments: dict[str, Any]) -> "DataQuantileInputSchema":
         input_data_file_path = arguments["input_data_file_path"]
-        quantile = arguments["quantile"]
+        partitions = arguments.get("partitions")
+        columns = arguments.get("columns")
+        row_filter = arguments.get("filter")
+        dtypes = arguments.get("dtypes")
+        quantile = arguments.get("quantile", 0.5)
+        quantiles = arguments.get("quantiles")
         interpolation = arguments.get("interpolation", "nearest")
+        approximate = arguments.get("approximate", False)
+        rank_error = arguments.get("rank_error", 0.01)
         return DataQuantileInputSchema.from_schema(
             input_data_file_path=input_data_file_path,
             quantile=quantile,
+            quantiles=quantiles,
             interpolation=interpolation,
+            approximate=approximate,
+            rank_error=rank_error,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
         )
 
 
-async def handle_data_quantile(
-    arguments: dict[str, Any],
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+def compute_data_quantile(arguments: dict[str, Any]) -> dict[str, Any]:
+    sample_spec = SampleSpec.from_args(arguments)
+    if sample_spec is not None:
+        return compute_sampled_quantile(arguments, sample_spec)
+
     data_quantile_input = DataQuantileInputSchema.from_args(arguments)
-    quantile_df = data_quantile_input.df.quantile(
-        quantile=data_quantile_input.quantile,
-        interpolation=data_quantile_input.interpolation,
+    if data_quantile_input.approximate:
+        return compute_approximate_quantile(data_quantile_input)
+    if data_quantile_input.quantiles is None:
+        quantile_df = data_quantile_input.collect(
+            data_quantile_input.lf.quantile(
+                quantile=data_quantile_input.quantile,
+                interpolation=data_quantile_input.interpolation,
+            )
+        )
+        return {
+            "description": f"Quantile values for each column at {data_quantile_input.quantile}",
+            "quantile_values": row_to_dict(quantile_df),
+        }
+
+    # Sort each column once and read every requested quantile from it
+    quantiles = data_quantile_input.quantiles
+    quantile_df = quantile_frame(
+        data_quantile_input.collect(
+            multi_quantile_query(data_quantile_input.lf, quantiles, data_quantile_input.interpolation)
+        ),
+        data_quantile_input.lf.collect_schema(),
+        quantiles,
+        data_quantile_input.interpolation,
     )
 
     # Convert the DataFrame to a dictionary format
     quantile_dict = {
-        "description": f"Quantile values for each column at {arguments['quantile']}",
-        "quantile_values": {
-            col: str(val) if val is not None else None for col, val in zip(quantile_df.columns, quantile_df.row(0))
-        },
+        "description": f"Quantile values for each column at {', '.join(map(str, quantiles))}",
+        "quantile_values": {str(quantile): row_to_dict(quantile_df, k) for k, quantile in enumerate(quantiles)},
     }
 
+    return quantile_dict
+
+
+def compute_approximate_quantile(data_quantile_input: DataQuantileInputSchema) -> dict[str, Any]:
+    quantiles = data_quantile_input.quantiles or [data_quantile_input.quantile]
+    quantile_df, rank_error = approximate_quantile_frame(data_quantile_input, quantiles, data_quantile_input.rank_error)
+
+    # Convert the DataFrame to a dictionary format
+    quantile_dict: dict[str, Any] = {
+        "description": f"Approximate quantile values for each column at {', '.join(map(str, quantiles))}",
+        "approximate": True,
+        "rank_error": rank_error,
+    }
+    if data_quantile_input.quantiles is None:
+        quantile_dict["quantile_values"] = row_to_dict(quantile_df)
+    else:
+        quantile_dict["quantile_values"] = {
+            str(quantile): row_to_dict(quantile_df, k) for k, quantile in enumerate(quantiles)
+        }
+
+    return quantile_dict
+
+
+def compute_sampled_quantile(arguments: dict[str, Any], sample_spec: SampleSpec) -> dict[str, Any]:
+    quantiles = arguments.get("quantiles")
+    sample = sample_file(
+        arguments["input_data_file_path"],
+        sample_spec,
+        arguments.get("partitions"),
+        arguments.get("columns"),
+        arguments.get("filter"),
+        arguments.get("dtypes"),
+    )
+    estimates = estimate_quantiles(
+        sample, quantiles or [arguments.get("quantile", 0.5)], arguments.get("interpolation", "nearest")
+    )
+
+    # Convert the estimates to the same layout as the exact results
+    quantile_dict: dict[str, Any] = {
+        "description": "Quantile values for each column estimated from a random sample",
+    }
+    if quantiles is None:
+        quantile_dict["quantile_values"] = {col: column[0][0] for col, column in estimates.items()}
+        quantile_dict["confidence_intervals"] = {col: column[0][1] for col, column in estimates.items()}
+    else:
+        quantile_dict["quantile_values"] = {
+            str(quantile): {col: column[k][0] for col, column in estimates.items()}
+            for k, quantile in enumerate(quantiles)
+        }
+        quantile_dict["confidence_intervals"] = {
+            str(quantile): {col: column[k][1] for col, column in estimates.items()}
+            for k, quantile in enumerate(quantiles)
+        }
+    quantile_dict["sample"] = sample.summary()
+
+    return quantile_dict
+
+
+async def handle_data_quantile(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    quantile_dict = await run_blocking(compute_data_quantile, arguments)
     return [
         types.TextContent(
             type="text",
-            text=json.dumps(quantile_dict),
+            text=dumps(quantile_dict),
         )
     ]
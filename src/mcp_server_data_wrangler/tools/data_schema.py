@@ -1,10 +1,16 @@
-import json
 from typing import Any
 
 from mcp import types
 from pydantic import ConfigDict
 
+from .dataset import dataset_properties
+from .executor import run_blocking
 from .model import Data
+from .parquet_metadata import METADATA_PATH, SCAN_PATH, ParquetFooter, has_parquet_footer
+from .predicate import filter_properties
+from .projection import project, projection_properties, resolve_columns
+from .schema_cache import dtypes_properties
+from .serialization import dumps
 
 
 class DataSchemaInputSchema(Data):
@@ -22,36 +28,76 @@ class DataSchemaInputSchema(Data):
             "properties": {
                 "input_data_file_path": {
                     "type": "string",
-                    "description": "Path to the input data file",
+                    "description": "Path to the input data file, or a directory or glob of files",
                 },
+                **dataset_properties(),
+                **projection_properties(),
+                **filter_properties(),
+                **dtypes_properties(),
             },
         }
 
     @staticmethod
-    def from_schema(input_data_file_path: str) -> "DataSchemaInputSchema":
-        data = Data.from_file(input_data_file_path)
-        return DataSchemaInputSchema(df=data.df)
+    def from_schema(
+        input_data_file_path: str,
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> "DataSchemaInputSchema":
+        data = Data.from_file(
+            input_data_file_path, partitions=partitions, columns=columns, row_filter=row_filter, dtypes=dtypes
+        )
+        return DataSchemaInputSchema(lf=data.lf, streaming=data.streaming)
 
     @staticmethod
     def from_args(arguments: dict[str, Any]) -> "DataSchemaInputSchema":
         input_data_file_path = arguments["input_data_file_path"]
-        return DataSchemaInputSchema.from_schema(input_data_file_path=input_data_file_path)
+        partitions = arguments.get("partitions")
+        columns = arguments.get("columns")
+        row_filter = arguments.get("filter")
+        dtypes = arguments.get("dtypes")
+        return DataSchemaInputSchema.from_schema(
+            input_data_file_path=input_data_file_path,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
+
+
+def compute_data_schema(arguments: dict[str, Any]) -> dict[str, Any]:
+    input_data_file_path = arguments["input_data_file_path"]
+    if has_parquet_footer(
+        input_data_file_path, arguments.get("partitions"), arguments.get("filter"), arguments.get("dtypes")
+    ):
+        footer = ParquetFooter.from_file(input_data_file_path)
+        schema = project(dict(footer.data_schema), resolve_columns(footer.data_schema, arguments.get("columns")))
+        path = METADATA_PATH
+    elif arguments.get("filter") is None:
+        # A schema never needs the rows, so it is read from the header or metadata without loading the file
+        scan_schema = Data.scan_schema(input_data_file_path, arguments.get("partitions"), arguments.get("dtypes"))
+        schema = project(dict(scan_schema), resolve_columns(scan_schema, arguments.get("columns")))
+        path = METADATA_PATH
+    else:
+        data_schema_input = DataSchemaInputSchema.from_args(arguments)
+        schema = data_schema_input.lf.collect_schema()
+        path = SCAN_PATH
+    schema_dict = {col: str(dtype) for col, dtype in schema.items()}
+    return {
+        "description": "Data schema of the input data",
+        "schema": schema_dict,
+        "execution_path": path,
+    }
 
 
 async def handle_data_schema(
     arguments: dict[str, Any],
 ) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-    data_schema_input = DataSchemaInputSchema.from_args(arguments)
-    schema = data_schema_input.df.schema
-    schema_dict = {col: str(dtype) for col, dtype in schema.items()}
+    schema_dict = await run_blocking(compute_data_schema, arguments)
     return [
         types.TextContent(
             type="text",
-            text=json.dumps(
-                {
-                    "description": "Data schema of the input data",
-                    "schema": schema_dict,
-                }
-            ),
+            text=dumps(schema_dict),
         )
     ]
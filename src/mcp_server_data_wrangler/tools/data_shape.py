@@ -1,10 +1,18 @@
-import json
 from typing import Any
 
+import polars as pl
 from mcp import types
 from pydantic import ConfigDict
 
+from .dataset import dataset_properties
+from .executor import run_blocking
 from .model import Data
+from .parquet_metadata import METADATA_PATH, SCAN_PATH, ParquetFooter, has_parquet_footer
+from .predicate import filter_properties
+from .projection import projection_properties, resolve_columns
+from .row_count import ROW_COUNT_PATH, count_csv_rows, has_row_count
+from .schema_cache import dtypes_properties
+from .serialization import dumps
 
 
 class DataShapeInputSchema(Data):
@@ -22,38 +30,85 @@ class DataShapeInputSchema(Data):
             "properties": {
                 "input_data_file_path": {
                     "type": "string",
-                    "description": "Path to the input data file",
+                    "description": "Path to the input data file, or a directory or glob of files",
                 },
+                **dataset_properties(),
+                **projection_properties(),
+                **filter_properties(),
+                **dtypes_properties(),
             },
         }
 
     @staticmethod
-    def from_schema(inuput_data_file_path: str) -> "DataShapeInputSchema":
-        data = Data.from_file(inuput_data_file_path)
-        return DataShapeInputSchema(df=data.df)
+    def from_schema(
+        inuput_data_file_path: str,
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> "DataShapeInputSchema":
+        data = Data.from_file(
+            inuput_data_file_path, partitions=partitions, columns=columns, row_filter=row_filter, dtypes=dtypes
+        )
+        return DataShapeInputSchema(lf=data.lf, streaming=data.streaming)
 
     @staticmethod
     def from_args(arguments: dict[str, Any]) -> "DataShapeInputSchema":
         input_data_file_path = arguments["input_data_file_path"]
-        return DataShapeInputSchema.from_schema(inuput_data_file_path=input_data_file_path)
+        partitions = arguments.get("partitions")
+        columns = arguments.get("columns")
+        row_filter = arguments.get("filter")
+        dtypes = arguments.get("dtypes")
+        return DataShapeInputSchema.from_schema(
+            inuput_data_file_path=input_data_file_path,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
+
+
+def compute_data_shape(arguments: dict[str, Any]) -> dict[str, Any]:
+    input_data_file_path = arguments["input_data_file_path"]
+    if has_parquet_footer(
+        input_data_file_path, arguments.get("partitions"), arguments.get("filter"), arguments.get("dtypes")
+    ):
+        footer = ParquetFooter.from_file(input_data_file_path)
+        return {
+            "description": "Data shape of the input data",
+            "rows": footer.num_rows,
+            "cols": len(resolve_columns(footer.data_schema, arguments.get("columns")) or footer.data_schema),
+            "execution_path": METADATA_PATH,
+        }
+    if has_row_count(input_data_file_path, arguments.get("partitions"), arguments.get("filter")):
+        # Rows are counted from the newlines and columns come from the header, so nothing is parsed
+        schema = Data.scan_schema(input_data_file_path, dtypes=arguments.get("dtypes"))
+        return {
+            "description": "Data shape of the input data",
+            "rows": count_csv_rows(input_data_file_path),
+            "cols": len(resolve_columns(schema, arguments.get("columns")) or schema),
+            "execution_path": ROW_COUNT_PATH,
+        }
+
+    data_shape_input = DataShapeInputSchema.from_args(arguments)
+    # Only the row count is computed; Polars answers it without decoding column values
+    num_rows = data_shape_input.collect(data_shape_input.lf.select(pl.len())).item()
+    num_cols = data_shape_input.lf.collect_schema().len()
+    return {
+        "description": "Data shape of the input data",
+        "rows": num_rows,
+        "cols": num_cols,
+        "execution_path": SCAN_PATH,
+    }
 
 
 async def handle_data_shape(
     arguments: dict[str, Any],
 ) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-    data_shape_input = DataShapeInputSchema.from_args(arguments)
-    data_shape = data_shape_input.df.shape
-    num_rows = data_shape[0]
-    num_cols = data_shape[1]
+    shape_dict = await run_blocking(compute_data_shape, arguments)
     return [
         types.TextContent(
             type="text",
-            text=json.dumps(
-                {
-                    "description": "Data shape of the input data",
-                    "rows": num_rows,
-                    "cols": num_cols,
-                }
-            ),
+            text=dumps(shape_dict),
         )
     ]
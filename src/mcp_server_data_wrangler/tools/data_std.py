@@ -1,11 +1,19 @@
-import json
 from typing import Any
 
 from mcp import types
 from pydantic import ConfigDict, Field
 
 from ..make_logger import make_logger
+from .dataset import dataset_properties
+from .executor import run_blocking
+from .incremental import INCREMENTAL_PATH, incremental_file_stats
 from .model import Data
+from .parquet_metadata import SCAN_PATH
+from .predicate import filter_properties
+from .projection import projection_properties
+from .sampling import SampleSpec, estimate_stds, estimates_to_dict, sample_file, sample_properties
+from .schema_cache import dtypes_properties
+from .serialization import dumps, row_to_dict, to_json_value
 
 logger = make_logger(__name__)
 
@@ -29,51 +37,142 @@ class DataStdInputSchema(Data):
             "properties": {
                 "input_data_file_path": {
                     "type": "string",
-                    "description": "Path to the input data file",
+                    "description": "Path to the input data file, or a directory or glob of files",
                 },
+                **dataset_properties(),
+                **projection_properties(),
+                **filter_properties(),
+                **dtypes_properties(),
                 "ddof": {
                     "type": "integer",
                     "description": "Delta Degrees of Freedom: the divisor used in the calculation is N - ddof",
                     "minimum": 0,
                     "default": 1,
                 },
+                "streaming": {
+                    "type": "boolean",
+                    "description": "Aggregate in batches with the streaming engine so files larger than memory can be "
+                    "processed. Chosen automatically from the file size when omitted",
+                },
+                **sample_properties(),
             },
             "required": ["input_data_file_path"],
         }
 
     @staticmethod
-    def from_schema(input_data_file_path: str, ddof: int = 1) -> "DataStdInputSchema":
-        data = Data.from_file(input_data_file_path)
+    def from_schema(
+        input_data_file_path: str,
+        ddof: int = 1,
+        streaming: bool | None = None,
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> "DataStdInputSchema":
+        data = Data.from_file(
+            input_data_file_path,
+            streaming=streaming,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
         return DataStdInputSchema(
-            df=data.df,
+            lf=data.lf,
+            streaming=data.streaming,
             ddof=ddof,
         )
 
     @staticmethod
     def from_args(arguments: dict[str, Any]) -> "DataStdInputSchema":
         input_data_file_path = arguments["input_data_file_path"]
+        partitions = arguments.get("partitions")
+        columns = arguments.get("columns")
+        row_filter = arguments.get("filter")
+        dtypes = arguments.get("dtypes")
         ddof = arguments.get("ddof", 1)
+        streaming = arguments.get("streaming")
         return DataStdInputSchema.from_schema(
             input_data_file_path=input_data_file_path,
             ddof=ddof,
+            streaming=streaming,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
         )
 
 
-async def handle_data_std(
-    arguments: dict[str, Any],
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-    data_std_input = DataStdInputSchema.from_args(arguments)
-    std_df = data_std_input.df.std(ddof=data_std_input.ddof)
+def compute_data_std(arguments: dict[str, Any]) -> dict[str, Any]:
+    ddof = arguments.get("ddof", 1)
+    sample_spec = SampleSpec.from_args(arguments)
+    if sample_spec is not None:
+        return compute_sampled_std(
+            arguments["input_data_file_path"],
+            sample_spec,
+            ddof,
+            arguments.get("partitions"),
+            arguments.get("columns"),
+            arguments.get("filter"),
+            arguments.get("dtypes"),
+        )
+
+    stats = (
+        incremental_file_stats(
+            arguments["input_data_file_path"],
+            arguments.get("partitions"),
+            arguments.get("columns"),
+            arguments.get("filter"),
+            arguments.get("dtypes"),
+        )
+        if ddof >= 0
+        else None
+    )
+    if stats is not None:
+        std_values = {col: to_json_value(col_stats.std(ddof)) for col, col_stats in stats.columns.items()}
+        path = INCREMENTAL_PATH
+    else:
+        data_std_input = DataStdInputSchema.from_args(arguments)
+        std_values = row_to_dict(data_std_input.collect(data_std_input.lf.std(ddof=data_std_input.ddof)))
+        path = SCAN_PATH
 
     # Convert the DataFrame to a dictionary format
     std_dict = {
-        "description": f"Standard deviation values for each column with ddof={data_std_input.ddof}",
-        "std_values": {col: str(val) if val is not None else None for col, val in zip(std_df.columns, std_df.row(0))},
+        "description": f"Standard deviation values for each column with ddof={ddof}",
+        "std_values": std_values,
+        "execution_path": path,
     }
 
+    return std_dict
+
+
+def compute_sampled_std(
+    input_data_file_path: str,
+    sample_spec: SampleSpec,
+    ddof: int = 1,
+    partitions: dict[str, Any] | None = None,
+    columns: list[str | dict[str, str]] | None = None,
+    row_filter: dict[str, Any] | None = None,
+    dtypes: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    sample = sample_file(input_data_file_path, sample_spec, partitions, columns, row_filter, dtypes)
+    estimates = estimates_to_dict(estimate_stds(sample, ddof), sample.critical_value, lower=0.0)
+    return {
+        "description": f"Standard deviation values for each column with ddof={ddof} estimated from a random sample",
+        "std_values": estimates["values"],
+        "standard_errors": estimates["standard_errors"],
+        "confidence_intervals": estimates["confidence_intervals"],
+        "sample": sample.summary(),
+    }
+
+
+async def handle_data_std(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    std_dict = await run_blocking(compute_data_std, arguments)
     return [
         types.TextContent(
             type="text",
-            text=json.dumps(std_dict),
+            text=dumps(std_dict),
         )
     ]
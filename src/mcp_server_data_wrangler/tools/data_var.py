@@ -1,11 +1,18 @@
-import json
 from typing import Any
 
 from mcp import types
 from pydantic import ConfigDict, Field
 
 from ..make_logger import make_logger
+from .dataset import dataset_properties
+from .executor import run_blocking
+from .incremental import INCREMENTAL_PATH, incremental_file_stats
 from .model import Data
+from .parquet_metadata import SCAN_PATH
+from .predicate import filter_properties
+from .projection import projection_properties
+from .schema_cache import dtypes_properties
+from .serialization import dumps, row_to_dict, to_json_value
 
 logger = make_logger(__name__)
 
@@ -29,51 +36,109 @@ class DataVarInputSchema(Data):
             "properties": {
                 "input_data_file_path": {
                     "type": "string",
-                    "description": "Path to the input data file",
+                    "description": "Path to the input data file, or a directory or glob of files",
                 },
+                **dataset_properties(),
+                **projection_properties(),
+                **filter_properties(),
+                **dtypes_properties(),
                 "ddof": {
                     "type": "integer",
                     "description": "Delta Degrees of Freedom: the divisor used in the calculation is N - ddof",
                     "minimum": 0,
                     "default": 1,
                 },
+                "streaming": {
+                    "type": "boolean",
+                    "description": "Aggregate in batches with the streaming engine so files larger than memory can be "
+                    "processed. Chosen automatically from the file size when omitted",
+                },
             },
             "required": ["input_data_file_path"],
         }
 
     @staticmethod
-    def from_schema(input_data_file_path: str, ddof: int = 1) -> "DataVarInputSchema":
-        data = Data.from_file(input_data_file_path)
+    def from_schema(
+        input_data_file_path: str,
+        ddof: int = 1,
+        streaming: bool | None = None,
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> "DataVarInputSchema":
+        data = Data.from_file(
+            input_data_file_path,
+            streaming=streaming,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
+        )
         return DataVarInputSchema(
-            df=data.df,
+            lf=data.lf,
+            streaming=data.streaming,
             ddof=ddof,
         )
 
     @staticmethod
     def from_args(arguments: dict[str, Any]) -> "DataVarInputSchema":
         input_data_file_path = arguments["input_data_file_path"]
+        partitions = arguments.get("partitions")
+        columns = arguments.get("columns")
+        row_filter = arguments.get("filter")
+        dtypes = arguments.get("dtypes")
         ddof = arguments.get("ddof", 1)
+        streaming = arguments.get("streaming")
         return DataVarInputSchema.from_schema(
             input_data_file_path=input_data_file_path,
             ddof=ddof,
+            streaming=streaming,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
         )
 
 
-async def handle_data_var(
-    arguments: dict[str, Any],
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-    data_var_input = DataVarInputSchema.from_args(arguments)
-    var_df = data_var_input.df.var(ddof=data_var_input.ddof)
+def compute_data_var(arguments: dict[str, Any]) -> dict[str, Any]:
+    ddof = arguments.get("ddof", 1)
+    stats = (
+        incremental_file_stats(
+            arguments["input_data_file_path"],
+            arguments.get("partitions"),
+            arguments.get("columns"),
+            arguments.get("filter"),
+            arguments.get("dtypes"),
+        )
+        if ddof >= 0
+        else None
+    )
+    if stats is not None:
+        var_values = {col: to_json_value(col_stats.var(ddof)) for col, col_stats in stats.columns.items()}
+        path = INCREMENTAL_PATH
+    else:
+        data_var_input = DataVarInputSchema.from_args(arguments)
+        var_values = row_to_dict(data_var_input.collect(data_var_input.lf.var(ddof=data_var_input.ddof)))
+        path = SCAN_PATH
 
     # Convert the DataFrame to a dictionary format
     var_dict = {
-        "description": f"Variance values for each column with ddof={data_var_input.ddof}",
-        "var_values": {col: str(val) if val is not None else None for col, val in zip(var_df.columns, var_df.row(0))},
+        "description": f"Variance values for each column with ddof={ddof}",
+        "var_values": var_values,
+        "execution_path": path,
     }
 
+    return var_dict
+
+
+async def handle_data_var(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    var_dict = await run_blocking(compute_data_var, arguments)
     return [
         types.TextContent(
             type="text",
-            text=json.dumps(var_dict),
+            text=dumps(var_dict),
         )
     ]
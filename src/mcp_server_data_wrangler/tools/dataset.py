@@ -0,0 +1,175 @@
+import glob
+import os
+from typing import Any
+from urllib.parse import unquote
+
+import polars as pl
+
+from ..utils import str_utils
+from .predicate import compile_filter, restrict_filter
+
+# Value Hive writes for a null partition
+HIVE_DEFAULT_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+# Column of the partition table holding the path of each file
+PATH_COLUMN = "__path"
+_GLOB_CHARS = ("*", "?", "[")
+
+
+def is_dataset(file_path: str) -> bool:
+    """Whether the input path is a directory or a glob of files rather than a single file."""
+    fp = str_utils.strip_string(file_path)
+    if os.path.isfile(fp):
+        return False
+    return os.path.isdir(fp) or any(char in fp for char in _GLOB_CHARS)
+
+
+def dataset_properties() -> dict[str, Any]:
+    """JSON schema properties of the dataset arguments shared by the tools that read input files."""
+    return {
+        "partitions": {
+            "type": "object",
+            "description": "For a directory or glob of hive-partitioned files (e.g. events/date=2024-01-01/part-0.parquet), "
+            "the value or list of values to read for each partition key. Files of other partitions are skipped "
+            "without being opened",
+            "additionalProperties": {
+                "anyOf": [
+                    {"type": ["string", "number", "boolean", "null"]},
+                    {"type": "array", "items": {"type": ["string", "number", "boolean", "null"]}},
+                ]
+            },
+        },
+    }
+
+
+def dataset_root(file_path: str) -> str:
+    """Directory that hive partition paths are relative to: the directory, or a glob up to its first wildcard."""
+    fp = str_utils.strip_string(file_path)
+    if os.path.isdir(fp):
+        return os.path.realpath(fp)
+    parts = []
+    for part in fp.split(os.sep):
+        if any(char in part for char in _GLOB_CHARS):
+            break
+        parts.append(part)
+    return os.path.realpath(os.sep.join(parts) or ".")
+
+
+def dataset_files(file_path: str) -> list[str]:
+    """Files of a dataset, in a stable order.
+
+    Directories are walked recursively and skip hidden files and files starting with an underscore,
+    such as _SUCCESS markers. Globs support ** for any number of directories.
+
+    Args:
+        file_path: Directory or glob pattern.
+
+    Returns:
+        list[str]: Resolved paths of the files.
+
+    Raises:
+        ValueError: If no file matches.
+    """
+    fp = str_utils.strip_string(file_path)
+    if os.path.isdir(fp):
+        files: list[str] = []
+        for directory, subdirectories, names in os.walk(fp):
+            subdirectories[:] = sorted(name for name in subdirectories if not name.startswith((".", "_")))
+            files.extend(os.path.join(directory, name) for name in names if not name.startswith((".", "_")))
+    else:
+        files = [path for path in glob.glob(fp, recursive=True) if os.path.isfile(path)]
+    if not files:
+        raise ValueError(f"No files found for {fp}")
+    return sorted(os.path.realpath(path) for path in files)
+
+
+def hive_partitions(root: str, file_path: str) -> dict[str, str]:
+    """Partition values encoded as key=value directories between the dataset root and a file."""
+    directories = os.path.relpath(os.path.dirname(file_path), root).split(os.sep)
+    return {
+        unquote(key): unquote(value)
+        for key, _, value in (directory.partition("=") for directory in directories)
+        if key and value
+    }
+
+
+def partition_frame(root: str, files: list[str]) -> pl.DataFrame:
+    """Table of the partition values of each file, typed like Polars types hive partitions.
+
+    Args:
+        root: Dataset root directory.
+        files: Files of the dataset.
+
+    Returns:
+        pl.DataFrame: A PATH_COLUMN column and one column per partition key, Int64 or Float64 when every
+            value parses as such and String otherwise.
+    """
+    partitions = [hive_partitions(root, path) for path in files]
+    keys = list(dict.fromkeys(key for file_partitions in partitions for key in file_partitions))
+    columns = [pl.Series(PATH_COLUMN, files, dtype=pl.String)]
+    for key in keys:
+        values = [file_partitions.get(key) for file_partitions in partitions]
+        columns.append(_typed_partition(pl.Series(key, values, dtype=pl.String)))
+    return pl.DataFrame(columns)
+
+
+def _typed_partition(values: pl.Series) -> pl.Series:
+    values = values.replace(HIVE_DEFAULT_PARTITION, None)
+    for dtype in (pl.Int64, pl.Float64):
+        typed = values.cast(dtype, strict=False)
+        if typed.null_count() == values.null_count():
+            return typed
+    return values
+
+
+def prune_partitions(partition_df: pl.DataFrame, partitions: dict[str, Any]) -> pl.DataFrame:
+    """Keep the files whose partition values match the requested ones.
+
+    Args:
+        partition_df: Partition table from partition_frame.
+        partitions: Requested value, or list of values, for each partition key.
+
+    Returns:
+        pl.DataFrame: Rows of the partition table of the files to read.
+
+    Raises:
+        ValueError: If a requested key is not a partition key of the dataset.
+    """
+    for key, requested in partitions.items():
+        if key == PATH_COLUMN or key not in partition_df.columns:
+            raise ValueError(f"Unknown partition key: {key}")
+        values = requested if isinstance(requested, list) else [requested]
+        # Requested values are compared as the partition column's type; values of another type match nothing
+        typed = pl.Series(key, [str(value) for value in values if value is not None], dtype=pl.String)
+        typed = typed.cast(partition_df[key].dtype, strict=False).drop_nulls()
+        condition = pl.col(key).is_in(typed)
+        if None in values:
+            condition = condition | pl.col(key).is_null()
+        partition_df = partition_df.filter(condition)
+    return partition_df
+
+
+def select_files(
+    file_path: str, partitions: dict[str, Any] | None = None, row_filter: dict[str, Any] | None = None
+) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """Partition table of a dataset, and its rows for the files a read has to open.
+
+    Files outside the requested partitions, or whose partition values fail the parts of the row
+    filter on partition keys, are pruned.
+
+    Args:
+        file_path: Directory or glob pattern.
+        partitions: Value, or list of values, to read for each partition key.
+        row_filter: Predicate of the filter argument selecting the rows to read.
+
+    Returns:
+        tuple[pl.DataFrame, pl.DataFrame]: The partition table of every file, and of the selected files.
+
+    Raises:
+        ValueError: If no file matches or a partition key is unknown.
+    """
+    partition_df = partition_frame(dataset_root(file_path), dataset_files(file_path))
+    selected_df = prune_partitions(partition_df, partitions) if partitions else partition_df
+    partition_filter = restrict_filter(row_filter, set(partition_df.columns) - {PATH_COLUMN}) if row_filter else None
+    if partition_filter is not None:
+        selected_df = selected_df.filter(compile_filter(partition_filter, partition_df.schema))
+    return partition_df, selected_df
@@ -0,0 +1,223 @@
+import gzip
+import io
+import os
+import zlib
+from enum import Enum
+from types import ModuleType
+from typing import IO, Any, Callable, Iterator, Optional
+
+import polars as pl
+from polars.io.plugins import register_io_source
+
+from ..make_logger import make_logger
+from ..utils import str_utils
+
+zstandard: Optional[ModuleType]
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is an optional dependency
+    zstandard = None
+
+logger = make_logger(__name__)
+
+# Decompressed bytes handed to the parser at a time
+_CHUNK_BYTES = 8 * 1024 * 1024
+# Rows used to infer the schema, as in pl.scan_csv and pl.scan_ndjson
+_INFER_SCHEMA_ROWS = 100
+# Compressed bytes decompressed at a time when reading the head of a file
+_HEAD_READ_BYTES = 64 * 1024
+
+
+class Compression(Enum):
+    gzip = ("gzip", ".gz")
+    zstd = ("zstd", ".zst")
+
+    @staticmethod
+    def from_file_path(file_path: str) -> "Compression | None":
+        """Compression of a file from the last part of a multi-part extension such as .csv.gz."""
+        extension = os.path.splitext(str_utils.strip_string(file_path))[1]
+        for compression in Compression:
+            if compression.value[1] == extension:
+                return compression
+        return None
+
+    @property
+    def extension(self) -> str:
+        return self.value[1]
+
+
+def open_decompressed(file_path: str, compression: Compression) -> IO[bytes]:
+    """Open a compressed file as a stream of decompressed bytes.
+
+    Raises:
+        ValueError: If the file is zstd-compressed and the optional zstandard package is not installed.
+    """
+    if compression == Compression.gzip:
+        return gzip.open(file_path, "rb")  # type: ignore
+    if zstandard is None:
+        raise ValueError("Reading zstd-compressed files requires the 'zstd' extra: pip install zstandard")
+    return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(file_path, "rb"), closefd=True))
+
+
+def record_end(data: bytes, quote: bytes | None) -> int:
+    """End of the last complete record in the data; a newline inside a quoted field does not end one."""
+    end = data.rfind(b"\n") + 1
+    if quote is not None:
+        while end and data.count(quote, 0, end) % 2:
+            end = data.rfind(b"\n", 0, end - 1) + 1
+    return end
+
+
+def _record_chunks(stream: IO[bytes], quote: bytes | None) -> Iterator[bytes]:
+    """Split a decompressed stream into chunks of whole records, about _CHUNK_BYTES each."""
+    remainder = b""
+    while True:
+        block = stream.read(_CHUNK_BYTES)
+        if not block:
+            if remainder.strip():
+                yield remainder
+            return
+        data = remainder + block
+        end = record_end(data, quote)
+        remainder = data[end:]
+        if end:
+            yield data[:end]
+
+
+def _scan_chunks(
+    file_path: str,
+    compression: Compression,
+    schema: pl.Schema,
+    parse: Callable[[bytes], pl.DataFrame],
+    quote: bytes | None,
+    skip_header: bool,
+) -> pl.LazyFrame:
+    def source(
+        with_columns: list[str] | None, predicate: pl.Expr | None, n_rows: int | None, batch_size: int | None
+    ) -> Iterator[pl.DataFrame]:
+        with open_decompressed(file_path, compression) as stream:
+            if skip_header:
+                stream.readline()
+            for chunk in _record_chunks(stream, quote):
+                df = parse(chunk)
+                if with_columns is not None:
+                    df = df.select(with_columns)
+                if predicate is not None:
+                    df = df.filter(predicate)
+                if n_rows is not None:
+                    df = df.head(n_rows)
+                    n_rows -= df.height
+                yield df
+                if n_rows == 0:
+                    return
+
+    return register_io_source(source, schema=schema)
+
+
+def _decompressor(compression: Compression) -> Any:
+    if compression == Compression.gzip:
+        return zlib.decompressobj(zlib.MAX_WBITS | 16)
+    if zstandard is None:
+        raise ValueError("Reading zstd-compressed files requires the 'zstd' extra: pip install zstandard")
+    return zstandard.ZstdDecompressor().decompressobj()
+
+
+def read_head(
+    file_path: str, compression: Compression, quote: bytes | None, size: int = _CHUNK_BYTES
+) -> tuple[bytes, float]:
+    """Whole records from the first decompressed bytes of a file, and the decompressed size of the file.
+
+    The decompressed size is exact when the head is the whole file. Otherwise it is extrapolated
+    from the compressed size of the file, with the compression ratio of the bytes read.
+
+    Args:
+        file_path: Path to the compressed file.
+        compression: Compression of the file.
+        quote: Quote character of the records, or None when newlines always end a record.
+        size: Number of decompressed bytes to read.
+
+    Returns:
+        tuple[bytes, float]: The records, and the decompressed size of the file in bytes.
+
+    Raises:
+        ValueError: If the file is zstd-compressed and the optional zstandard package is not installed.
+    """
+    decompressor = _decompressor(compression)
+    head = bytearray()
+    consumed = 0
+    with open(file_path, "rb") as file:
+        while len(head) < size and (block := file.read(_HEAD_READ_BYTES)):
+            consumed += len(block)
+            head += decompressor.decompress(block)
+            # Concatenated gzip members and zstd frames are decompressed one after the other
+            while decompressor.eof and decompressor.unused_data:
+                unused = decompressor.unused_data
+                decompressor = _decompressor(compression)
+                head += decompressor.decompress(unused)
+    if len(head) < size:
+        return bytes(head), float(len(head))
+    decompressed_size = os.path.getsize(file_path) * len(head) / consumed
+    data = bytes(head[:size])
+    return data[: record_end(data, quote)], decompressed_size
+
+
+def _head(file_path: str, compression: Compression, quote: bytes | None) -> bytes:
+    # Whole records at the start of the file, used to infer the schema
+    return read_head(file_path, compression, quote)[0]
+
+
+def scan_compressed_csv(
+    file_path: str,
+    compression: Compression,
+    separator: str = ",",
+    schema: pl.Schema | None = None,
+    infer_schema_rows: int = _INFER_SCHEMA_ROWS,
+) -> pl.LazyFrame:
+    """Lazily scan a compressed CSV file, decompressing it in a stream straight into the parser.
+
+    The file is decompressed in chunks of whole records and each chunk is parsed with the given
+    schema, or the schema inferred from the first rows, so memory stays bounded and the streaming
+    engine can aggregate the file in batches. Projections and predicates are applied to each
+    parsed chunk.
+
+    Args:
+        file_path: Path to the compressed file.
+        compression: Compression of the file.
+        separator: Field separator.
+        schema: Schema of the rows. Inferred from the first rows when None.
+        infer_schema_rows: Number of rows the schema is inferred from, within the first decompressed chunk.
+
+    Returns:
+        pl.LazyFrame: Lazy scan over the decompressed rows.
+    """
+    head = _head(file_path, compression, quote=b'"')
+    header = head[: head.find(b"\n") + 1] if b"\n" in head else head + b"\n"
+    if schema is None:
+        schema = pl.read_csv(
+            io.BytesIO(head), separator=separator, n_rows=infer_schema_rows, infer_schema_length=infer_schema_rows
+        ).schema
+
+    def parse(chunk: bytes) -> pl.DataFrame:
+        return pl.read_csv(io.BytesIO(header + chunk), separator=separator, schema=schema)
+
+    return _scan_chunks(file_path, compression, schema, parse, quote=b'"', skip_header=True)
+
+
+def scan_compressed_ndjson(file_path: str, compression: Compression) -> pl.LazyFrame:
+    """Lazily scan a compressed newline-delimited JSON file, decompressing it in a stream.
+
+    Args:
+        file_path: Path to the compressed file.
+        compression: Compression of the file.
+
+    Returns:
+        pl.LazyFrame: Lazy scan over the decompressed rows.
+    """
+    head = _head(file_path, compression, quote=None)
+    head = b"\n".join(head.split(b"\n", _INFER_SCHEMA_ROWS)[:_INFER_SCHEMA_ROWS])
+    schema = pl.read_ndjson(io.BytesIO(head)).schema
+
+    def parse(chunk: bytes) -> pl.DataFrame:
+        return pl.read_ndjson(io.BytesIO(chunk), schema=schema)
+
+    return _scan_chunks(file_path, compression, schema, parse, quote=None, skip_header=False)
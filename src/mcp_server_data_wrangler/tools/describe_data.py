@@ -1,10 +1,26 @@
-import json
 from typing import Any, List
 
+import polars as pl
 from mcp import types
 from pydantic import ConfigDict, Field
 
+from .dataset import dataset_properties
+from .executor import run_blocking
 from .model import Data
+from .predicate import filter_properties
+from .projection import projection_properties
+from .quantiles import multi_quantile_query, quantile_frame
+from .sampling import (
+    SampleSpec,
+    estimate_means,
+    estimate_quantiles,
+    estimate_stds,
+    interval,
+    sample_file,
+    sample_properties,
+)
+from .schema_cache import dtypes_properties
+from .serialization import dumps, to_json_value
 
 
 class DescribeDataInputSchema(Data):
@@ -31,8 +47,12 @@ class DescribeDataInputSchema(Data):
             "properties": {
                 "input_data_file_path": {
                     "type": "string",
-                    "description": "Path to the input data file",
+                    "description": "Path to the input data file, or a directory or glob of files",
                 },
+                **dataset_properties(),
+                **projection_properties(),
+                **filter_properties(),
+                **dtypes_properties(),
                 "percentiles": {
                     "type": "array",
                     "items": {"type": "number"},
@@ -45,6 +65,7 @@ class DescribeDataInputSchema(Data):
                     "description": "Interpolation method used when calculating percentiles",
                     "default": "nearest",
                 },
+                **sample_properties(),
             },
         }
 
@@ -53,10 +74,17 @@ class DescribeDataInputSchema(Data):
         input_data_file_path: str,
         percentiles: List[float] = [0.25, 0.5, 0.75],
         interpolation: str = "nearest",
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
     ) -> "DescribeDataInputSchema":
-        data = Data.from_file(input_data_file_path)
+        data = Data.from_file(
+            input_data_file_path, partitions=partitions, columns=columns, row_filter=row_filter, dtypes=dtypes
+        )
         return DescribeDataInputSchema(
-            df=data.df,
+            lf=data.lf,
+            streaming=data.streaming,
             percentiles=percentiles,
             interpolation=interpolation,
         )
@@ -64,40 +92,196 @@ class DescribeDataInputSchema(Data):
     @staticmethod
     def from_args(arguments: dict[str, Any]) -> "DescribeDataInputSchema":
         input_data_file_path = arguments["input_data_file_path"]
+        partitions = arguments.get("partitions")
+        columns = arguments.get("columns")
+        row_filter = arguments.get("filter")
+        dtypes = arguments.get("dtypes")
         percentiles = arguments.get("percentiles", [0.25, 0.5, 0.75])
         interpolation = arguments.get("interpolation", "nearest")
         return DescribeDataInputSchema.from_schema(
             input_data_file_path=input_data_file_path,
             percentiles=percentiles,
             interpolation=interpolation,
+            partitions=partitions,
+            columns=columns,
+            row_filter=row_filter,
+            dtypes=dtypes,
         )
 
 
-async def handle_describe_data(
-    arguments: dict[str, Any],
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-    describe_data_input = DescribeDataInputSchema.from_args(arguments)
-    describe_df = describe_data_input.df.describe(
-        percentiles=describe_data_input.percentiles,
-        interpolation=describe_data_input.interpolation,
+# Statistics of LazyFrame.describe other than the percentiles, which come before "max"
+_DESCRIBE_METRICS = ["count", "null_count", "mean", "std", "min", "max"]
+
+
+def describe(describe_data_input: DescribeDataInputSchema) -> pl.DataFrame:
+    """Compute the same summary as LazyFrame.describe, with all percentiles taken from one sort per column.
+
+    The other statistics and the percentiles are collected together, so the input is scanned once.
+
+    Args:
+        describe_data_input: Data and percentile settings.
+
+    Returns:
+        pl.DataFrame: One row per statistic and one column per input column.
+    """
+    schema, names, values = _statistics(describe_data_input)
+    # Like describe, report numeric results as floats and everything else as strings
+    describe_df = pl.from_dict(
+        {
+            col: [
+                None if val is None or isinstance(val, dict) else float(val) if _numeric_result(dtype) else str(val)
+                for val in values[col]
+            ]
+            for col, dtype in schema.items()
+        }
     )
+    describe_df.insert_column(0, pl.Series("statistic", names))
+    return describe_df
+
+
+def describe_statistics(describe_data_input: DescribeDataInputSchema) -> dict[str, dict[str, Any]]:
+    """Compute the statistics of describe as JSON values, keeping the type of each one.
+
+    Counts are integers and the other results of numeric columns are floats, as in describe.
+    The other results are converted with to_json_value instead of being formatted as strings,
+    so a minimum of a Date column is an ISO date and one of a Duration column an ISO duration.
+
+    Args:
+        describe_data_input: Data and percentile settings.
+
+    Returns:
+        dict[str, dict[str, Any]]: Statistics of each input column, by statistic name.
+    """
+    schema, names, values = _statistics(describe_data_input)
+    return {
+        col: {name: _json_statistic(name, val, _numeric_result(dtype)) for name, val in zip(names, values[col])}
+        for col, dtype in schema.items()
+    }
+
+
+def _json_statistic(name: str, value: Any, numeric_result: bool) -> Any:
+    if value is None or isinstance(value, dict):
+        return None
+    if name in ("count", "null_count"):
+        return int(value)
+    return to_json_value(float(value) if numeric_result else value)
+
+
+def _statistics(
+    describe_data_input: DescribeDataInputSchema,
+) -> tuple[pl.Schema, list[str], dict[str, list[Any]]]:
+    # Statistic names and the values of each column, with the percentiles before "max" as in LazyFrame.describe
+    lf = describe_data_input.lf
+    percentiles = sorted(describe_data_input.percentiles)
+    schema = lf.collect_schema()
+    if not schema:
+        raise ValueError("Cannot describe data without columns")
+    interpolation = describe_data_input.interpolation
+    queries = [_describe_query(lf, schema)]
+    if percentiles:
+        queries.append(multi_quantile_query(lf, percentiles, interpolation, temporal=True))
+    results = describe_data_input.collect_all(queries)
+
+    row = results[0].row(0)
+    num_metrics = len(_DESCRIBE_METRICS)
+    names = list(_DESCRIBE_METRICS)
+    values = {col: list(row[i * num_metrics : (i + 1) * num_metrics]) for i, col in enumerate(schema)}
+    if percentiles:
+        quantile_df = quantile_frame(results[1], schema, percentiles, interpolation)
+        names[-1:-1] = [f"{percentile * 100:g}%" for percentile in percentiles]
+        for col in schema:
+            values[col][-1:-1] = quantile_df[col].to_list()
+    return schema, names, values
+
 
-    # Convert the DataFrame to a dictionary format
+def _numeric_result(dtype: pl.DataType) -> bool:
+    # Types whose statistics LazyFrame.describe reports as floats
+    return dtype.is_numeric() or dtype.is_nested() or isinstance(dtype, (pl.Null, pl.Boolean))
+
+
+def _describe_query(lf: pl.LazyFrame, schema: pl.Schema) -> pl.LazyFrame:
+    # The statistics of _DESCRIBE_METRICS, computed as LazyFrame.describe does, in one row
+    exprs = []
+    for col, dtype in schema.items():
+        is_numeric = dtype.is_numeric()
+        is_temporal = not is_numeric and dtype.is_temporal()
+        has_min_max = not (
+            dtype.is_nested() or isinstance(dtype, (pl.Categorical, pl.Enum, pl.Null, pl.Object, pl.Unknown))
+        )
+        null = pl.lit(None)
+        exprs.extend(
+            [
+                pl.col(col).count().alias(f"count:{col}"),
+                pl.col(col).null_count().alias(f"null_count:{col}"),
+                (pl.col(col).mean() if is_numeric or is_temporal or dtype == pl.Boolean else null).alias(f"mean:{col}"),
+                (pl.col(col).std() if is_numeric else null).alias(f"std:{col}"),
+                (pl.col(col).min() if has_min_max else null).alias(f"min:{col}"),
+                (pl.col(col).max() if has_min_max else null).alias(f"max:{col}"),
+            ]
+        )
+    return lf.select(exprs)
+
+
+def compute_describe_data(arguments: dict[str, Any]) -> dict[str, Any]:
+    sample_spec = SampleSpec.from_args(arguments)
+    if sample_spec is not None:
+        return compute_sampled_describe_data(arguments, sample_spec)
+
+    describe_data_input = DescribeDataInputSchema.from_args(arguments)
     describe_dict = {
         "description": "Summary statistics of the input data",
-        "statistics": {
-            col: {
-                row: str(val) if val is not None else None
-                for row, val in zip(describe_df["statistic"], describe_df[col])
-            }
-            for col in describe_df.columns
-            if col != "statistic"
-        },
+        "statistics": describe_statistics(describe_data_input),
+    }
+
+    return describe_dict
+
+
+def compute_sampled_describe_data(arguments: dict[str, Any], sample_spec: SampleSpec) -> dict[str, Any]:
+    sample = sample_file(
+        arguments["input_data_file_path"],
+        sample_spec,
+        arguments.get("partitions"),
+        arguments.get("columns"),
+        arguments.get("filter"),
+        arguments.get("dtypes"),
+    )
+    describe_data_input = DescribeDataInputSchema(
+        lf=sample.df.lazy(),
+        percentiles=arguments.get("percentiles", [0.25, 0.5, 0.75]),
+        interpolation=arguments.get("interpolation", "nearest"),
+    )
+    statistics = describe_statistics(describe_data_input)
+
+    # Intervals of the mean, std and percentiles under the cluster sample design
+    percentiles = sorted(describe_data_input.percentiles)
+    means = estimate_means(sample)
+    stds = estimate_stds(sample)
+    quantiles = estimate_quantiles(sample, percentiles, describe_data_input.interpolation)
+    confidence_intervals = {
+        col: {
+            "mean": interval(*means[col], sample.critical_value),
+            "std": interval(*stds[col], sample.critical_value, lower=0.0),
+            **{f"{percentile * 100:g}%": quantiles[col][k][1] for k, percentile in enumerate(percentiles)},
+        }
+        for col in sample.df.columns
     }
 
+    return {
+        "description": "Summary statistics of a random sample of the input data",
+        "statistics": statistics,
+        "standard_errors": {col: {"mean": means[col][1], "std": stds[col][1]} for col in sample.df.columns},
+        "confidence_intervals": confidence_intervals,
+        "sample": sample.summary(),
+    }
+
+
+async def handle_describe_data(
+    arguments: dict[str, Any],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    describe_dict = await run_blocking(compute_describe_data, arguments)
     return [
         types.TextContent(
             type="text",
-            text=json.dumps(describe_dict),
+            text=dumps(describe_dict),
         )
     ]
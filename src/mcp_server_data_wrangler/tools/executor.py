@@ -0,0 +1,48 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from ..configurations import settings
+from ..make_logger import make_logger
+
+logger = make_logger(__name__)
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the shared thread pool that runs file loading and Polars compute.
+
+    Polars releases the GIL while it parses and aggregates, so a thread pool is enough to keep
+    the event loop free. Its size, set by Settings.EXECUTOR_MAX_WORKERS, bounds how many tool
+    calls do heavy work at once; further calls queue until a worker is free.
+
+    Returns:
+        ThreadPoolExecutor: The process-wide executor.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.EXECUTOR_MAX_WORKERS,
+            thread_name_prefix=settings.APP_NAME,
+        )
+        logger.debug(f"Started executor with {settings.EXECUTOR_MAX_WORKERS} workers")
+    return _executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking function on the shared executor without blocking the event loop.
+
+    Args:
+        func: Blocking function to run.
+        *args: Positional arguments for the function.
+        **kwargs: Keyword arguments for the function.
+
+    Returns:
+        T: The function's return value.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
@@ -0,0 +1,263 @@
+import hashlib
+import io
+import math
+import threading
+from typing import Any, NamedTuple
+
+import polars as pl
+
+from ..configurations import settings
+from ..make_logger import make_logger
+from ..utils import str_utils
+from .cache import FileFingerprint
+from .dataset import is_dataset
+from .decompress import Compression, record_end
+from .model import Data, SupportedFileType
+from .projection import project, resolve_columns
+
+logger = make_logger(__name__)
+
+# execution_path reported when a result comes from the incremental statistics
+INCREMENTAL_PATH = "incremental"
+
+# Bytes hashed at the start of the file and just before the last offset to detect rewrites
+_PREFIX_CHECK_BYTES = 64 * 1024
+_BOUNDARY_CHECK_BYTES = 4 * 1024
+
+
+class ColumnStats(NamedTuple):
+    non_null: int
+    null_count: int
+    sum: float | None
+    m2: float | None
+    min: Any
+    max: Any
+
+    def merge(self, other: "ColumnStats") -> "ColumnStats":
+        """Combine the statistics of two disjoint sets of rows (Chan et al. for the sum of squares)."""
+        if self.sum is None or other.sum is None or self.m2 is None or other.m2 is None:
+            total, m2 = None, None
+        elif self.non_null == 0 or other.non_null == 0:
+            total, m2 = self.sum + other.sum, self.m2 + other.m2
+        else:
+            count = self.non_null + other.non_null
+            delta = other.sum / other.non_null - self.sum / self.non_null
+            total = self.sum + other.sum
+            m2 = self.m2 + other.m2 + delta * delta * self.non_null * other.non_null / count
+        return ColumnStats(
+            non_null=self.non_null + other.non_null,
+            null_count=self.null_count + other.null_count,
+            sum=total,
+            m2=m2,
+            min=_pick(min, self.min, other.min),
+            max=_pick(max, self.max, other.max),
+        )
+
+    def mean(self) -> float | None:
+        if self.sum is None or self.non_null == 0:
+            return None
+        return self.sum / self.non_null
+
+    def var(self, ddof: int = 1) -> float | None:
+        if self.m2 is None or self.non_null - ddof <= 0:
+            return None
+        return self.m2 / (self.non_null - ddof)
+
+    def std(self, ddof: int = 1) -> float | None:
+        var = self.var(ddof)
+        return None if var is None else math.sqrt(var)
+
+
+def _pick(function: Any, a: Any, b: Any) -> Any:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return function(a, b)
+
+
+class FileStats(NamedTuple):
+    path: str
+    offset: int
+    schema: pl.Schema
+    header: bytes
+    prefix_digest: str
+    boundary_digest: str
+    columns: dict[str, ColumnStats]
+
+
+def frame_stats(data: Data, lf: pl.LazyFrame) -> dict[str, ColumnStats]:
+    """Compute mergeable statistics of every column in a single query.
+
+    Args:
+        data: Data whose engine settings execute the query.
+        lf: Rows to summarize.
+
+    Returns:
+        dict[str, ColumnStats]: Statistics for each column.
+    """
+    schema = lf.collect_schema()
+    exprs = []
+    for name, dtype in schema.items():
+        col = pl.col(name)
+        exprs.extend([col.count().alias(f"count:{name}"), col.null_count().alias(f"null_count:{name}")])
+        if dtype.is_numeric() or dtype == pl.Boolean:
+            values = col.cast(pl.Float64)
+            exprs.extend(
+                [
+                    values.sum().alias(f"sum:{name}"),
+                    ((values - values.mean()) ** 2).sum().alias(f"m2:{name}"),
+                ]
+            )
+        else:
+            exprs.extend([pl.lit(None).alias(f"sum:{name}"), pl.lit(None).alias(f"m2:{name}")])
+        if dtype.is_nested() or dtype == pl.Null:
+            exprs.extend([pl.lit(None).alias(f"min:{name}"), pl.lit(None).alias(f"max:{name}")])
+        else:
+            exprs.extend([col.min().alias(f"min:{name}"), col.max().alias(f"max:{name}")])
+
+    row = data.collect(lf.select(exprs)).row(0)
+    return {name: ColumnStats(*row[6 * i : 6 * (i + 1)]) for i, name in enumerate(schema)}
+
+
+def _digest(file: io.BufferedReader, start: int, end: int) -> str:
+    file.seek(start)
+    return hashlib.blake2b(file.read(end - start), digest_size=16).hexdigest()
+
+
+def _digests(file: io.BufferedReader, offset: int) -> tuple[str, str]:
+    return (
+        _digest(file, 0, min(offset, _PREFIX_CHECK_BYTES)),
+        _digest(file, max(offset - _BOUNDARY_CHECK_BYTES, 0), offset),
+    )
+
+
+class IncrementalStatsStore:
+    """Per-file column statistics of CSV files, extended in place when a file is appended to.
+
+    The stored state covers the file up to a byte offset on a line boundary. When the file has grown
+    and the bytes before that offset are unchanged, only the new complete lines are parsed and their
+    statistics are merged into the state. Any other change recomputes the statistics from scratch.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, FileStats] = {}
+        self._lock = threading.Lock()
+
+    def get(self, file_path: str) -> FileStats | None:
+        """Statistics of a CSV or TSV file, reading only what was appended since the last call.
+
+        Args:
+            file_path: Path to the input data file.
+
+        Returns:
+            FileStats | None: The statistics, or None when the file cannot be summarized incrementally.
+        """
+        fp = str_utils.strip_string(file_path)
+        if is_dataset(fp):
+            return None
+        file_type = SupportedFileType.from_file_path(fp)
+        if file_type not in (SupportedFileType.csv, SupportedFileType.tsv) or Compression.from_file_path(fp):
+            return None
+        fingerprint = FileFingerprint.from_path(fp)
+        with self._lock:
+            state = self._entries.get(fingerprint.path)
+
+        if state is not None:
+            updated = self._extend(state, fingerprint, file_type)
+            if updated is not None:
+                return updated
+        return self._compute(fp, fingerprint)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, state: FileStats) -> FileStats:
+        with self._lock:
+            self._entries[state.path] = state
+        return state
+
+    def _compute(self, fp: str, fingerprint: FileFingerprint) -> FileStats | None:
+        data = Data.from_file(fp)
+        columns = frame_stats(data, data.lf)
+        with open(fingerprint.path, "rb") as file:
+            header = file.readline()
+            file.seek(max(fingerprint.size - 1, 0))
+            ends_with_newline = file.read(1) == b"\n"
+            prefix_digest, boundary_digest = _digests(file, fingerprint.size)
+
+        state = FileStats(
+            path=fingerprint.path,
+            offset=fingerprint.size,
+            schema=data.lf.collect_schema(),
+            header=header,
+            prefix_digest=prefix_digest,
+            boundary_digest=boundary_digest,
+            columns=columns,
+        )
+        # A file that changed while it was read, or ends in the middle of a line, cannot be extended later
+        if ends_with_newline and FileFingerprint.from_path(fp) == fingerprint:
+            self._store(state)
+        return state
+
+    def _extend(self, state: FileStats, fingerprint: FileFingerprint, file_type: SupportedFileType) -> FileStats | None:
+        if fingerprint.size < state.offset:
+            return None
+        with open(fingerprint.path, "rb") as file:
+            if _digests(file, state.offset) != (state.prefix_digest, state.boundary_digest):
+                return None
+            file.seek(state.offset)
+            tail = file.read(fingerprint.size - state.offset)
+
+        # Only complete records are consumed; a partial last record is read on a later call
+        end = record_end(tail, quote=b'"')
+        if end == 0:
+            return state
+        try:
+            tail_df = pl.read_csv(
+                io.BytesIO(state.header + tail[:end]),
+                separator=file_type.separator,
+                schema=state.schema,
+            )
+        except pl.exceptions.PolarsError as e:
+            logger.debug(f"Recomputing statistics of {state.path}, appended rows do not match its schema: {e}")
+            return None
+
+        tail_columns = frame_stats(Data(lf=tail_df.lazy()), tail_df.lazy())
+        offset = state.offset + end
+        with open(fingerprint.path, "rb") as file:
+            prefix_digest, boundary_digest = _digests(file, offset)
+        logger.debug(f"Merged {tail_df.height} appended rows into the statistics of {state.path}")
+        return self._store(
+            state._replace(
+                offset=offset,
+                prefix_digest=prefix_digest,
+                boundary_digest=boundary_digest,
+                columns={name: stats.merge(tail_columns[name]) for name, stats in state.columns.items()},
+            )
+        )
+
+
+incremental_stats = IncrementalStatsStore()
+
+
+def incremental_file_stats(
+    file_path: str,
+    partitions: dict[str, Any] | None = None,
+    columns: list[str | dict[str, str]] | None = None,
+    row_filter: dict[str, Any] | None = None,
+    dtypes: dict[str, str] | None = None,
+) -> FileStats | None:
+    """Incremental statistics of the file when they are enabled and supported for its type.
+
+    Statistics cover every row of a file with its inferred types, so they are not used when
+    partitions, a row filter or dtype overrides are given. When columns are selected only their
+    statistics are returned.
+    """
+    if not settings.INCREMENTAL_STATS_ENABLED or partitions or row_filter is not None or dtypes:
+        return None
+    stats = incremental_stats.get(file_path)
+    if stats is None or columns is None:
+        return stats
+    return stats._replace(columns=project(stats.columns, resolve_columns(stats.schema, columns)))
@@ -0,0 +1,153 @@
+import hashlib
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+import polars as pl
+
+from ..configurations import settings
+from ..make_logger import make_logger
+from .cache import FileFingerprint, evict_files, mark_used
+
+logger = make_logger(__name__)
+
+# Values of Settings.CONVERSION_MODE
+CONVERSION_MODES = ["background", "on_demand", "off"]
+
+
+def conversions_dir() -> Path:
+    path = settings.STORAGE_PATH / "columnar"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class ColumnarCopies:
+    """Parquet copies of text files under STORAGE_PATH, read instead of parsing the text again.
+
+    A copy is named after the resolved source path, size and modification time, so any change to the
+    source makes its copy unreachable; the stale copy is deleted when the new one is written. Copies
+    are evicted oldest use first when they exceed Settings.CONVERSION_MAX_BYTES on disk.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[FileFingerprint, Future] = {}
+        self._failed: set[FileFingerprint] = set()
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    @staticmethod
+    def _prefix(fingerprint: FileFingerprint) -> str:
+        return hashlib.blake2b(fingerprint.path.encode(), digest_size=16).hexdigest()
+
+    def copy_path(self, fingerprint: FileFingerprint) -> Path:
+        return conversions_dir() / f"{self._prefix(fingerprint)}-{fingerprint.size}-{fingerprint.mtime_ns}.parquet"
+
+    def get(self, fingerprint: FileFingerprint) -> Path | None:
+        """Path of the up-to-date columnar copy of a file, or None when there is none yet."""
+        path = self.copy_path(fingerprint)
+        try:
+            mark_used(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def convert(self, fingerprint: FileFingerprint, scan: Callable[[], pl.LazyFrame]) -> Path | None:
+        """Write the columnar copy of a file, unless it exists already.
+
+        Args:
+            fingerprint: Fingerprint of the source file.
+            scan: Builds the lazy scan that parses the source file.
+
+        Returns:
+            Path | None: Path of the copy, or None when the file could not be converted.
+        """
+        path = self.get(fingerprint)
+        if path is not None:
+            return path
+        with self._lock:
+            if fingerprint in self._failed:
+                return None
+
+        path = self.copy_path(fingerprint)
+        tmp_path = path.with_name(f".{path.stem}-{uuid.uuid4().hex}.tmp")
+        try:
+            scan().sink_parquet(tmp_path)
+            # A source changed during the conversion would be copied under the old fingerprint
+            if FileFingerprint.from_path(fingerprint.path) != fingerprint:
+                tmp_path.unlink()
+                return None
+            os.replace(tmp_path, path)
+        except (pl.exceptions.PolarsError, OSError, ValueError) as e:
+            logger.warning(f"Could not convert {fingerprint.path} to Parquet: {e}")
+            tmp_path.unlink(missing_ok=True)
+            with self._lock:
+                self._failed.add(fingerprint)
+            return None
+
+        for stale in path.parent.glob(f"{self._prefix(fingerprint)}-*.parquet"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+        logger.debug(f"Converted {fingerprint.path} to {path}")
+        evict_files(conversions_dir(), "*.parquet", settings.CONVERSION_MAX_BYTES, keep=path)
+        return path
+
+    def submit(self, fingerprint: FileFingerprint, scan: Callable[[], pl.LazyFrame]) -> Future:
+        """Convert a file on a background thread, once per fingerprint.
+
+        Returns:
+            Future: Resolves to the path of the copy, or None when the file could not be converted.
+        """
+        with self._lock:
+            future = self._pending.get(fingerprint)
+            if future is not None:
+                return future
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{settings.APP_NAME}-ingest")
+            future = self._executor.submit(self.convert, fingerprint, scan)
+            self._pending[fingerprint] = future
+        future.add_done_callback(lambda _: self._done(fingerprint))
+        return future
+
+    def _done(self, fingerprint: FileFingerprint) -> None:
+        with self._lock:
+            self._pending.pop(fingerprint, None)
+
+
+columnar_copies = ColumnarCopies()
+
+
+def columnar_copy(fingerprint: FileFingerprint, scan: Callable[[], pl.LazyFrame]) -> Path | None:
+    """Columnar copy to read in place of a text file, following Settings.CONVERSION_MODE.
+
+    Files smaller than Settings.CONVERSION_MIN_BYTES, or larger than the whole disk budget of the
+    copies, Settings.CONVERSION_MAX_BYTES, are always parsed directly. In 'background'
+    mode the first call for a file schedules its conversion and parses the text, and calls after
+    the conversion finished read the copy. In 'on_demand' mode the first call converts the file
+    and reads the copy.
+
+    Args:
+        fingerprint: Fingerprint of the source file.
+        scan: Builds the lazy scan that parses the source file.
+
+    Returns:
+        Path | None: Path of the Parquet copy, or None when the source should be parsed.
+    """
+    mode = settings.CONVERSION_MODE
+    if mode not in CONVERSION_MODES:
+        raise ValueError(f"Invalid conversion mode: {mode}")
+    if (
+        mode == "off"
+        or fingerprint.size < settings.CONVERSION_MIN_BYTES
+        or fingerprint.size > settings.CONVERSION_MAX_BYTES
+    ):
+        return None
+    path = columnar_copies.get(fingerprint)
+    if path is not None:
+        return path
+    if mode == "on_demand":
+        return columnar_copies.convert(fingerprint, scan)
+    columnar_copies.submit(fingerprint, scan)
+    return None
@@ -1,17 +1,41 @@
+import json
 import os
 from abc import ABC
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
+from typing import Any, Callable, Iterator
 
 import polars as pl
 from pydantic import BaseModel, ConfigDict, Field
 
+from ..configurations import settings
+from ..make_logger import make_logger
 from ..utils import str_utils
+from .cache import FileFingerprint, dataframe_cache
+from .dataset import PATH_COLUMN, dataset_files, is_dataset, select_files
+from .decompress import Compression, scan_compressed_csv, scan_compressed_ndjson
+from .ingest import columnar_copy
+from .predicate import compile_filter
+from .projection import resolve_columns
+from .schema_cache import parse_dtypes, schema_cache
+
+logger = make_logger(__name__)
+
+# Files loaded inside a Data.shared_loads() block, keyed by path and load options
+_shared_loads: ContextVar[dict[tuple[str, str], "Data"] | None] = ContextVar("shared_loads", default=None)
+# Engine chosen by the planner for the loads of a tool call that do not force one
+_planned_streaming: ContextVar[bool | None] = ContextVar("planned_streaming", default=None)
 
 
 class SupportedFileType(Enum):
     csv = ("csv", ".csv")
     tsv = ("tsv", ".tsv")
     parquet = ("parquet", ".parquet")
+    arrow = ("arrow", ".arrow")
+    feather = ("feather", ".feather")
+    ipc = ("ipc", ".ipc")
+    ndjson = ("ndjson", ".ndjson")
 
     @staticmethod
     def from_str(file_type: str) -> "SupportedFileType":
@@ -27,6 +51,31 @@ class SupportedFileType(Enum):
                 return ft
         raise ValueError(f"Invalid file type: {file_type}")
 
+    @staticmethod
+    def from_file_path(file_path: str) -> "SupportedFileType":
+        """File type from the extension, looking through a compression suffix such as .csv.gz."""
+        root, extension = os.path.splitext(str_utils.strip_string(file_path))
+        if Compression.from_file_path(file_path) is None:
+            return SupportedFileType.from_extension(extension)
+        file_type = SupportedFileType.from_extension(os.path.splitext(root)[1])
+        if not file_type.is_text:
+            raise ValueError(f"Compressed {file_type.file_type} files are not supported: {extension}")
+        return file_type
+
+    @staticmethod
+    def from_input_path(file_path: str) -> "SupportedFileType":
+        """File type of an input file, or the common file type of the files of a directory or glob.
+
+        Raises:
+            ValueError: If a file type is not supported, or a dataset mixes several file types.
+        """
+        if not is_dataset(file_path):
+            return SupportedFileType.from_file_path(file_path)
+        file_types = {SupportedFileType.from_file_path(path) for path in dataset_files(file_path)}
+        if len(file_types) > 1:
+            raise ValueError(f"Files of different types in {file_path}: {sorted(ft.file_type for ft in file_types)}")
+        return file_types.pop()
+
     @property
     def file_type(self) -> str:
         return self.value[0]
@@ -35,6 +84,20 @@ class SupportedFileType(Enum):
     def extension(self) -> str:
         return self.value[1]
 
+    @property
+    def separator(self) -> str:
+        return "\t" if self == SupportedFileType.tsv else ","
+
+    @property
+    def is_text(self) -> bool:
+        """Whether the file is parsed from text, and may be compressed."""
+        return self in (SupportedFileType.csv, SupportedFileType.tsv, SupportedFileType.ndjson)
+
+    @property
+    def is_ipc(self) -> bool:
+        """Whether the file is in the Arrow IPC format, which Feather v2 files also use."""
+        return self in (SupportedFileType.arrow, SupportedFileType.feather, SupportedFileType.ipc)
+
 
 class Data(BaseModel, ABC):
     model_config = ConfigDict(
@@ -44,17 +107,378 @@ class Data(BaseModel, ABC):
         arbitrary_types_allowed=True,
     )
 
-    df: pl.DataFrame = Field(description="DataFrame containing the data")
+    lf: pl.LazyFrame = Field(description="LazyFrame query over the input data")
+    streaming: bool = Field(default=False, description="Execute queries with the Polars streaming engine")
 
     @staticmethod
-    def from_file(file_path: str) -> "Data":
+    def scan_file(
+        file_path: str,
+        partitions: dict[str, Any] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> pl.LazyFrame:
+        """Build a lazy scan over the input file without reading any data.
+
+        Handlers compose their query on top of the scan so that Polars can push projections
+        and predicates down into the reader and decode only the columns and rows they need.
+        Text files (CSV, TSV and NDJSON, optionally gzip or zstd compressed) are read from their
+        Parquet copy under STORAGE_PATH once one exists. Directories and globs are scanned as one
+        dataset with Data.scan_dataset.
+
+        A row filter is compiled into a predicate on the scan, so Polars evaluates it in the reader:
+        Parquet row groups whose statistics rule it out are skipped, and parsed rows that fail it
+        are dropped before the other columns are materialized.
+
+        CSV and TSV files are parsed with the schema cached by Data.csv_schema, and dtype overrides
+        are applied on top of it. Files read with overrides are always parsed from the text, since
+        their Parquet copy has the inferred types.
+
+        Args:
+            file_path: Path to the input data file, or a directory or glob of files.
+            partitions: Values of the hive partitions to read, for directory and glob inputs.
+            row_filter: Predicate of the filter argument selecting the rows to read.
+            dtypes: Data types of CSV and TSV columns, overriding the inferred ones.
+
+        Returns:
+            pl.LazyFrame: Lazy scan over the file.
+
+        Raises:
+            ValueError: If the file extension is not supported, or the row filter or dtypes are invalid.
+        """
         fp = str_utils.strip_string(file_path)
-        extension = os.path.splitext(fp)[1]
-        supported_file_type = SupportedFileType.from_extension(extension)
-        if supported_file_type == SupportedFileType.csv:
-            return Data(df=pl.read_csv(fp))
-        elif supported_file_type == SupportedFileType.tsv:
-            return Data(df=pl.read_csv(fp, separator="\t"))
+        if is_dataset(fp):
+            return Data.scan_dataset(fp, partitions, row_filter, dtypes)
+        if partitions:
+            raise ValueError(f"Partitions can only be selected in a directory or glob input: {fp}")
+        lf = Data._scan_input_file(fp, dtypes)
+        if row_filter is None:
+            return lf
+        return lf.filter(compile_filter(row_filter, lf.collect_schema()))
+
+    @staticmethod
+    def _scan_input_file(fp: str, dtypes: dict[str, str] | None = None) -> pl.LazyFrame:
+        supported_file_type = SupportedFileType.from_file_path(fp)
+        if dtypes:
+            return Data.scan_text_file(fp, dtypes)
+        if supported_file_type.is_text:
+            copy_path = columnar_copy(FileFingerprint.from_path(fp), lambda: Data.scan_text_file(fp))
+            if copy_path is not None:
+                return pl.scan_parquet(copy_path)
+            return Data.scan_text_file(fp)
         elif supported_file_type == SupportedFileType.parquet:
-            return Data(df=pl.read_parquet(fp))
-        raise ValueError(f"Unsupported file type: {extension}")
+            return pl.scan_parquet(fp)
+        elif supported_file_type.is_ipc:
+            return pl.scan_ipc(fp, memory_map=True)
+        raise ValueError(f"Unsupported file type: {supported_file_type.extension}")
+
+    @staticmethod
+    def scan_dataset(
+        file_path: str,
+        partitions: dict[str, Any] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> pl.LazyFrame:
+        """Lazily scan the files of a directory or glob as one table, with their hive partition columns.
+
+        Partition values are parsed from key=value directories, so files outside the requested
+        partitions, or whose partition values fail the parts of the row filter on partition keys,
+        are pruned before anything is opened. The remaining files are scanned in parallel and
+        concatenated, filling columns missing from some files with nulls.
+
+        Args:
+            file_path: Directory or glob pattern, e.g. events/ or events/date=*/*.parquet.
+            partitions: Value, or list of values, to read for each partition key.
+            row_filter: Predicate of the filter argument selecting the rows to read.
+            dtypes: Data types of CSV and TSV columns, overriding the inferred ones.
+
+        Returns:
+            pl.LazyFrame: Lazy scan over the selected files.
+
+        Raises:
+            ValueError: If the files have different types or a partition key is unknown.
+        """
+        SupportedFileType.from_input_path(file_path)
+        partition_df, selected_df = select_files(file_path, partitions, row_filter)
+        logger.debug(f"Scanning {selected_df.height} of {partition_df.height} files of {file_path}")
+
+        def with_partitions(row: dict[str, Any]) -> pl.LazyFrame:
+            partition_columns = [
+                pl.lit(value, dtype=partition_df.schema[key]).alias(key)
+                for key, value in row.items()
+                if key != PATH_COLUMN
+            ]
+            return Data.scan_file(row[PATH_COLUMN], dtypes=dtypes).with_columns(partition_columns)
+
+        if selected_df.is_empty():
+            lf = with_partitions(partition_df.row(0, named=True)).clear()
+        else:
+            lf = pl.concat(
+                [with_partitions(row) for row in selected_df.iter_rows(named=True)],
+                how="diagonal_relaxed",
+                parallel=True,
+            )
+        if row_filter is None:
+            return lf
+        return lf.filter(compile_filter(row_filter, lf.collect_schema()))
+
+    @staticmethod
+    def scan_text_file(file_path: str, dtypes: dict[str, str] | None = None) -> pl.LazyFrame:
+        """Lazily parse a CSV, TSV or NDJSON file, decompressing it in a stream when it is compressed.
+
+        Args:
+            file_path: Path to the input data file.
+            dtypes: Data types of CSV and TSV columns, overriding the inferred ones.
+
+        Returns:
+            pl.LazyFrame: Lazy scan over the parsed rows.
+
+        Raises:
+            ValueError: If dtypes are given for a file that is not CSV or TSV, or are invalid.
+        """
+        fp = str_utils.strip_string(file_path)
+        supported_file_type = SupportedFileType.from_file_path(fp)
+        compression = Compression.from_file_path(fp)
+        if supported_file_type == SupportedFileType.ndjson:
+            if dtypes:
+                raise ValueError(f"Data types can only be overridden in CSV and TSV files: {fp}")
+            return pl.scan_ndjson(fp) if compression is None else scan_compressed_ndjson(fp, compression)
+        if not supported_file_type.is_text:
+            raise ValueError(f"Data types can only be overridden in CSV and TSV files: {fp}")
+        schema = Data.csv_schema(fp, dtypes)
+        if compression is None:
+            return pl.scan_csv(fp, separator=supported_file_type.separator, schema=schema)
+        return scan_compressed_csv(fp, compression, separator=supported_file_type.separator, schema=schema)
+
+    @staticmethod
+    def csv_schema(file_path: str, dtypes: dict[str, str] | None = None) -> pl.Schema:
+        """Schema of a CSV or TSV file, inferred once per version of the file and cached under STORAGE_PATH.
+
+        The schema is inferred from the first Settings.CSV_INFER_SCHEMA_ROWS rows rather than the
+        Polars default of 100, so columns whose first values look like integers are still read as
+        floats or strings, and the cost is paid once: later reads, including from other processes,
+        parse the file with the persisted schema.
+
+        Args:
+            file_path: Path to the input data file.
+            dtypes: Data types of columns, e.g. {"zip": "String"}, overriding the inferred ones.
+
+        Returns:
+            pl.Schema: Schema of the file.
+
+        Raises:
+            ValueError: If a dtype is invalid or names an unknown column.
+        """
+        fp = str_utils.strip_string(file_path)
+        separator = SupportedFileType.from_file_path(fp).separator
+        compression = Compression.from_file_path(fp)
+
+        def infer() -> pl.Schema:
+            if compression is not None:
+                return scan_compressed_csv(
+                    fp, compression, separator=separator, infer_schema_rows=settings.CSV_INFER_SCHEMA_ROWS
+                ).collect_schema()
+            return pl.scan_csv(
+                fp, separator=separator, infer_schema_length=settings.CSV_INFER_SCHEMA_ROWS
+            ).collect_schema()
+
+        schema = schema_cache.get(FileFingerprint.from_path(fp), infer)
+        if not dtypes:
+            return schema
+        unknown = set(dtypes) - set(schema)
+        if unknown:
+            raise ValueError(f"Unknown columns in dtypes: {sorted(unknown)}")
+        return pl.Schema({**schema, **parse_dtypes(dtypes)})
+
+    @staticmethod
+    def scan_schema(
+        file_path: str,
+        partitions: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> pl.Schema:
+        """Schema of the input file, read from its header or metadata without loading any rows.
+
+        Text files are resolved from their cached schema, so reading a schema never starts their
+        conversion to Parquet.
+
+        Args:
+            file_path: Path to the input data file, or a directory or glob of files.
+            partitions: Values of the hive partitions to read, for directory and glob inputs.
+            dtypes: Data types of CSV and TSV columns, overriding the inferred ones.
+
+        Returns:
+            pl.Schema: Schema of the file.
+        """
+        fp = str_utils.strip_string(file_path)
+        if not is_dataset(fp) and not partitions and SupportedFileType.from_file_path(fp).is_text:
+            return Data.scan_text_file(fp, dtypes).collect_schema()
+        return Data.scan_file(fp, partitions, dtypes=dtypes).collect_schema()
+
+    @staticmethod
+    def from_file(
+        file_path: str,
+        streaming: bool | None = None,
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> "Data":
+        """Load the input file, reusing the process-wide DataFrame cache when possible.
+
+        Files that fit in the cache budget are read once and served from memory to every
+        later tool call until the file changes. Larger files stay as a lazy scan. Arrow IPC files
+        are memory-mapped instead of cached, so tool calls and processes share their pages through
+        the OS page cache. Files above Settings.STREAMING_THRESHOLD_BYTES, or any file when
+        streaming is requested or planned with Data.planned_engine, are left to the streaming
+        engine so they are aggregated in batches instead of loaded whole. A directory or glob is loaded like a single file of its total size,
+        unless partitions are selected, in which case only the selected files are scanned.
+
+        When columns are selected the scan is projected onto them, so the reader decodes only those
+        columns, and a row filter is pushed into the scan as a predicate. Both are served from the
+        cache when the whole file is cached already, and never load the whole file into it. Files
+        read with dtype overrides are parsed from the text and never cached.
+
+        Args:
+            file_path: Path to the input data file, or a directory or glob of files.
+            streaming: Force the streaming engine on or off. Chosen from the file size when None.
+            partitions: Values of the hive partitions to read, for directory and glob inputs.
+            columns: Column names, ^...$ regular expressions and type selectors of the columns to read.
+            row_filter: Predicate of the filter argument selecting the rows to read.
+            dtypes: Data types of CSV and TSV columns, overriding the inferred ones.
+
+        Returns:
+            Data: Data wrapping a LazyFrame over the cached DataFrame or over the file scan.
+        """
+        fp = str_utils.strip_string(file_path)
+        key = (fp, json.dumps([partitions, columns, row_filter, dtypes], sort_keys=True, default=str))
+        shared = _shared_loads.get()
+        if shared is not None and key in shared:
+            return shared[key]
+        data = Data._load_file(
+            fp, streaming=streaming, partitions=partitions, columns=columns, row_filter=row_filter, dtypes=dtypes
+        )
+        if shared is not None:
+            shared[key] = data
+        return data
+
+    @staticmethod
+    @contextmanager
+    def shared_loads() -> Iterator[None]:
+        """Share loads of the same file between all Data.from_file calls made inside the block.
+
+        The first call for a file decides how it is loaded and every later call gets the same Data,
+        so a group of tool calls on one file reads or scans it only once.
+        """
+        token = _shared_loads.set({})
+        try:
+            yield
+        finally:
+            _shared_loads.reset(token)
+
+    @staticmethod
+    @contextmanager
+    def planned_engine(streaming: bool) -> Iterator[None]:
+        """Use the streaming engine, or not, for every Data.from_file call made inside the block.
+
+        Calls that pass streaming explicitly keep their choice. Outside such a block the engine is
+        chosen from the file size.
+        """
+        token = _planned_streaming.set(streaming)
+        try:
+            yield
+        finally:
+            _planned_streaming.reset(token)
+
+    @staticmethod
+    def caches_whole_file(
+        file_path: str,
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> bool:
+        """Whether an in-memory load of the input reads the whole file into the DataFrame cache.
+
+        Mirrors the cache misses of Data.from_file: projected, filtered, partitioned and memory-mapped
+        reads, and files above the cache budget, stay lazy scans.
+        """
+        fp = str_utils.strip_string(file_path)
+        if not settings.CACHE_ENABLED or partitions or dtypes or columns is not None or row_filter is not None:
+            return False
+        if SupportedFileType.from_input_path(fp).is_ipc:
+            return False
+        return FileFingerprint.from_path(fp).size <= dataframe_cache.max_bytes
+
+    @staticmethod
+    def _load_file(
+        fp: str,
+        streaming: bool | None,
+        partitions: dict[str, Any] | None = None,
+        columns: list[str | dict[str, str]] | None = None,
+        row_filter: dict[str, Any] | None = None,
+        dtypes: dict[str, str] | None = None,
+    ) -> "Data":
+        lf = Data.scan_file(fp, partitions, row_filter, dtypes)
+        selected = resolve_columns(lf.collect_schema(), columns)
+        projected_lf = lf if selected is None else lf.select(selected)
+        fingerprint = FileFingerprint.from_path(fp)
+        if streaming is None:
+            streaming = _planned_streaming.get()
+        if streaming is None:
+            streaming = fingerprint.size > settings.STREAMING_THRESHOLD_BYTES
+        if streaming:
+            return Data(lf=projected_lf, streaming=True)
+        if not settings.CACHE_ENABLED or partitions or dtypes or SupportedFileType.from_input_path(fp).is_ipc:
+            return Data(lf=projected_lf)
+
+        df = dataframe_cache.get(fingerprint)
+        if df is None:
+            if fingerprint.size > dataframe_cache.max_bytes or selected is not None or row_filter is not None:
+                return Data(lf=projected_lf)
+            df = lf.collect()
+            dataframe_cache.put(fingerprint, df)
+            logger.debug(f"Loaded {fingerprint.path} into the DataFrame cache: {dataframe_cache.stats()}")
+        cached_lf = df.lazy()
+        if row_filter is not None:
+            cached_lf = cached_lf.filter(compile_filter(row_filter, df.schema))
+        return Data(lf=cached_lf if selected is None else cached_lf.select(selected))
+
+    def collect(self, query: pl.LazyFrame) -> pl.DataFrame:
+        """Execute a query built on top of this data's LazyFrame.
+
+        Args:
+            query: LazyFrame query derived from self.lf.
+
+        Returns:
+            pl.DataFrame: The query result.
+        """
+        return query.collect(engine="streaming" if self.streaming else "auto")
+
+    def collect_all(self, queries: list[pl.LazyFrame]) -> list[pl.DataFrame]:
+        """Execute several queries built on this data's LazyFrame together.
+
+        Polars merges the plans so the common scan of the input is executed only once.
+
+        Args:
+            queries: LazyFrame queries derived from self.lf.
+
+        Returns:
+            list[pl.DataFrame]: The query results, in the order of the queries.
+        """
+        return pl.collect_all(queries, engine="streaming" if self.streaming else "auto")
+
+    def for_each_batch(self, query: pl.LazyFrame, function: Callable[[pl.DataFrame], None]) -> None:
+        """Pass the result of a query to a function one batch at a time, in a single streaming pass.
+
+        The query always runs on the streaming engine, so the input is never materialized whole.
+        The function may be called from several engine threads and must synchronize its own state.
+
+        Args:
+            query: LazyFrame query derived from self.lf.
+            function: Called with each batch of the result.
+        """
+
+        def consume(df: pl.DataFrame) -> pl.DataFrame:
+            function(df)
+            return df.clear()
+
+        query.map_batches(consume, streamable=True).collect(engine="streaming")
@@ -0,0 +1,182 @@
+import math
+import os
+from typing import Any, Callable
+
+import polars as pl
+from pydantic import BaseModel, ConfigDict, Field
+
+from ..configurations import settings
+from ..make_logger import make_logger
+from ..utils import str_utils
+from .dataset import is_dataset
+from .model import Data, SupportedFileType
+from .projection import resolve_columns
+
+try:
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:  # pragma: no cover - pyarrow is an optional dependency
+    pq = None
+
+logger = make_logger(__name__)
+
+# Execution paths reported by the tools that can be answered from the Parquet footer
+METADATA_PATH = "metadata"
+SCAN_PATH = "scan"
+MIXED_PATH = "metadata+scan"
+
+
+class ParquetFooter(BaseModel):
+    """Row counts and column statistics read from a Parquet footer without decoding any data page."""
+
+    model_config = ConfigDict(
+        frozen=True,
+        arbitrary_types_allowed=True,
+    )
+
+    num_rows: int = Field(description="Number of rows in the file")
+    data_schema: pl.Schema = Field(description="Polars schema of the file")
+    null_counts: dict[str, int] = Field(
+        default_factory=dict,
+        description="Null count of each column whose statistics are present in every row group",
+    )
+    min_values: dict[str, Any] = Field(
+        default_factory=dict,
+        description="Minimum of each column whose statistics are present, exact and comparable with Polars",
+    )
+    max_values: dict[str, Any] = Field(
+        default_factory=dict,
+        description="Maximum of each column whose statistics are present, exact and comparable with Polars",
+    )
+
+    @staticmethod
+    def from_file(file_path: str) -> "ParquetFooter":
+        """Read the footer of a Parquet file.
+
+        The row count and schema are always available. Per-column statistics are read only when
+        pyarrow is installed, and a column is left out whenever a single row group lacks them.
+
+        Args:
+            file_path: Path to the Parquet file.
+
+        Returns:
+            ParquetFooter: Footer information of the file.
+        """
+        fp = str_utils.strip_string(file_path)
+        data_schema = pl.read_parquet_schema(fp)
+        if pq is None:
+            num_rows = pl.scan_parquet(fp).select(pl.len()).collect().item()
+            return ParquetFooter(num_rows=num_rows, data_schema=pl.Schema(data_schema))
+
+        metadata = pq.ParquetFile(fp).metadata
+        footer_columns = [metadata.schema.column(i).path for i in range(metadata.num_columns)]
+        if footer_columns != list(data_schema):
+            # Nested columns span several leaves; they are left to the scan
+            return ParquetFooter(num_rows=metadata.num_rows, data_schema=pl.Schema(data_schema))
+
+        null_counts: dict[str, int] = {}
+        min_values: dict[str, Any] = {}
+        max_values: dict[str, Any] = {}
+        for i, (name, dtype) in enumerate(data_schema.items()):
+            column_stats = [metadata.row_group(rg).column(i).statistics for rg in range(metadata.num_row_groups)]
+            if any(stats is None or not stats.has_null_count for stats in column_stats):
+                continue
+            null_count = sum(stats.null_count for stats in column_stats)
+            null_counts[name] = null_count
+
+            if null_count == metadata.num_rows:
+                min_values[name] = None
+                max_values[name] = None
+                continue
+            if not _has_exact_min_max(dtype):
+                continue
+            # Row groups made only of nulls carry no min/max and do not affect the result
+            column_stats = [stats for stats in column_stats if stats.num_values > 0]
+            if not column_stats or any(not stats.has_min_max for stats in column_stats):
+                continue
+            try:
+                mins = [stats.min for stats in column_stats]
+                maxs = [stats.max for stats in column_stats]
+            except (ValueError, TypeError, OverflowError) as e:
+                # pyarrow cannot convert every physical value to a Python object
+                logger.debug(f"Scanning {name} instead of reading its footer statistics: {e}")
+                continue
+            # Polars ignores NaN in min/max but writers may record it in the statistics
+            if any(isinstance(v, float) and math.isnan(v) for v in mins + maxs):
+                continue
+            min_values[name] = min(mins)
+            max_values[name] = max(maxs)
+
+        return ParquetFooter(
+            num_rows=metadata.num_rows,
+            data_schema=pl.Schema(data_schema),
+            null_counts=null_counts,
+            min_values=min_values,
+            max_values=max_values,
+        )
+
+
+def _has_exact_min_max(dtype: pl.DataType) -> bool:
+    """Whether footer min/max statistics of this type match what Polars computes.
+
+    String and binary statistics may be truncated by the writer, zoned timestamps or decimals
+    are converted differently by pyarrow, and nanosecond timestamps do not fit a Python datetime
+    without pandas, so those columns are always scanned.
+    """
+    if dtype.is_integer() or dtype.is_float() or dtype == pl.Boolean or dtype == pl.Date:
+        return True
+    return isinstance(dtype, pl.Datetime) and dtype.time_zone is None and dtype.time_unit != "ns"
+
+
+def has_parquet_footer(
+    file_path: str,
+    partitions: dict[str, Any] | None = None,
+    row_filter: dict[str, Any] | None = None,
+    dtypes: dict[str, str] | None = None,
+) -> bool:
+    """Whether the input is a single Parquet file read whole, so its footer can answer metadata queries."""
+    if partitions or row_filter is not None or dtypes or is_dataset(file_path):
+        return False
+    return SupportedFileType.from_file_path(file_path) == SupportedFileType.parquet
+
+
+def execution_path(metadata_columns: int, scan_columns: int) -> str:
+    if scan_columns == 0:
+        return METADATA_PATH
+    if metadata_columns == 0:
+        return SCAN_PATH
+    return MIXED_PATH
+
+
+def aggregate_with_footer(
+    file_path: str,
+    footer: ParquetFooter,
+    footer_values: dict[str, Any],
+    aggregate: Callable[[pl.LazyFrame], pl.LazyFrame],
+    streaming: bool | None = None,
+    columns: list[str | dict[str, str]] | None = None,
+) -> tuple[dict[str, Any], str]:
+    """Answer a per-column aggregate from the footer, scanning only the columns it cannot answer.
+
+    Args:
+        file_path: Path to the Parquet file.
+        footer: Footer of the file.
+        footer_values: Aggregate values available from the footer, keyed by column.
+        aggregate: Builds the aggregate query for the remaining columns.
+        streaming: Force the streaming engine on or off for the scan. Chosen from the file size when None.
+        columns: Column names, ^...$ regular expressions and type selectors of the columns to answer.
+            Every column when None.
+
+    Returns:
+        tuple[dict[str, Any], str]: Values for every selected column in schema order, and the execution path used.
+    """
+    selected = resolve_columns(footer.data_schema, columns) or list(footer.data_schema)
+    footer_values = {col: footer_values[col] for col in selected if col in footer_values}
+    scan_columns = [col for col in selected if col not in footer_values]
+    values = dict(footer_values)
+    if scan_columns:
+        if streaming is None:
+            streaming = os.path.getsize(str_utils.strip_string(file_path)) > settings.STREAMING_THRESHOLD_BYTES
+        data = Data(lf=Data.scan_file(file_path).select(scan_columns), streaming=streaming)
+        scanned_df = data.collect(aggregate(data.lf))
+        values.update(zip(scanned_df.columns, scanned_df.row(0)))
+    return {col: values[col] for col in selected}, execution_path(len(footer_values), len(scan_columns))
@@ -0,0 +1,205 @@
+from typing import Any, Callable, NamedTuple
+
+from ..configurations import settings
+from ..make_logger import make_logger
+from ..utils import str_utils
+from .cache import FileFingerprint
+from .dataset import dataset_files, is_dataset
+from .decompress import Compression
+from .model import Data, SupportedFileType
+from .parquet_metadata import has_parquet_footer
+from .sampling import SampleSpec
+from .size_estimate import estimate_file_size, scale_size
+
+logger = make_logger(__name__)
+
+# Execution modes of a planned tool call
+EAGER = "eager"
+LAZY = "lazy"
+STREAMING = "streaming"
+SAMPLED = "sampled"
+METADATA = "metadata"
+
+# Tools answered from metadata or the header of the file, which never hold its rows
+_METADATA_TOOLS = {"data_schema", "data_shape"}
+# Tools answered from the footer of a Parquet file read whole
+_FOOTER_TOOLS = {"data_count", "data_min", "data_max"}
+# Tools that manage stored results or other calls, and never read their input file themselves
+_UNPLANNED_TOOLS = {"batch", "catalog"}
+# Memory of the tools that hold every value of the columns they read at once, relative to their input;
+# the order statistics copy their input to sort it
+_HOLISTIC_FACTORS = {
+    "describe_data": 2.0,
+    "data_median": 2.0,
+    "data_quantile": 2.0,
+    "data_n_unique": 2.0,
+    "data_profile": 2.0,
+    "data_estimated_size": 1.0,
+}
+# Holistic tools that can merge sketches built in one streaming pass instead
+_APPROXIMATE_TOOLS = {"data_median", "data_quantile", "data_n_unique"}
+# Tools that can estimate their result from a random sample
+_SAMPLING_TOOLS = {"describe_data", "data_quantile", "data_mean", "data_std"}
+# In-memory bytes per byte on disk, for inputs that cannot be measured from a prefix
+_PARQUET_EXPANSION = 4.0
+_COMPRESSED_EXPANSION = 5.0
+# Part of the memory budget a sample chosen by the planner is sized to
+_SAMPLE_BUDGET_FRACTION = 0.5
+
+
+class Plan(NamedTuple):
+    """Execution of a tool call chosen to fit Settings.MEMORY_BUDGET_BYTES."""
+
+    mode: str
+    input_bytes: int
+    required_bytes: int
+    exact_estimate: bool
+    reason: str
+    adjusted_arguments: dict[str, Any]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "input_bytes": self.input_bytes,
+            "required_bytes": self.required_bytes,
+            "memory_budget_bytes": settings.MEMORY_BUDGET_BYTES,
+            "estimate": "exact" if self.exact_estimate else "estimated",
+            "reason": self.reason,
+            "adjusted_arguments": self.adjusted_arguments,
+        }
+
+
+def plan_call(tool: str, arguments: dict[str, Any]) -> Plan | None:
+    """Choose how a tool call reads its input so that it fits the memory budget.
+
+    The memory a call needs is the in-memory size of the columns it reads, measured on a prefix of
+    the file when possible and extrapolated from its size on disk otherwise, times the working
+    memory of the operation. Calls that fit run in memory: eager when they load the whole file into
+    the DataFrame cache, lazy otherwise. Aggregations that do not fit run with the streaming engine.
+    Order statistics that do not fit switch to sketches or a random sample, and calls that cannot
+    be bounded are rejected.
+
+    Args:
+        tool: Name of the tool.
+        arguments: Arguments of the call.
+
+    Returns:
+        Plan | None: The plan, or None when the call is not planned.
+
+    Raises:
+        ValueError: If the call cannot fit the memory budget.
+    """
+    file_path = arguments.get("input_data_file_path")
+    if (
+        not settings.PLANNER_ENABLED
+        or not isinstance(file_path, str)
+        or tool in _METADATA_TOOLS
+        or tool in _UNPLANNED_TOOLS
+    ):
+        return None
+    fp = str_utils.strip_string(file_path)
+    partitions, columns, row_filter, dtypes = (
+        arguments.get("partitions"),
+        arguments.get("columns"),
+        arguments.get("filter"),
+        arguments.get("dtypes"),
+    )
+    if tool in _FOOTER_TOOLS and has_parquet_footer(fp, partitions, row_filter, dtypes):
+        # Columns without footer statistics are aggregated by a scan that never holds their rows
+        return Plan(METADATA, 0, 0, False, "The statistics are read from the Parquet footer", {})
+    budget = settings.MEMORY_BUDGET_BYTES
+
+    # A row filter only shrinks the input, so the estimate of the unfiltered input is an upper bound
+    estimate = estimate_file_size(fp, partitions, columns, None, dtypes)
+    if estimate is not None:
+        input_bytes, exact = estimate.total, estimate.exact
+    else:
+        input_bytes, exact = _expanded_disk_size(fp), False
+    if tool == "data_estimated_size" and estimate is not None:
+        return Plan(METADATA, round(input_bytes), 0, exact, "The size is measured on a prefix of the input", {})
+
+    def plan(mode: str, required: float, reason: str, adjusted: dict[str, Any] | None = None) -> Plan:
+        return Plan(mode, round(input_bytes), round(required), exact, reason, adjusted or {})
+
+    if tool in _SAMPLING_TOOLS and SampleSpec.from_args(arguments) is not None:
+        fraction = arguments.get("sample_fraction")
+        return plan(SAMPLED, input_bytes * fraction if fraction else 0, "A random sample was requested")
+
+    factor = None if arguments.get("approximate") else _holistic_factor(tool, arguments)
+    required = input_bytes * (factor or 1.0)
+    streaming = arguments.get("streaming")
+    if streaming is True and (factor is None or required <= budget):
+        return plan(STREAMING, 0, "The streaming engine was requested")
+    if required <= budget:
+        if factor is None and FileFingerprint.from_path(fp).size > settings.STREAMING_THRESHOLD_BYTES:
+            return plan(STREAMING, 0, "The file is above the streaming threshold")
+        if Data.caches_whole_file(fp, partitions, columns, row_filter, dtypes):
+            return plan(EAGER, required, "The file fits the memory budget and is loaded into the DataFrame cache")
+        return plan(LAZY, required, "The columns read fit the memory budget")
+
+    over_budget = f"{tool} needs about {_mb(required)} of memory, above the budget of {_mb(budget)}"
+    if factor is None:
+        if streaming is False:
+            raise ValueError(f"{over_budget}. Omit streaming or set it to true")
+        return plan(STREAMING, 0, f"{over_budget}, so the input is aggregated in batches")
+    if tool in _APPROXIMATE_TOOLS:
+        return plan(STREAMING, 0, f"{over_budget}, so it is estimated with sketches", {"approximate": True})
+    if tool in _SAMPLING_TOOLS:
+        fraction = min(budget * _SAMPLE_BUDGET_FRACTION / required, 1.0)
+        return plan(
+            SAMPLED,
+            required * fraction,
+            f"{over_budget}, so it is estimated from a sample",
+            {"sample_fraction": fraction},
+        )
+    raise ValueError(f"{over_budget}. Select fewer columns or partitions, or compute the statistics separately")
+
+
+def compute_with_plan(
+    tool: str, compute: Callable[[dict[str, Any]], dict[str, Any]], arguments: dict[str, Any]
+) -> dict[str, Any]:
+    """Plan a tool call, compute it as planned and report the plan in its result.
+
+    Args:
+        tool: Name of the tool.
+        compute: Blocking function computing the tool result.
+        arguments: Arguments of the call.
+
+    Returns:
+        dict[str, Any]: The tool result, with the plan under "plan" when the call was planned.
+
+    Raises:
+        ValueError: If the call cannot fit the memory budget.
+    """
+    plan = plan_call(tool, arguments)
+    if plan is None:
+        return compute(arguments)
+    logger.debug(f"Planned {tool} as {plan.mode}: {plan.reason}")
+    with Data.planned_engine(plan.mode == STREAMING):
+        result = compute({**arguments, **plan.adjusted_arguments})
+    return {**result, "plan": plan.to_dict()}
+
+
+def _holistic_factor(tool: str, arguments: dict[str, Any]) -> float | None:
+    if tool == "data_profile":
+        # The default statistics include the median
+        statistics = arguments.get("statistics")
+        if statistics is not None and not {"median", "quantile"} & set(statistics):
+            return None
+    return _HOLISTIC_FACTORS.get(tool)
+
+
+def _expanded_disk_size(fp: str) -> float:
+    # In-memory size of inputs that cannot be measured from a prefix: datasets and compressed files
+    size = FileFingerprint.from_path(fp).size
+    file_type = SupportedFileType.from_input_path(fp)
+    if file_type == SupportedFileType.parquet:
+        return size * _PARQUET_EXPANSION
+    sample_path = dataset_files(fp)[0] if is_dataset(fp) else fp
+    if Compression.from_file_path(sample_path) is not None:
+        return size * _COMPRESSED_EXPANSION
+    return float(size)
+
+
+def _mb(size: float) -> str:
+    return f"{scale_size(size, 'mb'):.1f} MiB"
@@ -0,0 +1,151 @@
+import functools
+import operator
+from datetime import date, datetime, time
+from typing import Any, Callable
+
+import polars as pl
+
+# Comparison operators of the filter argument, applied as pl.col(column) <op> value
+COMPARISON_OPS: dict[str, Callable[[pl.Expr, pl.Expr], pl.Expr]] = {
+    "==": lambda col, value: col == value,
+    "!=": lambda col, value: col != value,
+    "<": lambda col, value: col < value,
+    "<=": lambda col, value: col <= value,
+    ">": lambda col, value: col > value,
+    ">=": lambda col, value: col >= value,
+}
+# Operators comparing a column with a list of values
+MEMBERSHIP_OPS = ["in", "not_in"]
+# Operators that take no value
+NULL_OPS = ["is_null", "is_not_null"]
+FILTER_OPS = [*COMPARISON_OPS, *MEMBERSHIP_OPS, *NULL_OPS]
+_BOOLEAN_KEYS = ("and", "or", "not")
+
+
+def filter_properties() -> dict[str, Any]:
+    """JSON schema properties of the row filter argument shared by the tools that read input files."""
+    comparison = {
+        "type": "object",
+        "properties": {
+            "column": {"type": "string"},
+            "op": {"type": "string", "enum": FILTER_OPS},
+            "value": {},
+        },
+        "required": ["column", "op"],
+    }
+    return {
+        "filter": {
+            "type": "object",
+            "description": "Only use the rows matching this predicate. A predicate is a comparison "
+            "{'column': 'country', 'op': '==', 'value': 'JP'}, with op one of "
+            f"{', '.join(FILTER_OPS)} ('in' and 'not_in' take a list of values, the null checks no value), "
+            "or a combination {'and': [...]}, {'or': [...]} or {'not': {...}}. Dates and datetimes are "
+            "compared with ISO 8601 strings. The predicate is pushed into the scan, so Parquet row groups "
+            "whose statistics exclude it are skipped and hive partitions that cannot match are not read",
+            "anyOf": [
+                comparison,
+                {"type": "object", "properties": {"and": {"type": "array"}}, "required": ["and"]},
+                {"type": "object", "properties": {"or": {"type": "array"}}, "required": ["or"]},
+                {"type": "object", "properties": {"not": {"type": "object"}}, "required": ["not"]},
+            ],
+        },
+    }
+
+
+def compile_filter(predicate: dict[str, Any], schema: pl.Schema) -> pl.Expr:
+    """Compile a filter predicate into a Polars expression.
+
+    Args:
+        predicate: Comparison or and/or/not combination of predicates.
+        schema: Schema of the data the predicate applies to, used to type the compared values.
+
+    Returns:
+        pl.Expr: Boolean expression selecting the matching rows.
+
+    Raises:
+        ValueError: If the predicate is malformed, names an unknown column, or compares with a value
+            that cannot be converted to the column type.
+    """
+    if not isinstance(predicate, dict):
+        raise ValueError(f"Invalid filter predicate: {predicate}")
+    if "and" in predicate or "or" in predicate:
+        key = "and" if "and" in predicate else "or"
+        operands = predicate[key]
+        if len(predicate) != 1 or not isinstance(operands, list) or not operands:
+            raise ValueError(f"'{key}' takes a non-empty list of predicates: {predicate}")
+        expressions = [compile_filter(operand, schema) for operand in operands]
+        # Chained & and | let Polars split the conjuncts and push each one down separately
+        return functools.reduce(operator.and_ if key == "and" else operator.or_, expressions)
+    if "not" in predicate:
+        if len(predicate) != 1:
+            raise ValueError(f"'not' takes a single predicate: {predicate}")
+        return ~compile_filter(predicate["not"], schema)
+
+    column, op = predicate.get("column"), predicate.get("op")
+    if not isinstance(column, str) or column not in schema:
+        raise ValueError(f"Unknown column in filter: {column}")
+    if op not in FILTER_OPS:
+        raise ValueError(f"Invalid filter operator: {op}. Must be one of {FILTER_OPS}")
+    col = pl.col(column)
+    if op in NULL_OPS:
+        return col.is_null() if op == "is_null" else col.is_not_null()
+    if "value" not in predicate:
+        raise ValueError(f"Filter operator {op} requires a value: {predicate}")
+    dtype = schema[column]
+    value = predicate["value"]
+    if op in MEMBERSHIP_OPS:
+        if not isinstance(value, list):
+            raise ValueError(f"Filter operator {op} requires a list of values: {predicate}")
+        values = pl.Series([_typed_value(item, dtype) for item in value], dtype=_literal_dtype(dtype), strict=False)
+        return col.is_in(values) if op == "in" else ~col.is_in(values)
+    if value is None:
+        raise ValueError(f"Compare with null using is_null or is_not_null: {predicate}")
+    return COMPARISON_OPS[op](col, pl.lit(_typed_value(value, dtype), dtype=_literal_dtype(dtype)))
+
+
+def _typed_value(value: Any, dtype: pl.DataType) -> Any:
+    # JSON has no temporal types, so dates and datetimes are given as ISO 8601 strings
+    if not isinstance(value, str):
+        return value
+    try:
+        if dtype == pl.Date:
+            return date.fromisoformat(value)
+        if isinstance(dtype, pl.Datetime):
+            return datetime.fromisoformat(value)
+        if dtype == pl.Time:
+            return time.fromisoformat(value)
+    except ValueError as e:
+        raise ValueError(f"Invalid {dtype} value in filter: {value}") from e
+    return value
+
+
+def _literal_dtype(dtype: pl.DataType) -> pl.DataType | None:
+    # Temporal literals take the column type, so time units and zones match; others keep their own type
+    return dtype if dtype.is_temporal() else None
+
+
+def filter_columns(predicate: dict[str, Any]) -> set[str]:
+    """Columns referenced by a filter predicate."""
+    if not isinstance(predicate, dict):
+        return set()
+    for key in _BOOLEAN_KEYS:
+        if key in predicate:
+            operands = predicate[key] if isinstance(predicate[key], list) else [predicate[key]]
+            return set().union(*(filter_columns(operand) for operand in operands))
+    return {predicate["column"]} if isinstance(predicate.get("column"), str) else set()
+
+
+def restrict_filter(predicate: dict[str, Any], columns: set[str]) -> dict[str, Any] | None:
+    """The part of a filter that only references the given columns, such as the hive partition keys.
+
+    Top-level 'and' operands are kept or dropped one by one, so every row matching the predicate
+    also matches the restricted predicate.
+
+    Returns:
+        dict[str, Any] | None: The restricted predicate, or None when no part of it applies.
+    """
+    operands = predicate["and"] if isinstance(predicate.get("and"), list) and len(predicate) == 1 else [predicate]
+    kept = [operand for operand in operands if (referenced := filter_columns(operand)) and referenced <= columns]
+    if not kept:
+        return None
+    return kept[0] if len(kept) == 1 else {"and": kept}
@@ -0,0 +1,79 @@
+from typing import Any, Callable
+
+import polars as pl
+import polars.selectors as cs
+
+# Column type selectors accepted in the columns argument, as {"selector": name}
+COLUMN_SELECTORS: dict[str, Callable[[], Any]] = {
+    "numeric": cs.numeric,
+    "integer": cs.integer,
+    "float": cs.float,
+    "string": cs.string,
+    "boolean": cs.boolean,
+    "temporal": cs.temporal,
+}
+
+
+def projection_properties() -> dict[str, Any]:
+    """JSON schema properties of the column projection argument shared by the tools that read input files."""
+    return {
+        "columns": {
+            "type": "array",
+            "description": "Columns to compute, so the others are never read or decoded. Each item is a column "
+            "name, a regular expression wrapped in ^ and $ (e.g. '^price_.*$'), or a type selector such as "
+            "{'selector': 'numeric'}. All columns are used when omitted",
+            "items": {
+                "anyOf": [
+                    {"type": "string"},
+                    {
+                        "type": "object",
+                        "properties": {"selector": {"type": "string", "enum": list(COLUMN_SELECTORS)}},
+                        "required": ["selector"],
+                        "additionalProperties": False,
+                    },
+                ]
+            },
+            "minItems": 1,
+        },
+    }
+
+
+def resolve_columns(schema: pl.Schema, columns: list[str | dict[str, str]] | None) -> list[str] | None:
+    """Names of the columns selected by a columns argument, in schema order.
+
+    Args:
+        schema: Schema of the input data.
+        columns: Column names, ^...$ regular expressions and {"selector": ...} type selectors.
+
+    Returns:
+        list[str] | None: The selected column names, or None when every column is used.
+
+    Raises:
+        ValueError: If a column name is not in the schema, a selector is unknown, or nothing is selected.
+    """
+    if columns is None:
+        return None
+    selector = cs.by_name([])
+    for column in columns:
+        if isinstance(column, dict):
+            name = column.get("selector")
+            if name not in COLUMN_SELECTORS:
+                raise ValueError(f"Invalid column selector: {name}")
+            selector = selector | COLUMN_SELECTORS[name]()
+        elif column.startswith("^") and column.endswith("$"):
+            selector = selector | cs.matches(column)
+        elif column in schema:
+            selector = selector | cs.by_name(column)
+        else:
+            raise ValueError(f"Unknown column: {column}")
+    selected = list(cs.expand_selector(schema, selector))
+    if not selected:
+        raise ValueError(f"No column matches {columns}")
+    return selected
+
+
+def project(values: dict[str, Any], selected: list[str] | None) -> dict[str, Any]:
+    """Keep the per-column values of the selected columns, for results computed without a scan."""
+    if selected is None:
+        return values
+    return {col: values[col] for col in selected}
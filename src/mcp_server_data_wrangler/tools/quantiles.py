@@ -0,0 +1,177 @@
+import math
+import threading
+from typing import Sequence
+
+import polars as pl
+
+from .model import Data
+from .sketches import KLLSketch
+
+INTERPOLATIONS = ["nearest", "higher", "lower", "midpoint", "linear"]
+
+
+def _float_index(count: int, null_count: int, quantile: float) -> float:
+    # Polars indexes into the sorted column with its nulls first, and the interpolation weight depends on it
+    return (count - 1) * quantile + null_count
+
+
+def _gather_positions(count: pl.Expr, null_count: pl.Expr, quantiles: Sequence[float], interpolation: str) -> pl.Expr:
+    # The lower neighbour of every quantile followed by the upper neighbour, as indices into the non-null values
+    float_idx = [(count.cast(pl.Float64) - 1) * quantile + null_count for quantile in quantiles]
+    if interpolation == "nearest":
+        lower = [(idx + 0.5).floor() for idx in float_idx]
+    elif interpolation == "higher":
+        lower = [idx.ceil() for idx in float_idx]
+    else:
+        lower = [idx.floor() for idx in float_idx]
+    upper = [idx.ceil() for idx in float_idx]
+    return pl.concat_list([(position - null_count).cast(pl.Int64) for position in [*lower, *upper]])
+
+
+def multi_quantile_query(
+    lf: pl.LazyFrame,
+    quantiles: Sequence[float],
+    interpolation: str = "nearest",
+    temporal: bool = False,
+) -> pl.LazyFrame:
+    """Build a query that sorts each column once and picks the neighbours of every quantile.
+
+    The query returns a single row with one struct per column holding the counts and the picked
+    values. Pass the collected result to quantile_frame to get the quantiles themselves.
+
+    Args:
+        lf: Data to compute the quantiles of.
+        quantiles: Quantiles between 0.0 and 1.0.
+        interpolation: One of 'nearest', 'higher', 'lower', 'midpoint', 'linear'.
+        temporal: Also compute quantiles of temporal columns, as LazyFrame.describe does.
+
+    Returns:
+        pl.LazyFrame: Query over lf.
+    """
+    if interpolation not in INTERPOLATIONS:
+        raise ValueError(f"Invalid interpolation: {interpolation}")
+    for quantile in quantiles:
+        if not 0.0 <= quantile <= 1.0:
+            raise ValueError(f"Quantile must be between 0.0 and 1.0: {quantile}")
+
+    exprs = []
+    for name, dtype in lf.collect_schema().items():
+        if dtype.is_numeric() or (temporal and dtype.is_temporal()):
+            count = pl.col(name).count()
+            null_count = pl.col(name).null_count()
+            column = pl.col(name).to_physical() if dtype.is_temporal() else pl.col(name)
+            values = (
+                column.cast(pl.Float64)
+                .drop_nulls()
+                .sort()
+                .implode()
+                .list.gather(_gather_positions(count, null_count, quantiles, interpolation), null_on_oob=True)
+            )
+            exprs.append(
+                pl.struct(count.alias("count"), null_count.alias("null_count"), values.alias("values")).alias(name)
+            )
+        else:
+            exprs.append(pl.lit(None).alias(name))
+    return lf.select(exprs)
+
+
+def _interpolate(lower: float | None, upper: float | None, float_idx: float, interpolation: str) -> float | None:
+    # Same arithmetic as Polars' own quantile
+    if lower is None or interpolation in ("nearest", "higher", "lower") or lower == upper:
+        return lower
+    assert upper is not None
+    if interpolation == "midpoint":
+        return (lower + upper) / 2.0
+    return lower + (upper - lower) * (float_idx - math.floor(float_idx))
+
+
+def quantile_frame(
+    result_df: pl.DataFrame,
+    schema: pl.Schema,
+    quantiles: Sequence[float],
+    interpolation: str = "nearest",
+) -> pl.DataFrame:
+    """Turn the result of multi_quantile_query into one row per quantile.
+
+    Numeric columns become Float64 and temporal columns keep their type, like LazyFrame.quantile.
+
+    Args:
+        result_df: Collected result of multi_quantile_query.
+        schema: Schema of the data the query ran on.
+        quantiles: Quantiles passed to multi_quantile_query.
+        interpolation: Interpolation passed to multi_quantile_query.
+
+    Returns:
+        pl.DataFrame: Quantile values, one row per quantile in the given order.
+    """
+    num_quantiles = len(quantiles)
+    columns = []
+    for name, picked in zip(result_df.columns, result_df.row(0)):
+        dtype = schema[name]
+        if picked is None:
+            columns.append(pl.Series(name, [None] * num_quantiles, dtype=dtype))
+            continue
+        values = picked["values"]
+        column = pl.Series(
+            name,
+            [
+                _interpolate(
+                    values[k],
+                    values[num_quantiles + k],
+                    _float_index(picked["count"], picked["null_count"], quantile),
+                    interpolation,
+                )
+                for k, quantile in enumerate(quantiles)
+            ],
+            dtype=pl.Float64,
+        )
+        columns.append(column.cast(dtype) if dtype.is_temporal() else column)
+    return pl.DataFrame(columns)
+
+
+def approximate_quantile_frame(
+    data: Data,
+    quantiles: Sequence[float],
+    rank_error: float = 0.01,
+) -> tuple[pl.DataFrame, float]:
+    """Estimate quantiles of every numeric column with KLL sketches built in one streaming pass.
+
+    Each batch is summarized by its own sketches, which are then merged into one sketch per column.
+    Memory stays bounded by the sketch size however large the input is.
+
+    Args:
+        data: Data to compute the quantiles of.
+        quantiles: Quantiles between 0.0 and 1.0.
+        rank_error: Target normalized rank error of each estimate.
+
+    Returns:
+        tuple[pl.DataFrame, float]: One row per quantile with numeric columns as Float64 and the
+            rank error the sketches guarantee.
+    """
+    for quantile in quantiles:
+        if not 0.0 <= quantile <= 1.0:
+            raise ValueError(f"Quantile must be between 0.0 and 1.0: {quantile}")
+    k = KLLSketch.k_for_rank_error(rank_error)
+    schema = data.lf.collect_schema()
+    numeric_columns = [name for name, dtype in schema.items() if dtype.is_numeric()]
+    sketches = {name: KLLSketch(k) for name in numeric_columns}
+    lock = threading.Lock()
+
+    def update(batch: pl.DataFrame) -> None:
+        batch_sketches = {name: KLLSketch(k) for name in numeric_columns}
+        for name, sketch in batch_sketches.items():
+            sketch.update(batch[name].drop_nulls().cast(pl.Float64).to_numpy())
+        with lock:
+            for name, sketch in batch_sketches.items():
+                sketches[name].merge(sketch)
+
+    if numeric_columns:
+        data.for_each_batch(data.lf.select(numeric_columns), update)
+
+    columns = [
+        pl.Series(name, sketches[name].quantiles(quantiles), dtype=pl.Float64)
+        if name in sketches
+        else pl.Series(name, [None] * len(quantiles), dtype=dtype)
+        for name, dtype in schema.items()
+    ]
+    return pl.DataFrame(columns), KLLSketch(k).rank_error()
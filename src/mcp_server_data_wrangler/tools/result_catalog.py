@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from ..configurations import settings
+from ..make_logger import make_logger
+from ..utils import str_utils
+from .cache import FileFingerprint
+
+logger = make_logger(__name__)
+
+# Tools whose results are per-row or refer to files outside the catalog are never stored
+UNCATALOGED_TOOLS = {
+    "batch",
+    "catalog",
+    "data_max_horizontal",
+    "data_mean_horizontal",
+    "data_min_horizontal",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    tool TEXT NOT NULL,
+    arguments TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    file_size INTEGER NOT NULL,
+    file_mtime_ns INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at);
+"""
+
+
+def catalog_path() -> Path:
+    return settings.STORAGE_PATH / "catalog.sqlite"
+
+
+class ResultCatalog:
+    """Persistent store of tool results in SQLite, keyed by tool, arguments and input file fingerprint.
+
+    A result is only returned while its input file keeps the same size and modification time, so
+    entries never go stale; they are evicted after Settings.CATALOG_TTL_SECONDS or, least recently
+    used first, when the stored results exceed Settings.CATALOG_MAX_BYTES.
+    """
+
+    def __init__(self, path: Path, max_bytes: int, ttl_seconds: float) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per operation keeps the catalog safe to use from every executor thread
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(tool: str, arguments: dict[str, Any]) -> tuple[str, str, FileFingerprint] | None:
+        """Build the catalog key of a tool call.
+
+        Args:
+            tool: Name of the tool.
+            arguments: Arguments of the call.
+
+        Returns:
+            tuple[str, str, FileFingerprint] | None: The key, the normalized arguments and the input
+                file fingerprint, or None if the call cannot be cataloged.
+        """
+        if tool in UNCATALOGED_TOOLS or "input_data_file_path" not in arguments:
+            return None
+        try:
+            fingerprint = FileFingerprint.from_path(str_utils.strip_string(str(arguments["input_data_file_path"])))
+        except (OSError, ValueError):
+            return None
+        normalized = json.dumps(
+            {**arguments, "input_data_file_path": fingerprint.path}, sort_keys=True, separators=(",", ":"), default=str
+        )
+        key = hashlib.sha256(
+            json.dumps([settings.APP_VERSION, tool, normalized, fingerprint.size, fingerprint.mtime_ns]).encode()
+        ).hexdigest()
+        return key, normalized, fingerprint
+
+    def get(self, tool: str, arguments: dict[str, Any]) -> dict[str, Any] | None:
+        made = self.make_key(tool, arguments)
+        if made is None:
+            return None
+        key = made[0]
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT result FROM results WHERE key = ? AND created_at >= ?", (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+        result: dict[str, Any] = json.loads(row[0])
+        return result
+
+    def put(self, tool: str, arguments: dict[str, Any], result: dict[str, Any]) -> bool:
+        """Store a result and evict entries over the TTL or size budget.
+
+        Returns:
+            bool: True if the result was stored.
+        """
+        made = self.make_key(tool, arguments)
+        if made is None:
+            return False
+        key, normalized, fingerprint = made
+        text = json.dumps(result)
+        if len(text) > self.max_bytes:
+            return False
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    tool,
+                    normalized,
+                    fingerprint.path,
+                    fingerprint.size,
+                    fingerprint.mtime_ns,
+                    text,
+                    len(text),
+                    now,
+                    now,
+                ),
+            )
+            self._evict(conn, now)
+        return True
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> int:
+        evicted = conn.execute("DELETE FROM results WHERE created_at < ?", (now - self.ttl_seconds,)).rowcount
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+        if total > self.max_bytes:
+            # Drop the least recently used entries until the rest fits in the budget
+            evicted += conn.execute(
+                """
+                DELETE FROM results WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS kept FROM results
+                    ) WHERE kept > ?
+                )
+                """,
+                (self.max_bytes,),
+            ).rowcount
+        if evicted:
+            logger.debug(f"Evicted {evicted} results from the catalog")
+        return evicted
+
+    def entries(self, tool: str | None = None, file_path: str | None = None, limit: int = 100) -> list[dict[str, Any]]:
+        where, params = self._filter(tool, file_path)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT tool, arguments, file_path, file_size, size, created_at, accessed_at FROM results {where} "
+                "ORDER BY accessed_at DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [
+            {
+                "tool": row[0],
+                "arguments": json.loads(row[1]),
+                "file_path": row[2],
+                "file_size": row[3],
+                "size": row[4],
+                "created_at": row[5],
+                "accessed_at": row[6],
+            }
+            for row in rows
+        ]
+
+    def purge(self, tool: str | None = None, file_path: str | None = None, expired_only: bool = False) -> int:
+        """Delete stored results, optionally only those of a tool, an input file or past their TTL.
+
+        Returns:
+            int: Number of deleted results.
+        """
+        where, params = self._filter(tool, file_path)
+        if expired_only:
+            where = f"{where} AND created_at < ?" if where else "WHERE created_at < ?"
+            params.append(time.time() - self.ttl_seconds)
+        with self._connect() as conn:
+            return conn.execute(f"DELETE FROM results {where}", params).rowcount
+
+    def stats(self) -> dict[str, Any]:
+        with self._connect() as conn:
+            entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "current_bytes": total,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+    @staticmethod
+    def _filter(tool: str | None, file_path: str | None) -> tuple[str, list[Any]]:
+        clauses, params = [], []
+        if tool is not None:
+            clauses.append("tool = ?")
+            params.append(tool)
+        if file_path is not None:
+            clauses.append("file_path = ?")
+            params.append(os.path.realpath(str_utils.strip_string(file_path)))
+        return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+_catalog: ResultCatalog | None = None
+
+
+def get_catalog() -> ResultCatalog:
+    global _catalog
+    if _catalog is None or _catalog.path != catalog_path():
+        _catalog = ResultCatalog(catalog_path(), settings.CATALOG_MAX_BYTES, settings.CATALOG_TTL_SECONDS)
+    return _catalog
+
+
+def compute_with_catalog(
+    tool: str, compute: Callable[[dict[str, Any]], dict[str, Any]], arguments: dict[str, Any]
+) -> dict[str, Any]:
+    """Answer a tool call from the catalog, or compute it and store the result.
+
+    Args:
+        tool: Name of the tool.
+        compute: Blocking function computing the tool result.
+        arguments: Arguments of the call.
+
+    Returns:
+        dict[str, Any]: The tool result.
+    """
+    if not settings.CATALOG_ENABLED:
+        return compute(arguments)
+    catalog = get_catalog()
+    result = catalog.get(tool, arguments)
+    if result is not None:
+        logger.debug(f"Answered {tool} from the result catalog")
+        return result
+    result = compute(arguments)
+    catalog.put(tool, arguments, result)
+    return result
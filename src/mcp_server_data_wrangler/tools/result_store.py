@@ -0,0 +1,125 @@
+import uuid
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+from mcp import types
+
+from ..configurations import settings
+from ..make_logger import make_logger
+from .cache import evict_files, mark_used
+from .serialization import to_json_value
+
+logger = make_logger(__name__)
+
+RESULT_URI_PREFIX = "data-wrangler://results/"
+PARQUET_MIME_TYPE = "application/vnd.apache.parquet"
+
+# Values of the `output` argument of tools with one result per row
+OUTPUT_MODES = ["auto", "inline", "resource"]
+
+
+def results_dir() -> Path:
+    path = settings.STORAGE_PATH / "results"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def should_spill(num_rows: int, output: str) -> bool:
+    """Decide whether a per-row result is written to a resource file instead of returned inline.
+
+    Args:
+        num_rows: Number of rows in the result.
+        output: One of 'auto', 'inline' or 'resource'. 'auto' spills above Settings.INLINE_RESULT_MAX_ROWS.
+
+    Returns:
+        bool: True if the result should be spilled.
+    """
+    if output not in OUTPUT_MODES:
+        raise ValueError(f"Invalid output mode: {output}")
+    if output == "auto":
+        return num_rows > settings.INLINE_RESULT_MAX_ROWS
+    return output == "resource"
+
+
+def spill_result(series: pl.Series, tool_name: str) -> dict[str, Any]:
+    """Write a per-row result to a Parquet file under STORAGE_PATH and describe it.
+
+    Stored results are deleted once unread for Settings.RESULTS_TTL_SECONDS, and oldest use first
+    when they exceed Settings.RESULTS_MAX_BYTES on disk.
+
+    Args:
+        series: Result with one value per input row.
+        tool_name: Name of the tool that produced the result, used to name the file.
+
+    Returns:
+        dict[str, Any]: Resource reference and a small summary of the result.
+    """
+    file_name = f"{tool_name}-{uuid.uuid4().hex}.parquet"
+    path = results_dir() / file_name
+    series.to_frame().write_parquet(path)
+    logger.debug(f"Spilled {series.len()} rows of {tool_name} to {path}")
+    size = path.stat().st_size
+    evict_files(
+        results_dir(),
+        "*.parquet",
+        settings.RESULTS_MAX_BYTES,
+        keep=path,
+        max_age_seconds=settings.RESULTS_TTL_SECONDS,
+    )
+
+    summary: dict[str, Any] = {
+        "rows": series.len(),
+        "null_count": series.null_count(),
+    }
+    if series.dtype.is_numeric():
+        summary.update(
+            {
+                "min": to_json_value(series.min()),
+                "max": to_json_value(series.max()),
+                "mean": to_json_value(series.mean()),
+            }
+        )
+    return {
+        "resource": {
+            "uri": f"{RESULT_URI_PREFIX}{file_name}",
+            "mime_type": PARQUET_MIME_TYPE,
+            "size": size,
+        },
+        "summary": summary,
+    }
+
+
+def list_result_resources() -> list[types.Resource]:
+    return [
+        types.Resource(
+            uri=f"{RESULT_URI_PREFIX}{path.name}",  # type: ignore
+            name=path.name,
+            description="Per-row tool result stored as Parquet",
+            mimeType=PARQUET_MIME_TYPE,
+            size=path.stat().st_size,
+        )
+        for path in sorted(results_dir().glob("*.parquet"))
+    ]
+
+
+def read_result_resource(uri: str) -> bytes:
+    """Read a spilled result file by its resource URI.
+
+    Args:
+        uri: Resource URI returned by spill_result.
+
+    Returns:
+        bytes: Content of the Parquet file.
+
+    Raises:
+        ValueError: If the URI does not refer to a stored result.
+    """
+    if not uri.startswith(RESULT_URI_PREFIX):
+        raise ValueError(f"Unknown resource: {uri}")
+    file_name = uri.removeprefix(RESULT_URI_PREFIX)
+    path = results_dir() / file_name
+    if path.parent != results_dir() or not path.is_file():
+        raise ValueError(f"Unknown resource: {uri}")
+    mark_used(path)
+    return path.read_bytes()
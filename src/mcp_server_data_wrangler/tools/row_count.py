@@ -0,0 +1,142 @@
+import mmap
+import os
+from typing import Any
+
+import numpy as np
+
+from ..utils import str_utils
+from .dataset import is_dataset
+from .decompress import Compression
+from .model import SupportedFileType
+
+ROW_COUNT_PATH = "row_count"
+# Bytes scanned per vectorized pass; blocks that fit in the CPU cache scan faster than larger ones
+_BLOCK_BYTES = 1024 * 1024
+_NEWLINE = ord("\n")
+_QUOTE = ord('"')
+
+
+def has_row_count(
+    file_path: str,
+    partitions: dict[str, Any] | None = None,
+    row_filter: dict[str, Any] | None = None,
+) -> bool:
+    """Whether the rows of the input can be counted from its newlines, without parsing it.
+
+    Only single, uncompressed CSV and TSV files read whole qualify: compressed files cannot be
+    memory-mapped and a row filter needs the parsed values.
+    """
+    fp = str_utils.strip_string(file_path)
+    if partitions or row_filter is not None or is_dataset(fp):
+        return False
+    file_type = SupportedFileType.from_file_path(fp)
+    return file_type in (SupportedFileType.csv, SupportedFileType.tsv) and Compression.from_file_path(fp) is None
+
+
+def count_csv_rows(file_path: str) -> int:
+    """Count the data rows of a CSV or TSV file by scanning its newlines, without parsing any field.
+
+    The file is memory-mapped and scanned in blocks with NumPy. Newlines inside quoted fields do
+    not end a record: a newline is inside quotes when an odd number of quote characters precede
+    it, which also holds for quotes escaped by doubling them, so each block only needs the
+    positions of its quotes and newlines. Blocks without any quote character only count newlines.
+    Like the Polars reader, every line after the header counts as a row, including blank lines and
+    a last line without a trailing newline.
+
+    Args:
+        file_path: Path to an uncompressed CSV or TSV file with a header line.
+
+    Returns:
+        int: Number of data rows.
+    """
+    fp = str_utils.strip_string(file_path)
+    size = os.path.getsize(fp)
+    if size == 0:
+        return 0
+    records = 0
+    in_quotes = False
+    with open(fp, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for start in range(0, size, _BLOCK_BYTES):
+            end = min(start + _BLOCK_BYTES, size)
+            if mm.find(b'"', start, end) == -1:
+                if not in_quotes:
+                    records += _count_newlines(mm, start, end)
+                continue
+            block_records, in_quotes = _count_quoted_block(
+                np.frombuffer(mm, dtype=np.uint8, count=end - start, offset=start), in_quotes
+            )
+            records += block_records
+        ends_with_newline = mm[size - 1] == _NEWLINE
+    if not ends_with_newline:
+        records += 1
+    # The first record is the header
+    return max(records - 1, 0)
+
+
+def record_starts(file_path: str, offsets: list[int]) -> list[int]:
+    """Start of the first record of a CSV or TSV file at or after each byte offset.
+
+    A record starts after a newline outside quoted fields, so the quote characters before each
+    offset are counted to know whether it falls inside a quoted field. Offsets are visited in
+    order and the file is scanned once up to the last of them, in blocks, without parsing it.
+
+    Args:
+        file_path: Path to an uncompressed CSV or TSV file.
+        offsets: Byte offsets in the file.
+
+    Returns:
+        list[int]: Record start of each offset, in the order of the offsets; the file size when no
+            record starts after an offset.
+    """
+    fp = str_utils.strip_string(file_path)
+    size = os.path.getsize(fp)
+    starts: dict[int, int] = {}
+    if size == 0:
+        return [0 for _ in offsets]
+    with open(fp, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Quote characters counted in mm[:position]
+        position, quotes = 0, 0
+        for offset in sorted(set(offsets)):
+            if offset <= 0 or offset >= size:
+                starts[offset] = min(max(offset, 0), size)
+                continue
+            # The record starts at the offset when the byte before it ends the previous one
+            quotes += _count_quotes(mm, position, offset - 1)
+            position = offset - 1
+            starts[offset] = _next_record_start(mm, position, bool(quotes & 1), size)
+    return [starts[offset] for offset in offsets]
+
+
+def _count_quotes(mm: mmap.mmap, start: int, end: int) -> int:
+    quotes = 0
+    for block_start in range(start, end, _BLOCK_BYTES):
+        block_end = min(block_start + _BLOCK_BYTES, end)
+        if mm.find(b'"', block_start, block_end) != -1:
+            block = np.frombuffer(mm, dtype=np.uint8, count=block_end - block_start, offset=block_start)
+            quotes += int(np.count_nonzero(block == _QUOTE))
+    return quotes
+
+
+def _next_record_start(mm: mmap.mmap, start: int, in_quotes: bool, size: int) -> int:
+    for block_start in range(start, size, _BLOCK_BYTES):
+        block = np.frombuffer(mm, dtype=np.uint8, count=min(_BLOCK_BYTES, size - block_start), offset=block_start)
+        quotes = np.flatnonzero(block == _QUOTE)
+        newlines = np.flatnonzero(block == _NEWLINE)
+        unquoted = newlines[(np.searchsorted(quotes, newlines) & 1) == (1 if in_quotes else 0)]
+        if len(unquoted):
+            return block_start + int(unquoted[0]) + 1
+        in_quotes = in_quotes != bool(len(quotes) & 1)
+    return size
+
+
+def _count_newlines(mm: mmap.mmap, start: int, end: int) -> int:
+    return int(np.count_nonzero(np.frombuffer(mm, dtype=np.uint8, count=end - start, offset=start) == _NEWLINE))
+
+
+def _count_quoted_block(block: np.ndarray, in_quotes: bool) -> tuple[int, bool]:
+    quotes = np.flatnonzero(block == _QUOTE)
+    newlines = np.flatnonzero(block == _NEWLINE)
+    # Number of quotes before each newline of the block, whose parity tells whether it is quoted
+    quotes_before = np.searchsorted(quotes, newlines)
+    records = int(np.count_nonzero((quotes_before & 1) == (1 if in_quotes else 0)))
+    return records, in_quotes != bool(len(quotes) & 1)
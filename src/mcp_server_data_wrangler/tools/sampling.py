@@ -0,0 +1,505 @@
+import functools
+import io
+import math
+import os
+from statistics import NormalDist
+from typing import Any, NamedTuple, Optional, Sequence
+
+import numpy as np
+import polars as pl
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from ..make_logger import make_logger
+from ..utils import str_utils
+from .dataset import is_dataset
+from .decompress import Compression
+from .model import Data, SupportedFileType
+from .predicate import compile_filter, filter_columns
+from .projection import resolve_columns
+from .row_count import record_starts
+
+try:
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:  # pragma: no cover - pyarrow is an optional dependency
+    pq = None
+
+logger = make_logger(__name__)
+
+CONFIDENCE_LEVEL = 0.95
+_Z = NormalDist().inv_cdf(0.5 + CONFIDENCE_LEVEL / 2)
+# Above this many degrees of freedom the t and normal quantiles differ by less than 0.1%
+_MAX_T_DEGREES_OF_FREEDOM = 1_000
+
+# Sampling methods reported in the responses
+PARQUET_ROW_GROUPS = "parquet_row_groups"
+ROW_RANGES = "row_ranges"
+CSV_BYTE_RANGES = "csv_byte_ranges"
+
+# The sample is drawn as this many clusters when the file allows it, so standard errors can be estimated
+_TARGET_CLUSTERS = 64
+_MIN_CHUNK_BYTES = 16 * 1024
+_MAX_CHUNK_BYTES = 4 * 1024 * 1024
+_HEAD_BYTES = 64 * 1024
+
+
+class SampleSpec(BaseModel):
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+    )
+
+    sample_rows: Optional[int] = Field(default=None, description="Approximate number of rows to sample", ge=1)
+    sample_fraction: Optional[float] = Field(
+        default=None, description="Approximate fraction of the rows to sample", gt=0.0, le=1.0
+    )
+    seed: int = Field(default=0, description="Seed of the random sample")
+
+    @model_validator(mode="after")
+    def _check_size(self) -> "SampleSpec":
+        if self.sample_rows is not None and self.sample_fraction is not None:
+            raise ValueError("Only one of sample_rows and sample_fraction can be given")
+        return self
+
+    @staticmethod
+    def from_args(arguments: dict[str, Any]) -> "SampleSpec | None":
+        """Sampling requested by a tool call, or None when the call is exact."""
+        if arguments.get("sample_rows") is None and arguments.get("sample_fraction") is None:
+            return None
+        return SampleSpec(
+            sample_rows=arguments.get("sample_rows"),
+            sample_fraction=arguments.get("sample_fraction"),
+            seed=arguments.get("seed", 0),
+        )
+
+    def target_rows(self, total_rows: float) -> int:
+        if self.sample_rows is not None:
+            return self.sample_rows
+        assert self.sample_fraction is not None
+        return max(math.ceil(self.sample_fraction * total_rows), 1)
+
+
+class Sample(NamedTuple):
+    df: pl.DataFrame
+    clusters: np.ndarray
+    num_clusters: int
+    fraction: float
+    estimated_total_rows: int
+    method: str
+    seed: int
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "method": self.method,
+            "rows": self.df.height,
+            "clusters": self.num_clusters,
+            "fraction": self.fraction,
+            "estimated_total_rows": self.estimated_total_rows,
+            "seed": self.seed,
+            "confidence_level": CONFIDENCE_LEVEL,
+        }
+
+    @property
+    def critical_value(self) -> float:
+        """Multiplier of the standard errors in the confidence intervals, from the number of clusters."""
+        return t_critical_value(max(self.num_clusters - 1, 1))
+
+
+def _t_central_probability(t: float, degrees_of_freedom: int) -> float:
+    # Probability that |T| < t, from the closed forms for integer degrees of freedom (A&S 26.7.3-4)
+    theta = math.atan(t / math.sqrt(degrees_of_freedom))
+    cos2 = math.cos(theta) ** 2
+    if degrees_of_freedom % 2 == 0:
+        term = total = 1.0
+        for i in range(1, degrees_of_freedom // 2):
+            term *= cos2 * (2 * i - 1) / (2 * i)
+            total += term
+        return math.sin(theta) * total
+    term = total = math.cos(theta) if degrees_of_freedom > 1 else 0.0
+    for i in range(1, (degrees_of_freedom - 1) // 2):
+        term *= cos2 * (2 * i) / (2 * i + 1)
+        total += term
+    return 2 / math.pi * (theta + math.sin(theta) * total)
+
+
+@functools.lru_cache
+def t_critical_value(degrees_of_freedom: int) -> float:
+    """Two-sided critical value of Student's t distribution at CONFIDENCE_LEVEL.
+
+    Cluster samples can rest on a few clusters, where the normal quantile gives intervals that are
+    too narrow, so the intervals use the t distribution with one degree of freedom less than the
+    number of clusters.
+    """
+    if degrees_of_freedom > _MAX_T_DEGREES_OF_FREEDOM:
+        return _Z
+    low, high = _Z, 2 * _Z
+    while _t_central_probability(high, degrees_of_freedom) < CONFIDENCE_LEVEL:
+        low, high = high, 2 * high
+    for _ in range(60):
+        middle = (low + high) / 2
+        if _t_central_probability(middle, degrees_of_freedom) < CONFIDENCE_LEVEL:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+def sample_file(
+    file_path: str,
+    spec: SampleSpec,
+    partitions: dict[str, Any] | None = None,
+    columns: list[str | dict[str, str]] | None = None,
+    row_filter: dict[str, Any] | None = None,
+    dtypes: dict[str, str] | None = None,
+) -> Sample:
+    """Read a random sample of the input file made of clusters of rows.
+
+    Parquet files are sampled by row group (or by row range without pyarrow) and CSV files by byte
+    range, so only the sampled part of the file is read and decoded. Sampled row groups are
+    sub-sampled down to the requested size, and only the selected and filtered columns are decoded. Arrow IPC, NDJSON and compressed
+    files, and directories or globs of files, are sampled by row range.
+
+    A row filter is applied to the sampled clusters, which keep their place in the sample even when
+    no row matches, so the estimators treat the matching rows as a domain of the sampled population.
+
+    Args:
+        file_path: Path to the input data file, or a directory or glob of files.
+        spec: Sample size and seed.
+        partitions: Values of the hive partitions to sample from, for directory and glob inputs.
+        columns: Column names, ^...$ regular expressions and type selectors of the columns to keep.
+        row_filter: Predicate of the filter argument selecting the rows to estimate from.
+        dtypes: Data types of CSV and TSV columns, overriding the inferred ones.
+
+    Returns:
+        Sample: The sampled rows with the cluster each row was drawn from.
+    """
+    sample = _sample_file(str_utils.strip_string(file_path), spec, partitions, columns, row_filter, dtypes)
+    if row_filter is not None:
+        sample = _filter_sample(sample, row_filter)
+    selected = resolve_columns(sample.df.schema, columns)
+    return sample if selected is None else sample._replace(df=sample.df.select(selected))
+
+
+def _sample_file(
+    fp: str,
+    spec: SampleSpec,
+    partitions: dict[str, Any] | None,
+    columns: list[str | dict[str, str]] | None,
+    row_filter: dict[str, Any] | None,
+    dtypes: dict[str, str] | None,
+) -> Sample:
+    rng = np.random.default_rng(spec.seed)
+    if is_dataset(fp) or partitions:
+        # The filter also prunes partitions here; applying it again to the sample keeps every row
+        seekable = not SupportedFileType.from_input_path(fp).is_text
+        return _sample_row_ranges(Data.scan_file(fp, partitions, row_filter, dtypes), spec, rng, seekable=seekable)
+    file_type = SupportedFileType.from_file_path(fp)
+    if dtypes and not file_type.is_text:
+        raise ValueError(f"Data types can only be overridden in CSV and TSV files: {fp}")
+    if file_type == SupportedFileType.parquet:
+        if pq is not None and pq.ParquetFile(fp).metadata.num_row_groups > 1:
+            schema = _read_schema(pl.Schema(pl.read_parquet_schema(fp)), columns, row_filter)
+            return _sample_parquet_row_groups(fp, schema, spec, rng)
+        return _sample_row_ranges(pl.scan_parquet(fp), spec, rng)
+    if file_type.is_ipc:
+        return _sample_row_ranges(pl.scan_ipc(fp, memory_map=True), spec, rng)
+    if file_type == SupportedFileType.ndjson or Compression.from_file_path(fp) is not None:
+        return _sample_row_ranges(Data.scan_text_file(fp, dtypes), spec, rng, seekable=False)
+    return _sample_csv_byte_ranges(fp, file_type.separator, spec, rng, dtypes)
+
+
+def _read_schema(
+    schema: pl.Schema, columns: list[str | dict[str, str]] | None, row_filter: dict[str, Any] | None
+) -> pl.Schema:
+    # Only the selected columns and those the filter references are decoded
+    selected = resolve_columns(schema, columns)
+    if selected is None:
+        return schema
+    needed = set(selected) | (filter_columns(row_filter) if row_filter is not None else set())
+    return pl.Schema({name: dtype for name, dtype in schema.items() if name in needed})
+
+
+def _filter_sample(sample: Sample, row_filter: dict[str, Any]) -> Sample:
+    matches = sample.df.select(compile_filter(row_filter, sample.df.schema).fill_null(False)).to_series()
+    matching_rows = int(matches.sum())
+    return sample._replace(
+        df=sample.df.filter(matches),
+        clusters=sample.clusters[matches.to_numpy()],
+        estimated_total_rows=round(sample.estimated_total_rows * matching_rows / sample.df.height)
+        if sample.df.height
+        else 0,
+    )
+
+
+def _concat_clusters(frames: list[pl.DataFrame], schema: pl.Schema) -> tuple[pl.DataFrame, np.ndarray]:
+    frames = [frame for frame in frames if frame.height]
+    if not frames:
+        return pl.DataFrame(schema=schema), np.empty(0, dtype=np.int64)
+    clusters = np.repeat(np.arange(len(frames)), [frame.height for frame in frames])
+    return pl.concat(frames), clusters
+
+
+def _sample_parquet_row_groups(fp: str, schema: pl.Schema, spec: SampleSpec, rng: np.random.Generator) -> Sample:
+    parquet_file = pq.ParquetFile(fp)
+    metadata = parquet_file.metadata
+    target = min(spec.target_rows(metadata.num_rows), metadata.num_rows)
+    sizes = [metadata.row_group(rg).num_rows for rg in range(metadata.num_row_groups)]
+
+    chosen: list[int] = []
+    rows = 0
+    for rg in rng.permutation(len(sizes)):
+        # At least two row groups are read so the standard errors can be estimated
+        if rows >= target and len(chosen) >= 2:
+            break
+        chosen.append(int(rg))
+        rows += sizes[rg]
+    chosen.sort()
+
+    # Whole row groups would overshoot the requested size, so each one is sub-sampled at the same
+    # rate, which keeps the sample self-weighting
+    rate = target / rows if rows else 1.0
+    frames = []
+    for rg in chosen:
+        frame = pl.DataFrame(parquet_file.read_row_group(rg, columns=list(schema)))
+        if rate < 1.0:
+            frame = frame[np.sort(rng.choice(frame.height, size=math.ceil(rate * frame.height), replace=False))]
+        frames.append(frame)
+    df, clusters = _concat_clusters(frames, schema)
+    return Sample(
+        df=df,
+        clusters=clusters,
+        num_clusters=len(chosen),
+        fraction=df.height / metadata.num_rows if metadata.num_rows else 1.0,
+        estimated_total_rows=metadata.num_rows,
+        method=PARQUET_ROW_GROUPS,
+        seed=spec.seed,
+    )
+
+
+def _sample_row_ranges(lf: pl.LazyFrame, spec: SampleSpec, rng: np.random.Generator, seekable: bool = True) -> Sample:
+    total = lf.select(pl.len()).collect(engine="streaming").item()
+    target = min(spec.target_rows(total), total)
+    range_rows = max(math.ceil(target / _TARGET_CLUSTERS), 1)
+    num_ranges = math.ceil(total / range_rows) if total else 0
+    chosen = np.sort(rng.choice(num_ranges, size=min(math.ceil(target / range_rows), num_ranges), replace=False))
+
+    if seekable:
+        frames = pl.collect_all([lf.slice(int(start) * range_rows, range_rows) for start in chosen])
+    else:
+        # A stream cannot seek to a row, so every range is picked out in one more pass
+        ranges = (
+            lf.with_row_index("__range")
+            .with_columns(pl.col("__range") // range_rows)
+            .filter(pl.col("__range").is_in(chosen.tolist()))
+            .collect(engine="streaming")
+        )
+        frames = ranges.partition_by("__range", maintain_order=True, include_key=False)
+    df, clusters = _concat_clusters(frames, lf.collect_schema())
+    return Sample(
+        df=df,
+        clusters=clusters,
+        num_clusters=len(chosen),
+        fraction=df.height / total if total else 1.0,
+        estimated_total_rows=total,
+        method=ROW_RANGES,
+        seed=spec.seed,
+    )
+
+
+def _sample_csv_byte_ranges(
+    fp: str, separator: str, spec: SampleSpec, rng: np.random.Generator, dtypes: dict[str, str] | None = None
+) -> Sample:
+    schema = Data.csv_schema(fp, dtypes)
+    size = os.path.getsize(fp)
+    with open(fp, "rb") as file:
+        header = file.readline()
+        data_start = len(header)
+        head = file.read(_HEAD_BYTES)
+        data_bytes = size - data_start
+
+        # A number of rows is turned into a byte budget with the row width at the head of the file
+        if spec.sample_fraction is not None:
+            target_bytes = spec.sample_fraction * data_bytes
+        else:
+            bytes_per_row = len(head) / max(head.count(b"\n"), 1) if head else 1.0
+            target_bytes = min(spec.target_rows(data_bytes / bytes_per_row) * bytes_per_row, data_bytes)
+        chunk_bytes = int(min(max(target_bytes / _TARGET_CLUSTERS, _MIN_CHUNK_BYTES), _MAX_CHUNK_BYTES))
+        num_chunks = math.ceil(data_bytes / chunk_bytes) if data_bytes > 0 else 0
+        chosen = np.sort(
+            rng.choice(num_chunks, size=min(math.ceil(target_bytes / chunk_bytes), num_chunks), replace=False)
+        )
+
+        # Records are assigned to the byte range their first byte falls in, so ranges never share one;
+        # newlines inside quoted fields do not start a record
+        starts = [data_start + int(chunk) * chunk_bytes for chunk in chosen]
+        bounds = record_starts(fp, starts + [min(start + chunk_bytes, size) for start in starts])
+        frames = []
+        for record_start, record_end in zip(bounds[: len(starts)], bounds[len(starts) :]):
+            if record_start >= record_end:
+                continue
+            file.seek(record_start)
+            data = file.read(record_end - record_start)
+            if data.strip():
+                frames.append(pl.read_csv(io.BytesIO(header + data), separator=separator, schema=schema))
+
+    df, clusters = _concat_clusters(frames, schema)
+    fraction = min(len(chosen) * chunk_bytes / data_bytes, 1.0) if data_bytes > 0 else 1.0
+    return Sample(
+        df=df,
+        clusters=clusters,
+        num_clusters=len(frames),
+        fraction=fraction,
+        estimated_total_rows=round(df.height / fraction) if fraction else 0,
+        method=CSV_BYTE_RANGES,
+        seed=spec.seed,
+    )
+
+
+def _cluster_ratio_mean(values: np.ndarray, valid: np.ndarray, sample: Sample) -> tuple[float | None, float | None]:
+    # Ratio estimator of the mean over sampled clusters and its linearized standard error
+    sums = np.bincount(sample.clusters, weights=np.where(valid, values, 0.0), minlength=sample.num_clusters)
+    counts = np.bincount(sample.clusters, weights=valid.astype(np.float64), minlength=sample.num_clusters)
+    total = counts.sum()
+    if total == 0:
+        return None, None
+    mean = float(sums.sum() / total)
+    k = sample.num_clusters
+    if k < 2:
+        return mean, None
+    residuals = sums - mean * counts
+    variance = (1 - sample.fraction) * float(np.sum(residuals**2)) / (k * (k - 1) * (total / k) ** 2)
+    return mean, math.sqrt(max(variance, 0.0))
+
+
+def _numeric(series: pl.Series) -> tuple[np.ndarray, np.ndarray] | None:
+    if not (series.dtype.is_numeric() or series.dtype == pl.Boolean):
+        return None
+    values = series.cast(pl.Float64)
+    valid = values.is_not_null() & values.is_finite()
+    return values.fill_null(0.0).to_numpy(), valid.to_numpy()
+
+
+def interval(
+    estimate: float | None, standard_error: float | None, critical_value: float, lower: float | None = None
+) -> list[float] | None:
+    if estimate is None or standard_error is None:
+        return None
+    low = estimate - critical_value * standard_error
+    return [low if lower is None else max(low, lower), estimate + critical_value * standard_error]
+
+
+def estimate_means(sample: Sample) -> dict[str, tuple[float | None, float | None]]:
+    """Mean of every column with its standard error under the cluster sample design."""
+    estimates: dict[str, tuple[float | None, float | None]] = {}
+    for name in sample.df.columns:
+        numeric = _numeric(sample.df[name])
+        estimates[name] = (None, None) if numeric is None else _cluster_ratio_mean(*numeric, sample)
+    return estimates
+
+
+def estimate_stds(sample: Sample, ddof: int = 1) -> dict[str, tuple[float | None, float | None]]:
+    """Standard deviation of every column with its standard error, by linearization of the variance."""
+    estimates: dict[str, tuple[float | None, float | None]] = {}
+    for name in sample.df.columns:
+        numeric = _numeric(sample.df[name])
+        if numeric is None:
+            estimates[name] = (None, None)
+            continue
+        values, valid = numeric
+        n = int(valid.sum())
+        mean, _ = _cluster_ratio_mean(values, valid, sample)
+        if mean is None or n - ddof <= 0:
+            estimates[name] = (None, None)
+            continue
+        squares, squares_se = _cluster_ratio_mean((values - mean) ** 2, valid, sample)
+        assert squares is not None
+        variance = squares * n / (n - ddof)
+        std = math.sqrt(variance)
+        if squares_se is None or std == 0.0:
+            estimates[name] = (std, None)
+        else:
+            estimates[name] = (std, squares_se * n / (n - ddof) / (2 * std))
+    return estimates
+
+
+def estimate_quantiles(
+    sample: Sample, quantiles: Sequence[float], interpolation: str = "nearest"
+) -> dict[str, list[tuple[float | None, list[float] | None]]]:
+    """Quantiles of every numeric column with Woodruff confidence intervals under the cluster design.
+
+    Returns:
+        dict[str, list[tuple[float | None, list[float] | None]]]: For each column, the estimate and
+            the confidence interval of each quantile.
+    """
+    estimates: dict[str, list[tuple[float | None, list[float] | None]]] = {}
+    for name in sample.df.columns:
+        series = sample.df[name]
+        numeric = _numeric(series)
+        if numeric is None or not series.dtype.is_numeric():
+            estimates[name] = [(None, None) for _ in quantiles]
+            continue
+        values, valid = numeric
+        present = series.filter(pl.Series(valid)).cast(pl.Float64)
+        column: list[tuple[float | None, list[float] | None]] = []
+        for quantile in quantiles:
+            estimate = present.quantile(quantile, interpolation=interpolation)  # type: ignore
+            if estimate is None:
+                column.append((None, None))
+                continue
+            # Interval on the share of values below the estimate, mapped back through the sample quantiles
+            _, share_se = _cluster_ratio_mean((values <= estimate).astype(np.float64), valid, sample)
+            if share_se is None:
+                column.append((estimate, None))
+                continue
+            low = present.quantile(max(quantile - sample.critical_value * share_se, 0.0), interpolation="linear")
+            high = present.quantile(min(quantile + sample.critical_value * share_se, 1.0), interpolation="linear")
+            column.append((estimate, [low, high]))  # type: ignore
+        estimates[name] = column
+    return estimates
+
+
+def sample_properties() -> dict[str, Any]:
+    """JSON schema properties of the sampling arguments shared by the tools that accept them."""
+    return {
+        "sample_rows": {
+            "type": "integer",
+            "description": "Estimate from a random sample of about this many rows instead of the whole file. "
+            "Parquet files are sampled by row group and CSV files by byte range, and the response includes "
+            "standard errors and confidence intervals",
+            "minimum": 1,
+        },
+        "sample_fraction": {
+            "type": "number",
+            "description": "Estimate from a random sample of about this fraction of the rows. "
+            "Cannot be combined with sample_rows",
+            "exclusiveMinimum": 0.0,
+            "maximum": 1.0,
+        },
+        "seed": {
+            "type": "integer",
+            "description": "Seed of the random sample",
+            "default": 0,
+        },
+    }
+
+
+def estimates_to_dict(
+    estimates: dict[str, tuple[float | None, float | None]], critical_value: float, lower: float | None = None
+) -> dict[str, dict[str, Any]]:
+    """Split estimates with standard errors into the values, standard errors and confidence intervals of a response.
+
+    Args:
+        estimates: Estimate and standard error for each column.
+        critical_value: Multiplier of the standard errors, the critical_value of the sample.
+        lower: Lower bound of the estimated statistic, used to clip the intervals.
+
+    Returns:
+        dict[str, dict[str, Any]]: The values, standard errors and confidence intervals by column.
+    """
+    return {
+        "values": {col: estimate for col, (estimate, _) in estimates.items()},
+        "standard_errors": {col: standard_error for col, (_, standard_error) in estimates.items()},
+        "confidence_intervals": {
+            col: interval(estimate, standard_error, critical_value, lower)
+            for col, (estimate, standard_error) in estimates.items()
+        },
+    }
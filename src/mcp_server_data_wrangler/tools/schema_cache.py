@@ -0,0 +1,147 @@
+import ast
+import hashlib
+import json
+import os
+import re
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Callable
+
+import polars as pl
+
+from ..configurations import settings
+from ..make_logger import make_logger
+from .cache import FileFingerprint, evict_files, mark_used
+
+logger = make_logger(__name__)
+
+_DTYPE_PATTERN = re.compile(r"\s*(\w+)\s*(?:\((.*)\))?\s*", re.DOTALL)
+
+
+def schemas_dir() -> Path:
+    path = settings.STORAGE_PATH / "schemas"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def dtypes_properties() -> dict[str, Any]:
+    """JSON schema properties of the dtype overrides argument shared by the tools that read input files."""
+    return {
+        "dtypes": {
+            "type": "object",
+            "description": "Data types of CSV and TSV columns, overriding the inferred ones, e.g. "
+            "{'zip': 'String', 'amount': 'Float64', 'at': \"Datetime(time_unit='ms')\"}. Types are written "
+            "the way Polars prints them. Schemas are otherwise inferred once per file version and cached",
+            "additionalProperties": {"type": "string"},
+        },
+    }
+
+
+def parse_dtype(name: str) -> pl.DataType:
+    """Parse a data type written the way Polars prints it, e.g. Float64 or Datetime(time_unit='ms').
+
+    Raises:
+        ValueError: If the name is not a Polars data type with literal parameters.
+    """
+    match = _DTYPE_PATTERN.fullmatch(name)
+    dtype_class = getattr(pl, match.group(1), None) if match else None
+    if not (isinstance(dtype_class, type) and issubclass(dtype_class, pl.DataType)):
+        raise ValueError(f"Invalid data type: {name}")
+    if not match or not match.group(2):
+        return dtype_class()
+    try:
+        call = ast.parse(f"dtype({match.group(2)})", mode="eval").body
+        assert isinstance(call, ast.Call)
+        args = [ast.literal_eval(arg) for arg in call.args]
+        kwargs = {keyword.arg: ast.literal_eval(keyword.value) for keyword in call.keywords if keyword.arg}
+        return dtype_class(*args, **kwargs)
+    except (SyntaxError, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid data type: {name}") from e
+
+
+def parse_dtypes(dtypes: dict[str, str]) -> dict[str, pl.DataType]:
+    """Parse the dtype overrides of a tool call, keyed by column."""
+    return {col: parse_dtype(name) for col, name in dtypes.items()}
+
+
+class SchemaCache:
+    """Inferred schemas of CSV files, persisted in a JSON sidecar per file under STORAGE_PATH.
+
+    Schema inference parses the leading rows of a file, so it is done once per version of the file:
+    the sidecar records the size and modification time it was inferred from and any change to the
+    file infers the schema again. Schemas read in this process are also kept in memory. Sidecars are
+    evicted oldest use first when they exceed Settings.SCHEMA_CACHE_MAX_BYTES on disk.
+    """
+
+    def __init__(self) -> None:
+        self._schemas: dict[str, tuple[FileFingerprint, pl.Schema]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def sidecar_path(fingerprint: FileFingerprint) -> Path:
+        return schemas_dir() / f"{hashlib.blake2b(fingerprint.path.encode(), digest_size=16).hexdigest()}.json"
+
+    def get(self, fingerprint: FileFingerprint, infer: Callable[[], pl.Schema]) -> pl.Schema:
+        """Schema of a file, inferring and persisting it when the file has no up-to-date sidecar.
+
+        Args:
+            fingerprint: Fingerprint of the file.
+            infer: Infers the schema from the file.
+
+        Returns:
+            pl.Schema: The inferred schema.
+        """
+        with self._lock:
+            cached = self._schemas.get(fingerprint.path)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        path = self.sidecar_path(fingerprint)
+        schema = self._read(path, fingerprint)
+        if schema is None:
+            schema = infer()
+            if self._write(path, fingerprint, schema):
+                evict_files(schemas_dir(), "*.json", settings.SCHEMA_CACHE_MAX_BYTES, keep=path)
+        with self._lock:
+            self._schemas[fingerprint.path] = (fingerprint, schema)
+        return schema
+
+    @staticmethod
+    def _read(path: Path, fingerprint: FileFingerprint) -> pl.Schema | None:
+        try:
+            sidecar = json.loads(path.read_text())
+            if [sidecar["path"], sidecar["size"], sidecar["mtime_ns"]] != list(fingerprint):
+                return None
+            mark_used(path)
+            return pl.Schema({col: parse_dtype(name) for col, name in sidecar["schema"].items()})
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable schema sidecar {path}: {e}")
+            return None
+
+    @staticmethod
+    def _write(path: Path, fingerprint: FileFingerprint, schema: pl.Schema) -> bool:
+        sidecar: dict[str, Any] = {
+            "path": fingerprint.path,
+            "size": fingerprint.size,
+            "mtime_ns": fingerprint.mtime_ns,
+            "schema": {col: str(dtype) for col, dtype in schema.items()},
+        }
+        tmp_path = path.with_name(f".{path.stem}-{uuid.uuid4().hex}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(sidecar))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write schema sidecar {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return False
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._schemas.clear()
+
+
+schema_cache = SchemaCache()
@@ -0,0 +1,88 @@
+import datetime
+import json
+import math
+from decimal import Decimal
+from types import ModuleType
+from typing import Any, Optional
+
+import polars as pl
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional dependency
+    orjson = None
+
+# ISO 8601 formats used for temporal values in tool results
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S%.f"
+DATETIME_TZ_FORMAT = "%Y-%m-%dT%H:%M:%S%.f%:z"
+
+
+def _json_expr(name: str, dtype: pl.DataType) -> pl.Expr:
+    col = pl.col(name)
+    if isinstance(dtype, pl.Datetime):
+        return col.dt.to_string(DATETIME_TZ_FORMAT if dtype.time_zone else DATETIME_FORMAT)
+    if dtype == pl.Date or dtype == pl.Time or isinstance(dtype, pl.Duration):
+        return col.dt.to_string("iso")
+    if isinstance(dtype, pl.Decimal):
+        return col.cast(pl.Float64)
+    if dtype.is_float():
+        # NaN and infinity have no JSON representation
+        return pl.when(col.is_finite()).then(col).otherwise(None).alias(name)
+    if isinstance(dtype, (pl.Categorical, pl.Enum, pl.Object)):
+        return col.cast(pl.String)
+    if dtype == pl.Binary:
+        return col.bin.encode("hex")
+    return col
+
+
+def to_json_frame(df: pl.DataFrame) -> pl.DataFrame:
+    """Convert every column to a type that maps directly onto a JSON value.
+
+    Numbers and booleans keep their type, temporal values become ISO 8601 strings and values
+    without a JSON representation (NaN, infinity) become null. The conversion runs inside Polars,
+    so no Python object is created per value until the caller extracts the result.
+
+    Args:
+        df: DataFrame to convert.
+
+    Returns:
+        pl.DataFrame: DataFrame whose values are JSON-compatible.
+    """
+    return df.select([_json_expr(name, dtype) for name, dtype in df.schema.items()])
+
+
+def row_to_dict(df: pl.DataFrame, row: int = 0) -> dict[str, Any]:
+    return to_json_frame(df).row(row, named=True)
+
+
+def columns_to_dict(df: pl.DataFrame) -> dict[str, list[Any]]:
+    return to_json_frame(df).to_dict(as_series=False)
+
+
+def series_to_list(series: pl.Series) -> list[Any]:
+    return to_json_frame(series.to_frame()).to_series().to_list()
+
+
+def to_json_value(value: Any) -> Any:
+    """Convert a single Python value, such as a Parquet statistic, the same way as to_json_frame."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime.timedelta, bytes)):
+        # Durations and binary values have no plain Python encoding that matches _json_expr
+        return series_to_list(pl.Series([value]))[0]
+    return value
+
+
+def dumps(obj: Any) -> str:
+    """Encode a tool result as JSON, with orjson when it is installed."""
+    if orjson is not None:
+        encoded: bytes = orjson.dumps(obj)
+        return encoded.decode()
+    return json.dumps(obj)
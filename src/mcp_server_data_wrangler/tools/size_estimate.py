@@ -0,0 +1,188 @@
+import io
+import math
+import os
+from typing import Any, NamedTuple
+
+import polars as pl
+
+from ..utils import str_utils
+from .dataset import PATH_COLUMN, is_dataset, select_files
+from .decompress import Compression, read_head, record_end
+from .model import Data, SupportedFileType
+from .predicate import compile_filter
+from .projection import resolve_columns
+
+PREFIX_PATH = "prefix"
+SIZE_UNITS = ["b", "kb", "mb", "gb", "tb"]
+# Rows decoded from the start of a Parquet or Arrow IPC file to measure the size of a row
+_PREFIX_ROWS = 10_000
+# Bytes parsed from the start of a text file to measure the size of its rows
+_PREFIX_BYTES = 4 * 1024 * 1024
+# Files of a directory or glob measured at most; the others are extrapolated from their size on disk
+_MAX_MEASURED_FILES = 64
+
+
+class SizeEstimate(NamedTuple):
+    """In-memory size of the input data, per column, as Polars would hold it once loaded."""
+
+    column_sizes: dict[str, float]
+    exact: bool
+
+    @property
+    def total(self) -> float:
+        return sum(self.column_sizes.values())
+
+
+def scale_size(size: float, unit: str) -> float:
+    """Convert a size in bytes to a unit of SIZE_UNITS, with the 1024 multiples of DataFrame.estimated_size."""
+    if unit not in SIZE_UNITS:
+        raise ValueError(f"Invalid unit: {unit}. Must be one of {SIZE_UNITS}")
+    if unit == "b":
+        return round(size)
+    return size / 1024.0 ** SIZE_UNITS.index(unit)
+
+
+def estimate_file_size(
+    file_path: str,
+    partitions: dict[str, Any] | None = None,
+    columns: list[str | dict[str, str]] | None = None,
+    row_filter: dict[str, Any] | None = None,
+    dtypes: dict[str, str] | None = None,
+) -> SizeEstimate | None:
+    """Estimate the in-memory size of the input data from a decoded prefix, without loading it.
+
+    Parquet and Arrow IPC files give their row count from metadata, and the size of a row is
+    measured on their first rows. CSV, TSV and NDJSON files are measured on the records of their
+    first bytes and extrapolated by file size, and compressed files by their decompressed size,
+    estimated from the compression ratio of those bytes. The files of a directory or glob are
+    measured one by one and summed. A row filter is applied to the prefix, whose matching rows
+    give its selectivity. The estimate is exact when the prefix covers the whole input.
+
+    Args:
+        file_path: Path to the input data file, or a directory or glob of files.
+        partitions: Values of the hive partitions to read, for directory and glob inputs.
+        columns: Column names, ^...$ regular expressions and type selectors of the columns to measure.
+        row_filter: Predicate of the filter argument selecting the rows to measure.
+        dtypes: Data types of CSV and TSV columns, overriding the inferred ones.
+
+    Returns:
+        SizeEstimate | None: The estimate, or None when the input has to be read to be measured: a
+            record does not fit in the prefix, or dtypes are given for a file that is not CSV or TSV.
+
+    Raises:
+        ValueError: If partitions are given for a single file.
+    """
+    fp = str_utils.strip_string(file_path)
+    if is_dataset(fp):
+        return _estimate_dataset_size(fp, partitions, columns, row_filter, dtypes)
+    if partitions:
+        raise ValueError(f"Partitions can only be selected in a directory or glob input: {fp}")
+    prefix = _file_prefix(fp, dtypes)
+    if prefix is None:
+        return None
+    prefix_lf, scale = prefix
+    return _extrapolate(prefix_lf, scale, resolve_columns(prefix_lf.collect_schema(), columns), row_filter)
+
+
+def _estimate_dataset_size(
+    fp: str,
+    partitions: dict[str, Any] | None,
+    columns: list[str | dict[str, str]] | None,
+    row_filter: dict[str, Any] | None,
+    dtypes: dict[str, str] | None,
+) -> SizeEstimate | None:
+    partition_df, selected_df = select_files(fp, partitions, row_filter)
+    schema = Data.scan_schema(fp, partitions, dtypes)
+    selected = resolve_columns(schema, columns) or list(schema)
+    measured_df = selected_df.gather_every(math.ceil(selected_df.height / _MAX_MEASURED_FILES) or 1)
+
+    column_sizes = dict.fromkeys(selected, 0.0)
+    exact = measured_df.height == selected_df.height
+    for row in measured_df.iter_rows(named=True):
+        prefix = _file_prefix(row[PATH_COLUMN], dtypes)
+        if prefix is None:
+            return None
+        prefix_lf, scale = prefix
+        file_schema = prefix_lf.collect_schema()
+        prefix_lf = prefix_lf.select(_dataset_column(name, dtype, file_schema, row) for name, dtype in schema.items())
+        estimate = _extrapolate(prefix_lf, scale, selected, row_filter)
+        for col, size in estimate.column_sizes.items():
+            column_sizes[col] += size
+        exact = exact and estimate.exact
+
+    if measured_df.height < selected_df.height:
+        # The files left out are assumed to hold as much data per byte on disk as the measured ones
+        disk_scale = _disk_size(selected_df) / max(_disk_size(measured_df), 1.0)
+        column_sizes = {col: size * disk_scale for col, size in column_sizes.items()}
+    return SizeEstimate(column_sizes=column_sizes, exact=exact)
+
+
+def _dataset_column(name: str, dtype: pl.DataType, file_schema: pl.Schema, partition_row: dict[str, Any]) -> pl.Expr:
+    # A column of a file as the dataset scan reads it: partition values, then columns missing from the file as nulls
+    if name in partition_row:
+        return pl.lit(partition_row[name], dtype=dtype).alias(name)
+    if name in file_schema:
+        return pl.col(name).cast(dtype)
+    return pl.lit(None, dtype=dtype).alias(name)
+
+
+def _disk_size(partition_df: pl.DataFrame) -> float:
+    return float(sum(os.path.getsize(path) for path in partition_df[PATH_COLUMN]))
+
+
+def _file_prefix(fp: str, dtypes: dict[str, str] | None) -> tuple[pl.LazyFrame, float] | None:
+    # First rows of a file, and the ratio of the file's rows to theirs
+    file_type = SupportedFileType.from_file_path(fp)
+    if dtypes and file_type not in (SupportedFileType.csv, SupportedFileType.tsv):
+        return None
+    if file_type == SupportedFileType.parquet or file_type.is_ipc:
+        lf = pl.scan_parquet(fp) if file_type == SupportedFileType.parquet else pl.scan_ipc(fp, memory_map=True)
+        num_rows = lf.select(pl.len()).collect().item()
+        prefix_rows = min(num_rows, _PREFIX_ROWS)
+        return lf.head(_PREFIX_ROWS), num_rows / prefix_rows if prefix_rows else 1.0
+
+    prefix = _text_prefix(fp, file_type, dtypes)
+    if prefix is None:
+        return None
+    prefix_df, scale = prefix
+    return prefix_df.lazy(), scale
+
+
+def _text_prefix(
+    fp: str, file_type: SupportedFileType, dtypes: dict[str, str] | None
+) -> tuple[pl.DataFrame, float] | None:
+    # Whole records at the start of the file, and the ratio of the file's data bytes to theirs
+    quote = None if file_type == SupportedFileType.ndjson else b'"'
+    compression = Compression.from_file_path(fp)
+    if compression is None:
+        size: float = os.path.getsize(fp)
+        with open(fp, "rb") as file:
+            data = file.read(_PREFIX_BYTES)
+        if len(data) < size:
+            data = data[: record_end(data, quote)]
+    else:
+        data, size = read_head(fp, compression, quote, _PREFIX_BYTES)
+
+    if file_type == SupportedFileType.ndjson:
+        header_bytes = 0
+        prefix_df = pl.read_ndjson(io.BytesIO(data))
+    else:
+        header_bytes = data.find(b"\n") + 1 if b"\n" in data else len(data)
+        schema = Data.csv_schema(fp, dtypes)
+        prefix_df = pl.read_csv(io.BytesIO(data), separator=file_type.separator, schema=schema)
+    if len(data) == size:
+        return prefix_df, 1.0
+    if len(data) <= header_bytes:
+        # Not even one record fits in the prefix
+        return None
+    return prefix_df, (size - header_bytes) / (len(data) - header_bytes)
+
+
+def _extrapolate(
+    prefix_lf: pl.LazyFrame, scale: float, selected: list[str] | None, row_filter: dict[str, Any] | None
+) -> SizeEstimate:
+    if row_filter is not None:
+        prefix_lf = prefix_lf.filter(compile_filter(row_filter, prefix_lf.collect_schema()))
+    prefix_df = (prefix_lf if selected is None else prefix_lf.select(selected)).collect()
+    column_sizes = {col: prefix_df[col].estimated_size() * scale for col in prefix_df.columns}
+    return SizeEstimate(column_sizes=column_sizes, exact=scale == 1.0)
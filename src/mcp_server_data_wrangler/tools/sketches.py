@@ -0,0 +1,181 @@
+import math
+from typing import Sequence
+
+import numpy as np
+
+# Empirical single-quantile normalized rank error of KLL at 99% confidence: 2.446 / k^0.9433
+_KLL_ERROR_SCALE = 2.446
+_KLL_ERROR_EXPONENT = 0.9433
+_KLL_MIN_K = 8
+_KLL_MAX_K = 65535
+# Each level below the top holds 2/3 of the items of the level above it
+_KLL_CAPACITY_DECAY = 2 / 3
+
+
+class KLLSketch:
+    """Mergeable quantile sketch (Karnin, Lang and Liberty, 2016) over float values.
+
+    The sketch keeps a stack of compactors. Level h holds items of weight 2^h. When a level is
+    over capacity it is sorted and every other item, starting at a random offset, is promoted to
+    the next level. Memory grows with log(n) while the rank error stays within rank_error().
+    """
+
+    def __init__(self, k: int = 200, seed: int | None = None) -> None:
+        self.k = min(max(k, _KLL_MIN_K), _KLL_MAX_K)
+        self.levels: list[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self.count = 0
+        self.min_value = math.inf
+        self.max_value = -math.inf
+        self._rng = np.random.default_rng(seed)
+
+    @staticmethod
+    def k_for_rank_error(rank_error: float) -> int:
+        """Smallest k whose rank error is at most rank_error.
+
+        Args:
+            rank_error: Normalized rank error, e.g. 0.01 for 1%.
+
+        Returns:
+            int: The sketch parameter k.
+        """
+        if not 0.0 < rank_error < 1.0:
+            raise ValueError(f"Rank error must be between 0.0 and 1.0: {rank_error}")
+        k = math.ceil((_KLL_ERROR_SCALE / rank_error) ** (1 / _KLL_ERROR_EXPONENT))
+        return int(min(max(k, _KLL_MIN_K), _KLL_MAX_K))
+
+    def rank_error(self) -> float:
+        return float(_KLL_ERROR_SCALE / self.k**_KLL_ERROR_EXPONENT)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(math.ceil(self.k * _KLL_CAPACITY_DECAY**depth), 2)
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of values. NaN values are ignored."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self.count += values.size
+        self.min_value = min(self.min_value, float(values.min()))
+        self.max_value = max(self.max_value, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        """Add every value summarized by another sketch."""
+        if other.count == 0:
+            return
+        self.count += other.count
+        self.min_value = min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.size <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0, dtype=np.float64))
+            items = np.sort(items)
+            # An odd item out stays on this level so the total weight is preserved
+            kept = items[:1] if items.size % 2 else items[:0]
+            items = items[kept.size :]
+            promoted = items[self._rng.integers(2) :: 2]
+            self.levels[level] = kept
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            # Adding a level lowers the capacity of every level below it
+            level = 0
+
+    def quantiles(self, quantiles: Sequence[float]) -> list[float | None]:
+        """Estimate quantiles of the values added so far.
+
+        Args:
+            quantiles: Quantiles between 0.0 and 1.0.
+
+        Returns:
+            list[float | None]: A retained value for each quantile, or None when the sketch is empty.
+        """
+        if self.count == 0:
+            return [None for _ in quantiles]
+        items = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(level_items.size, 2**level, dtype=np.float64) for level, level_items in enumerate(self.levels)]
+        )
+        order = np.argsort(items, kind="stable")
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        results: list[float | None] = []
+        for quantile in quantiles:
+            if quantile <= 0.0:
+                results.append(self.min_value)
+            elif quantile >= 1.0:
+                results.append(self.max_value)
+            else:
+                index = int(np.searchsorted(cumulative, quantile * cumulative[-1], side="left"))
+                results.append(float(items[min(index, items.size - 1)]))
+        return results
+
+
+HLL_MIN_PRECISION = 4
+HLL_MAX_PRECISION = 18
+# Largest integer a float64 represents exactly is 2^53
+_FLOAT_MANTISSA_BITS = 53
+
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch (Flajolet et al., 2007) over 64-bit hashes.
+
+    The top `precision` bits of a hash pick one of 2^precision registers and each register keeps
+    the longest run of leading zeros seen in the remaining bits. Memory is one byte per register
+    and the relative standard error is 1.04 / sqrt(2^precision).
+    """
+
+    def __init__(self, precision: int = 14) -> None:
+        if not HLL_MIN_PRECISION <= precision <= HLL_MAX_PRECISION:
+            raise ValueError(f"Precision must be between {HLL_MIN_PRECISION} and {HLL_MAX_PRECISION}: {precision}")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.registers.size)
+
+    def update(self, hashes: np.ndarray) -> None:
+        """Add a batch of 64-bit hashes."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if hashes.size == 0:
+            return
+        value_bits = 64 - self.precision
+        index = (hashes >> np.uint64(value_bits)).astype(np.intp)
+        remainder = hashes & np.uint64((1 << value_bits) - 1)
+
+        # Bit length of the remainder from the float exponent, on its top 53 bits so the conversion is exact
+        shift = max(value_bits - _FLOAT_MANTISSA_BITS, 0)
+        _, exponent = np.frexp((remainder >> np.uint64(shift)).astype(np.float64))
+        bit_length = np.where(exponent > 0, exponent + shift, 0)
+        rank = (value_bits - bit_length + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Add every value summarized by another sketch of the same precision."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        m = self.registers.size
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        raw = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # Linear counting is more accurate while many registers are still empty
+        if raw <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))
+        return round(raw)
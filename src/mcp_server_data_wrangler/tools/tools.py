@@ -1,22 +1,47 @@
 from enum import Enum
-from typing import Callable
+from typing import Any, Callable
 
 from mcp import types
 
 from . import (
+    BatchInputSchema,
+    CatalogInputSchema,
     DataCountInputSchema,
     DataEstimatedSizeInputSchema,
     DataMaxInputSchema,
     DataMeanInputSchema,
     DataMedianInputSchema,
     DataMinInputSchema,
+    DataNUniqueInputSchema,
     DataProductInputSchema,
+    DataProfileInputSchema,
     DataQuantileInputSchema,
     DataSchemaInputSchema,
     DataShapeInputSchema,
     DataStdInputSchema,
     DataVarInputSchema,
     DescribeDataInputSchema,
+    compute_catalog,
+    compute_data_count,
+    compute_data_estimated_size,
+    compute_data_max,
+    compute_data_max_horizontal,
+    compute_data_mean,
+    compute_data_mean_horizontal,
+    compute_data_median,
+    compute_data_min,
+    compute_data_min_horizontal,
+    compute_data_n_unique,
+    compute_data_product,
+    compute_data_profile,
+    compute_data_quantile,
+    compute_data_schema,
+    compute_data_shape,
+    compute_data_std,
+    compute_data_var,
+    compute_describe_data,
+    handle_batch,
+    handle_catalog,
     handle_data_count,
     handle_data_estimated_size,
     handle_data_max,
@@ -26,7 +51,9 @@ from . import (
     handle_data_median,
     handle_data_min,
     handle_data_min_horizontal,
+    handle_data_n_unique,
     handle_data_product,
+    handle_data_profile,
     handle_data_quantile,
     handle_data_schema,
     handle_data_shape,
@@ -53,6 +80,10 @@ class MCPServerDataWrangler(Enum):
     data_quantile = ("data_quantile", "Quantile values for each column")
     data_std = ("data_std", "Standard deviation values for each column")
     data_var = ("data_var", "Variance values for each column")
+    data_n_unique = ("data_n_unique", "Number of unique values for each column, exact or approximate")
+    data_profile = ("data_profile", "Several summary statistics for each column computed in a single read")
+    batch = ("batch", "Run several tool calls at once, loading each input file only once")
+    catalog = ("catalog", "Inspect or purge the persistent catalog of stored tool results")
 
     @staticmethod
     def from_str(name: str) -> "MCPServerDataWrangler":
@@ -144,8 +175,53 @@ class MCPServerDataWrangler(Enum):
                 description=MCPServerDataWrangler.data_var.value[1],
                 inputSchema=DataVarInputSchema.input_schema(),
             ),
+            types.Tool(
+                name=MCPServerDataWrangler.data_n_unique.value[0],
+                description=MCPServerDataWrangler.data_n_unique.value[1],
+                inputSchema=DataNUniqueInputSchema.input_schema(),
+            ),
+            types.Tool(
+                name=MCPServerDataWrangler.data_profile.value[0],
+                description=MCPServerDataWrangler.data_profile.value[1],
+                inputSchema=DataProfileInputSchema.input_schema(),
+            ),
+            types.Tool(
+                name=MCPServerDataWrangler.batch.value[0],
+                description=MCPServerDataWrangler.batch.value[1],
+                inputSchema=BatchInputSchema.input_schema(),
+            ),
+            types.Tool(
+                name=MCPServerDataWrangler.catalog.value[0],
+                description=MCPServerDataWrangler.catalog.value[1],
+                inputSchema=CatalogInputSchema.input_schema(),
+            ),
         ]
 
+    @staticmethod
+    def tool_to_compute() -> dict[str, Callable[[dict[str, Any]], dict[str, Any]]]:
+        """Map each tool to the blocking function that computes its result as a dictionary."""
+        return {
+            MCPServerDataWrangler.data_shape.value[0]: compute_data_shape,
+            MCPServerDataWrangler.data_schema.value[0]: compute_data_schema,
+            MCPServerDataWrangler.describe_data.value[0]: compute_describe_data,
+            MCPServerDataWrangler.data_estimated_size.value[0]: compute_data_estimated_size,
+            MCPServerDataWrangler.data_count.value[0]: compute_data_count,
+            MCPServerDataWrangler.data_max.value[0]: compute_data_max,
+            MCPServerDataWrangler.data_max_horizontal.value[0]: compute_data_max_horizontal,
+            MCPServerDataWrangler.data_min.value[0]: compute_data_min,
+            MCPServerDataWrangler.data_min_horizontal.value[0]: compute_data_min_horizontal,
+            MCPServerDataWrangler.data_mean.value[0]: compute_data_mean,
+            MCPServerDataWrangler.data_mean_horizontal.value[0]: compute_data_mean_horizontal,
+            MCPServerDataWrangler.data_median.value[0]: compute_data_median,
+            MCPServerDataWrangler.data_product.value[0]: compute_data_product,
+            MCPServerDataWrangler.data_quantile.value[0]: compute_data_quantile,
+            MCPServerDataWrangler.data_std.value[0]: compute_data_std,
+            MCPServerDataWrangler.data_var.value[0]: compute_data_var,
+            MCPServerDataWrangler.data_n_unique.value[0]: compute_data_n_unique,
+            MCPServerDataWrangler.data_profile.value[0]: compute_data_profile,
+            MCPServerDataWrangler.catalog.value[0]: compute_catalog,
+        }
+
     @staticmethod
     def tool_to_handler() -> dict[str, Callable]:
         return {
@@ -165,4 +241,8 @@ class MCPServerDataWrangler(Enum):
             MCPServerDataWrangler.data_quantile.value[0]: handle_data_quantile,
             MCPServerDataWrangler.data_std.value[0]: handle_data_std,
             MCPServerDataWrangler.data_var.value[0]: handle_data_var,
+            MCPServerDataWrangler.data_n_unique.value[0]: handle_data_n_unique,
+            MCPServerDataWrangler.data_profile.value[0]: handle_data_profile,
+            MCPServerDataWrangler.batch.value[0]: handle_batch,
+            MCPServerDataWrangler.catalog.value[0]: handle_catalog,
         }
@@ -1,8 +1,40 @@
-from typing import Generator
+from pathlib import Path
+from typing import Callable, Generator
 
+import polars as pl
 import pytest
 
+from mcp_server_data_wrangler.configurations import Settings
+from mcp_server_data_wrangler.tools.schema_cache import schema_cache
+
 
 @pytest.fixture(scope="function", autouse=False)
 def scope_function() -> Generator:
     yield
+
+
+@pytest.fixture(scope="function", autouse=False)
+def make_df() -> Callable[..., pl.DataFrame]:
+    # Rows numbered from start, with an integer, a float with nulls and a string column
+    def make(size: int, start: int = 0) -> pl.DataFrame:
+        rows = range(start, start + size)
+        return pl.DataFrame(
+            {
+                "a": list(rows),
+                "b": [i / 10 if i % 3 else None for i in rows],
+                "c": [f"x{i}" for i in rows],
+            }
+        )
+
+    return make
+
+
+@pytest.fixture(scope="function", autouse=True)
+def storage_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Generator[Path, None, None]:
+    # Schemas, cataloged results, spilled results and columnar copies are written under a temporary directory
+    path = tmp_path / "storage"
+    path.mkdir()
+    monkeypatch.setattr(Settings, "STORAGE_PATH", property(lambda self: path))
+    schema_cache.clear()
+    yield path
+    schema_cache.clear()
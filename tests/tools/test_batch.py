@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools import handle_batch
+from mcp_server_data_wrangler.tools.model import Data
+from mcp_server_data_wrangler.tools.serialization import row_to_dict
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+async def test_handle_batch(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    df = pl.DataFrame({"a": list(range(10)), "b": [i / 10 for i in range(10)]})
+
+    tmp_file_paths = []
+    for extension in [".csv", ".tsv"]:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+            df.write_csv(tmp_file.name, separator="," if extension == ".csv" else "\t")
+            tmp_file_paths.append(tmp_file.name)
+
+    storage_dir = tempfile.mkdtemp()
+    mocker.patch(
+        "mcp_server_data_wrangler.tools.result_catalog.catalog_path",
+        return_value=Path(storage_dir) / "catalog.sqlite",
+    )
+    load_file = mocker.spy(Data, "_load_file")
+    entries = [
+        {"tool": tool, "arguments": {"input_data_file_path": tmp_file_path}}
+        for tmp_file_path in tmp_file_paths
+        for tool in ["data_shape", "data_schema", "data_mean"]
+    ]
+    entries.append({"tool": "unknown_tool", "arguments": {"input_data_file_path": tmp_file_paths[0]}})
+    got = await handle_batch(arguments={"entries": entries})
+    text = json.loads(got[0].text)
+
+    results = text["results"]
+    assert [result["tool"] for result in results] == [entry["tool"] for entry in entries]
+    for i in range(2):
+        shape, schema, mean = results[i * 3 : i * 3 + 3]
+        assert (shape["result"]["rows"], shape["result"]["cols"]) == df.shape
+        assert schema["result"]["schema"] == {"a": "Int64", "b": "Float64"}
+        assert mean["result"]["mean_values"] == row_to_dict(df.mean())
+    assert "error" in results[-1]
+
+    # Each file is loaded once for the whole batch
+    assert load_file.call_count == 2
+
+    for tmp_file_path in tmp_file_paths:
+        os.unlink(tmp_file_path)
@@ -0,0 +1,67 @@
+import os
+import tempfile
+from typing import Any
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools.cache import DataFrameCache, FileFingerprint, dataframe_cache
+from mcp_server_data_wrangler.tools.model import Data
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_dataframe_cache_lru_eviction(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    df = pl.DataFrame({"a": list(range(100))})
+    size = int(df.estimated_size())
+    cache = DataFrameCache(max_bytes=size * 2)
+
+    keys = [FileFingerprint(path=f"/tmp/{i}.csv", size=i, mtime_ns=i) for i in range(3)]
+    assert cache.put(keys[0], df)
+    assert cache.put(keys[1], df)
+    assert cache.get(keys[0]) is not None
+
+    # keys[1] is now the least recently used entry
+    assert cache.put(keys[2], df)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["current_bytes"] == size * 2
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+
+    # Larger than the whole budget
+    assert not cache.put(keys[1], pl.concat([df, df, df]))
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_data_from_file_uses_cache(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    df = pl.DataFrame({"a": list(range(10)), "b": [f"x{i}" for i in range(10)]})
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp_file:
+        df.write_csv(tmp_file.name)
+        tmp_file_path = tmp_file.name
+
+    hits = dataframe_cache.hits
+    Data.from_file(tmp_file_path)
+    got = Data.from_file(tmp_file_path).lf.collect()
+    assert dataframe_cache.hits == hits + 1
+    assert got.equals(df)
+
+    # Rewriting the file changes its fingerprint
+    df = pl.DataFrame({"a": list(range(20)), "b": [f"x{i}" for i in range(20)]})
+    df.write_csv(tmp_file_path)
+    got = Data.from_file(tmp_file_path).lf.collect()
+    assert got.equals(df)
+    assert FileFingerprint.from_path(tmp_file_path) in dataframe_cache._entries
+
+    os.unlink(tmp_file_path)
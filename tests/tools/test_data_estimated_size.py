@@ -1,14 +1,17 @@
+import gzip
 import json
 import os
 import tempfile
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 
 import polars as pl
 import pytest
 
 from mcp_server_data_wrangler.tools import handle_data_estimated_size
-from mcp_server_data_wrangler.tools.model import SupportedFileType
+from mcp_server_data_wrangler.tools.model import Data, SupportedFileType
+from mcp_server_data_wrangler.tools.size_estimate import PREFIX_PATH
 
 
 @pytest.mark.asyncio
@@ -90,3 +93,98 @@ async def test_handle_data_estimated_size(
         assert s * 0.8 <= text["size"] <= s * 1.2, f"Expected size to be around {s}, but got {text['size']}"
 
     os.unlink(tmp_file_path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension",),
+    [
+        (SupportedFileType.csv.value[1],),
+        (SupportedFileType.ndjson.value[1],),
+        (SupportedFileType.parquet.value[1],),
+    ],
+)
+async def test_handle_data_estimated_size_from_prefix(
+    mocker: Any,
+    scope_function: Any,
+    extension: str,
+) -> None:
+    df = pl.DataFrame(
+        {
+            "id": list(range(20_000)),
+            "price": [i / 10 if i % 3 else None for i in range(20_000)],
+            "name": [f"name-{i}-" + "x" * (i % 40) for i in range(20_000)],
+        }
+    )
+    with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+        if extension == SupportedFileType.csv.value[1]:
+            df.write_csv(tmp_file.name)
+        elif extension == SupportedFileType.ndjson.value[1]:
+            df.write_ndjson(tmp_file.name)
+        else:
+            df.write_parquet(tmp_file.name)
+        tmp_file_path = tmp_file.name
+    # The prefix covers a small part of the file, so the sizes are extrapolated
+    mocker.patch("mcp_server_data_wrangler.tools.size_estimate._PREFIX_ROWS", 2_000)
+    mocker.patch("mcp_server_data_wrangler.tools.size_estimate._PREFIX_BYTES", 64 * 1024)
+    from_file = mocker.spy(Data, "from_file")
+
+    arguments: dict[str, Any] = {"input_data_file_path": tmp_file_path, "columns": ["id", "name"]}
+    text = json.loads((await handle_data_estimated_size(arguments=arguments))[0].text)
+    want = df.select("id", "name")
+    assert text["exact"] is False
+    assert text["execution_path"] == PREFIX_PATH
+    assert set(text["column_sizes"]) == {"id", "name"}
+    assert text["size"] == pytest.approx(want.estimated_size(), rel=0.15)
+    assert text["column_sizes"]["id"] == pytest.approx(want["id"].estimated_size(), rel=0.15)
+    # Nothing is loaded to find out how big the file is
+    assert from_file.call_count == 0
+
+    # A filter is applied to the prefix, which estimates how many rows match
+    arguments = {"input_data_file_path": tmp_file_path, "filter": {"column": "price", "op": "is_not_null"}}
+    text = json.loads((await handle_data_estimated_size(arguments=arguments))[0].text)
+    assert text["exact"] is False
+    assert text["execution_path"] == PREFIX_PATH
+    assert text["size"] == pytest.approx(df.filter(pl.col("price").is_not_null()).estimated_size(), rel=0.15)
+    assert from_file.call_count == 0
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+async def test_handle_data_estimated_size_of_compressed_file_and_dataset(
+    mocker: Any,
+    scope_function: Any,
+    tmp_path: Path,
+) -> None:
+    df = pl.DataFrame(
+        {
+            "id": list(range(20_000)),
+            "name": [f"name-{i}-" + "x" * (i % 40) for i in range(20_000)],
+        }
+    )
+    with gzip.open(tmp_path / "data.csv.gz", "wb") as file:
+        file.write(df.write_csv().encode())
+    for part in range(4):
+        (tmp_path / "events" / f"part={part}").mkdir(parents=True)
+        df.filter(pl.col("id") % 4 == part).write_parquet(tmp_path / "events" / f"part={part}" / "data.parquet")
+    mocker.patch("mcp_server_data_wrangler.tools.size_estimate._PREFIX_ROWS", 1_000)
+    mocker.patch("mcp_server_data_wrangler.tools.size_estimate._PREFIX_BYTES", 64 * 1024)
+    from_file = mocker.spy(Data, "from_file")
+
+    # The decompressed size is extrapolated from the compression ratio of a prefix
+    arguments: dict[str, Any] = {"input_data_file_path": str(tmp_path / "data.csv.gz")}
+    text = json.loads((await handle_data_estimated_size(arguments=arguments))[0].text)
+    assert (text["exact"], text["execution_path"]) == (False, PREFIX_PATH)
+    assert text["size"] == pytest.approx(df.estimated_size(), rel=0.15)
+
+    # The files of a dataset are measured one by one, with their partition column
+    arguments = {"input_data_file_path": str(tmp_path / "events"), "partitions": {"part": [1, 2]}}
+    text = json.loads((await handle_data_estimated_size(arguments=arguments))[0].text)
+    want = df.filter(pl.col("id") % 4 != 0).filter(pl.col("id") % 4 != 3).with_columns(part=pl.col("id") % 4)
+    assert set(text["column_sizes"]) == {"id", "name", "part"}
+    assert text["execution_path"] == PREFIX_PATH
+    assert text["size"] == pytest.approx(want.estimated_size(), rel=0.15)
+    assert from_file.call_count == 0
@@ -9,6 +9,7 @@ import pytest
 
 from mcp_server_data_wrangler.tools import handle_data_mean, handle_data_mean_horizontal
 from mcp_server_data_wrangler.tools.model import SupportedFileType
+from mcp_server_data_wrangler.tools.serialization import row_to_dict, series_to_list
 from mcp_server_data_wrangler.utils.datetime_utils import str_to_datetime
 
 
@@ -50,9 +51,7 @@ async def test_handle_data_mean(
     # Create expected output
     want = {
         "description": "Mean values for each column",
-        "mean_values": {
-            col: str(val) if val is not None else None for col, val in zip(mean_df.columns, mean_df.row(0))
-        },
+        "mean_values": row_to_dict(mean_df),
     }
 
     with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
@@ -131,7 +130,7 @@ async def test_handle_data_mean_horizontal_success(
     # Create expected output
     want = {
         "description": "Mean values across columns for each row",
-        "mean_values": {str(i): str(val) if val is not None else None for i, val in enumerate(mean_horizontal_df)},
+        "mean_values": dict(zip(map(str, range(mean_horizontal_df.len())), series_to_list(mean_horizontal_df))),
     }
 
     with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
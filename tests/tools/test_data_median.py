@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+from typing import Any
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools import handle_data_median
+from mcp_server_data_wrangler.tools.model import SupportedFileType
+from mcp_server_data_wrangler.tools.serialization import row_to_dict
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension",),
+    [
+        (SupportedFileType.csv.value[1],),
+        (SupportedFileType.tsv.value[1],),
+        (SupportedFileType.parquet.value[1],),
+    ],
+)
+async def test_handle_data_median(
+    mocker: Any,
+    scope_function: Any,
+    extension: str,
+) -> None:
+    size = 10_001
+    df = pl.DataFrame(
+        {
+            "a": list(range(size)),
+            "b": [i / 10 if i % 3 else None for i in range(size)],
+            "c": [f"x{i}" for i in range(size)],
+        }
+    )
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+        if extension == SupportedFileType.csv.value[1]:
+            df.write_csv(tmp_file.name)
+        elif extension == SupportedFileType.tsv.value[1]:
+            df.write_csv(tmp_file.name, separator="\t")
+        elif extension == SupportedFileType.parquet.value[1]:
+            df.write_parquet(tmp_file.name)
+        tmp_file_path = tmp_file.name
+
+    text = json.loads((await handle_data_median(arguments={"input_data_file_path": tmp_file_path}))[0].text)
+    assert text["median_values"] == row_to_dict(df.median())
+    assert "approximate" not in text
+
+    arguments = {"input_data_file_path": tmp_file_path, "approximate": True, "rank_error": 0.02}
+    text = json.loads((await handle_data_median(arguments=arguments))[0].text)
+    assert text["approximate"] is True
+    assert text["rank_error"] <= 0.02
+    assert abs(text["median_values"]["a"] / size - 0.5) <= text["rank_error"]
+    assert text["median_values"]["c"] is None
+
+    os.unlink(tmp_file_path)
@@ -1,7 +1,7 @@
 import json
 import os
 import tempfile
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 
 import polars as pl
@@ -9,6 +9,7 @@ import pytest
 
 from mcp_server_data_wrangler.tools import handle_data_min, handle_data_min_horizontal
 from mcp_server_data_wrangler.tools.model import SupportedFileType
+from mcp_server_data_wrangler.tools.serialization import row_to_dict, series_to_list
 from mcp_server_data_wrangler.utils.datetime_utils import str_to_datetime
 
 
@@ -49,7 +50,7 @@ async def test_handle_data_min(
 
     # Create expected output
     want = {
-        "min_values": {col: str(val) if val is not None else None for col, val in zip(min_df.columns, min_df.row(0))},
+        "min_values": row_to_dict(min_df),
     }
 
     with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
@@ -92,6 +93,41 @@ async def test_handle_data_min(
     os.unlink(tmp_file_path)
 
 
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension",),
+    [
+        (SupportedFileType.parquet.value[1],),
+        (SupportedFileType.arrow.value[1],),
+    ],
+)
+async def test_handle_data_min_duration_and_binary(
+    mocker: Any,
+    scope_function: Any,
+    extension: str,
+) -> None:
+    df = pl.DataFrame(
+        {
+            "duration": [timedelta(hours=2), timedelta(hours=1), timedelta(hours=3)],
+            "binary": [b"\x0f", b"\x00", b"\xff"],
+        }
+    )
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+        if extension == SupportedFileType.parquet.value[1]:
+            df.write_parquet(tmp_file.name)
+        else:
+            df.write_ipc(tmp_file.name)
+        tmp_file_path = tmp_file.name
+
+    got = await handle_data_min(arguments={"input_data_file_path": tmp_file_path})
+    text = json.loads(got[0].text)
+    assert text["min_values"] == {"duration": "PT1H", "binary": "00"}
+
+    os.unlink(tmp_file_path)
+
+
 @pytest.mark.asyncio
 @pytest.mark.usefixtures("scope_function")
 @pytest.mark.parametrize(
@@ -127,7 +163,7 @@ async def test_handle_data_min_horizontal_success(
     # Create expected output
     want = {
         "description": "Minimum values across columns for each row",
-        "min_values": {str(i): str(val) if val is not None else None for i, val in enumerate(min_horizontal_df)},
+        "min_values": dict(zip(map(str, range(min_horizontal_df.len())), series_to_list(min_horizontal_df))),
     }
 
     with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
@@ -0,0 +1,59 @@
+import json
+import os
+import tempfile
+from typing import Any
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools import handle_data_n_unique
+from mcp_server_data_wrangler.tools.model import SupportedFileType
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension",),
+    [
+        (SupportedFileType.csv.value[1],),
+        (SupportedFileType.tsv.value[1],),
+        (SupportedFileType.parquet.value[1],),
+    ],
+)
+async def test_handle_data_n_unique(
+    mocker: Any,
+    scope_function: Any,
+    extension: str,
+) -> None:
+    size = 20_000
+    df = pl.DataFrame(
+        {
+            "a": list(range(size)),
+            "b": [i % 10 if i % 7 else None for i in range(size)],
+            "c": [f"x{i % 5_000}" for i in range(size)],
+        }
+    )
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+        if extension == SupportedFileType.csv.value[1]:
+            df.write_csv(tmp_file.name)
+        elif extension == SupportedFileType.tsv.value[1]:
+            df.write_csv(tmp_file.name, separator="\t")
+        elif extension == SupportedFileType.parquet.value[1]:
+            df.write_parquet(tmp_file.name)
+        tmp_file_path = tmp_file.name
+
+    want = dict(zip(df.columns, df.select(pl.all().n_unique()).row(0)))
+
+    text = json.loads((await handle_data_n_unique(arguments={"input_data_file_path": tmp_file_path}))[0].text)
+    assert text["n_unique"] == want
+    assert "approximate" not in text
+
+    arguments = {"input_data_file_path": tmp_file_path, "approximate": True, "precision": 12}
+    text = json.loads((await handle_data_n_unique(arguments=arguments))[0].text)
+    assert text["approximate"] is True
+    assert text["relative_error"] == pytest.approx(1.04 / 64)
+    for col, n_unique in want.items():
+        assert abs(text["n_unique"][col] - n_unique) <= 4 * text["relative_error"] * n_unique + 1
+
+    os.unlink(tmp_file_path)
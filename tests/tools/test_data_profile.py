@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+from typing import Any
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools import handle_data_profile
+from mcp_server_data_wrangler.tools.model import SupportedFileType
+from mcp_server_data_wrangler.tools.serialization import row_to_dict
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension", "streaming"),
+    [
+        (SupportedFileType.csv.value[1], False),
+        (SupportedFileType.tsv.value[1], False),
+        (SupportedFileType.parquet.value[1], False),
+        (SupportedFileType.parquet.value[1], True),
+    ],
+)
+async def test_handle_data_profile(
+    mocker: Any,
+    scope_function: Any,
+    extension: str,
+    streaming: bool,
+) -> None:
+    data = [
+        {
+            "a": i,
+            "b": j / 10 if i % 2 == 0 else None,
+            "c": k,
+        }
+        for i, j, k in zip(
+            range(10),
+            range(-10, 10, 2),
+            ["a", "b", "c", "d", "e", "f", "g", "h", "i", "j"],
+        )
+    ]
+    df = pl.DataFrame(data)
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+        if extension == SupportedFileType.csv.value[1]:
+            df.write_csv(tmp_file.name)
+        elif extension == SupportedFileType.tsv.value[1]:
+            df.write_csv(tmp_file.name, separator="\t")
+        elif extension == SupportedFileType.parquet.value[1]:
+            df.write_parquet(tmp_file.name)
+        tmp_file_path = tmp_file.name
+
+    arguments = {
+        "input_data_file_path": tmp_file_path,
+        "statistics": ["count", "mean", "min", "max", "std", "var", "median", "quantile"],
+        "quantiles": [0.1, 0.9],
+        "streaming": streaming,
+    }
+    got = await handle_data_profile(arguments=arguments)
+    text = json.loads(got[0].text)
+
+    assert text["counts"] == dict(zip(df.columns, df.count().row(0)))
+    assert text["mean_values"] == row_to_dict(df.mean())
+    assert text["min_values"] == row_to_dict(df.min())
+    assert text["max_values"] == row_to_dict(df.max())
+    assert text["std_values"] == row_to_dict(df.std())
+    assert text["var_values"] == row_to_dict(df.var())
+    assert text["median_values"] == row_to_dict(df.median())
+    assert text["quantile_values"] == {
+        "0.1": row_to_dict(df.quantile(0.1, interpolation="nearest")),
+        "0.9": row_to_dict(df.quantile(0.9, interpolation="nearest")),
+    }
+
+    with pytest.raises(ValueError):
+        await handle_data_profile(arguments={"input_data_file_path": tmp_file_path, "statistics": ["mode"]})
+
+    os.unlink(tmp_file_path)
@@ -0,0 +1,118 @@
+import json
+import os
+import tempfile
+from typing import Any
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools import handle_data_quantile
+from mcp_server_data_wrangler.tools.model import SupportedFileType
+from mcp_server_data_wrangler.tools.serialization import row_to_dict
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension", "interpolation"),
+    [
+        (SupportedFileType.csv.value[1], "nearest"),
+        (SupportedFileType.tsv.value[1], "linear"),
+        (SupportedFileType.parquet.value[1], "midpoint"),
+    ],
+)
+async def test_handle_data_quantile(
+    mocker: Any,
+    scope_function: Any,
+    extension: str,
+    interpolation: str,
+) -> None:
+    data = [
+        {
+            "a": i,
+            "b": j / 10 if i % 3 else None,
+            "c": k,
+        }
+        for i, j, k in zip(
+            range(10),
+            range(-10, 10, 2),
+            ["a", "b", "c", "d", "e", "f", "g", "h", "i", "j"],
+        )
+    ]
+    df = pl.DataFrame(data)
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+        if extension == SupportedFileType.csv.value[1]:
+            df.write_csv(tmp_file.name)
+        elif extension == SupportedFileType.tsv.value[1]:
+            df.write_csv(tmp_file.name, separator="\t")
+        elif extension == SupportedFileType.parquet.value[1]:
+            df.write_parquet(tmp_file.name)
+        tmp_file_path = tmp_file.name
+
+    # Single quantile
+    arguments = {"input_data_file_path": tmp_file_path, "quantile": 0.3, "interpolation": interpolation}
+    text = json.loads((await handle_data_quantile(arguments=arguments))[0].text)
+    assert text["quantile_values"] == row_to_dict(df.quantile(0.3, interpolation=interpolation))  # type: ignore
+
+    # Several quantiles in one pass
+    quantiles = [0.5, 0.9, 0.95, 0.99]
+    arguments = {"input_data_file_path": tmp_file_path, "quantiles": quantiles, "interpolation": interpolation}
+    text = json.loads((await handle_data_quantile(arguments=arguments))[0].text)
+    assert text["quantile_values"] == {
+        str(quantile): row_to_dict(df.quantile(quantile, interpolation=interpolation))  # type: ignore
+        for quantile in quantiles
+    }
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension",),
+    [
+        (SupportedFileType.csv.value[1],),
+        (SupportedFileType.parquet.value[1],),
+    ],
+)
+async def test_handle_data_quantile_approximate(
+    mocker: Any,
+    scope_function: Any,
+    extension: str,
+) -> None:
+    size = 50_000
+    df = pl.DataFrame(
+        {
+            "a": list(range(size)),
+            "b": [float(i % 1000) if i % 7 else None for i in range(size)],
+            "c": [f"x{i}" for i in range(size)],
+        }
+    )
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+        if extension == SupportedFileType.csv.value[1]:
+            df.write_csv(tmp_file.name)
+        elif extension == SupportedFileType.parquet.value[1]:
+            df.write_parquet(tmp_file.name)
+        tmp_file_path = tmp_file.name
+
+    quantiles = [0.1, 0.5, 0.9]
+    arguments = {
+        "input_data_file_path": tmp_file_path,
+        "quantiles": quantiles,
+        "approximate": True,
+        "rank_error": 0.01,
+    }
+    text = json.loads((await handle_data_quantile(arguments=arguments))[0].text)
+
+    assert text["approximate"] is True
+    assert text["rank_error"] <= 0.01
+    for quantile in quantiles:
+        values = text["quantile_values"][str(quantile)]
+        # Ranks of the estimates are within the reported error
+        assert abs(values["a"] / size - quantile) <= text["rank_error"]
+        assert abs(values["b"] / 1000 - quantile) <= text["rank_error"] + 0.001
+        assert values["c"] is None
+
+    os.unlink(tmp_file_path)
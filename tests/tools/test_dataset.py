@@ -0,0 +1,133 @@
+import json
+import os
+import tempfile
+from typing import Any, Callable
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools import handle_data_count, handle_data_mean, handle_data_shape
+from mcp_server_data_wrangler.tools.cache import FileFingerprint
+from mcp_server_data_wrangler.tools.dataset import dataset_files, is_dataset
+from mcp_server_data_wrangler.tools.model import Data, SupportedFileType
+from mcp_server_data_wrangler.tools.sampling import ROW_RANGES, SampleSpec, sample_file
+from mcp_server_data_wrangler.tools.serialization import row_to_dict
+
+DATES = ["2024-01-01", "2024-01-02"]
+REGIONS = [1, 2, 3]
+
+
+def _write_dataset(root: str, extension: str, make_df: Callable[..., pl.DataFrame]) -> pl.DataFrame:
+    """Write one file per date and region partition, and return the rows with their partition columns."""
+    frames = []
+    for i, date in enumerate(DATES):
+        for j, region in enumerate(REGIONS):
+            df = make_df(10, start=100 * (i * len(REGIONS) + j))
+            directory = os.path.join(root, f"date={date}", f"region={region}")
+            os.makedirs(directory)
+            file_path = os.path.join(directory, f"part-0{extension}")
+            if extension == SupportedFileType.parquet.value[1]:
+                df.write_parquet(file_path)
+            else:
+                df.write_csv(file_path)
+            frames.append(df.with_columns(date=pl.lit(date), region=pl.lit(region, dtype=pl.Int64)))
+    # Marker and hidden files written by other tools are not part of the dataset
+    open(os.path.join(root, "_SUCCESS"), "w").close()
+    open(os.path.join(root, ".crc"), "w").close()
+    return pl.concat(frames)
+
+
+def _sorted(df: pl.DataFrame) -> pl.DataFrame:
+    return df.select(sorted(df.columns)).sort("a")
+
+
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension",),
+    [
+        (SupportedFileType.csv.value[1],),
+        (SupportedFileType.parquet.value[1],),
+    ],
+)
+def test_scan_dataset(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+    extension: str,
+) -> None:
+    with tempfile.TemporaryDirectory() as root:
+        want = _write_dataset(root, extension, make_df)
+        assert is_dataset(root)
+        assert len(dataset_files(root)) == len(DATES) * len(REGIONS)
+
+        assert _sorted(Data.scan_file(root).collect()).equals(_sorted(want))
+        glob_path = os.path.join(root, "date=*", "region=1", f"*{extension}")
+        assert _sorted(Data.scan_file(glob_path).collect()).equals(_sorted(want.filter(pl.col("region") == 1)))
+        assert _sorted(Data.scan_file(os.path.join(root, "**", f"*{extension}")).collect()).equals(_sorted(want))
+
+        # Pruned partitions are never scanned
+        scan_file = mocker.spy(Data, "scan_file")
+        lf = Data.scan_file(root, partitions={"date": DATES[1], "region": [1, 3]})
+        assert scan_file.call_count == 1 + 2
+        expected = want.filter((pl.col("date") == DATES[1]) & pl.col("region").is_in([1, 3]))
+        assert _sorted(lf.collect()).equals(_sorted(expected))
+
+        # Values that match no partition give an empty result with the dataset schema
+        df = Data.scan_file(root, partitions={"region": 4}).collect()
+        assert df.is_empty()
+        assert df.schema == want.schema
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_dataset_errors_and_fingerprint(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    with tempfile.TemporaryDirectory() as root:
+        _write_dataset(root, SupportedFileType.parquet.value[1], make_df)
+        with pytest.raises(ValueError):
+            Data.scan_file(root, partitions={"country": "fr"})
+        with pytest.raises(ValueError):
+            Data.scan_file(dataset_files(root)[0], partitions={"region": 1})
+        with pytest.raises(ValueError):
+            Data.scan_file(os.path.join(root, "*.csv"))
+
+        # Adding a file changes the fingerprint, so cached results of the dataset are not reused
+        fingerprint = FileFingerprint.from_path(root)
+        make_df(10, start=1_000).write_parquet(os.path.join(root, "date=2024-01-01", "region=1", "part-1.parquet"))
+        assert FileFingerprint.from_path(root) != fingerprint
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+async def test_handlers_on_dataset(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    with tempfile.TemporaryDirectory() as root:
+        want = _write_dataset(root, SupportedFileType.parquet.value[1], make_df)
+        partitions = {"date": DATES[0]}
+        expected = want.filter(pl.col("date") == DATES[0])
+
+        text = json.loads((await handle_data_mean(arguments={"input_data_file_path": root}))[0].text)
+        assert text["mean_values"] == pytest.approx(row_to_dict(want.mean()))
+        text = json.loads(
+            (await handle_data_mean(arguments={"input_data_file_path": root, "partitions": partitions}))[0].text
+        )
+        assert text["mean_values"] == pytest.approx(row_to_dict(expected.mean()))
+
+        # The footer of a single file cannot answer for a dataset
+        text = json.loads(
+            (await handle_data_count(arguments={"input_data_file_path": root, "partitions": partitions}))[0].text
+        )
+        assert text["counts"] == row_to_dict(expected.count())
+        assert text["execution_path"] == "scan"
+        text = json.loads((await handle_data_shape(arguments={"input_data_file_path": root}))[0].text)
+        assert (text["rows"], text["cols"]) == want.shape
+
+        sample = sample_file(root, SampleSpec(sample_fraction=0.5, seed=1), partitions)
+        assert sample.method == ROW_RANGES
+        assert sample.estimated_total_rows == expected.height
+        assert sample.df.join(expected, on=["a"], how="anti").is_empty()
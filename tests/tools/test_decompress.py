@@ -0,0 +1,103 @@
+import gzip
+import json
+import os
+import tempfile
+from typing import Any, Callable
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools import handle_data_mean
+from mcp_server_data_wrangler.tools.decompress import Compression
+from mcp_server_data_wrangler.tools.model import Data, SupportedFileType
+from mcp_server_data_wrangler.tools.sampling import ROW_RANGES, SampleSpec, sample_file
+from mcp_server_data_wrangler.tools.serialization import row_to_dict
+
+# Quoted fields with separators and newlines must not be split between chunks
+_QUOTED = pl.when(pl.col("a") % 7 == 0).then(pl.format('x{},\n"{}"', "a", "a")).otherwise("c").alias("c")
+
+
+def _write(df: pl.DataFrame, extension: str) -> str:
+    if extension.startswith(SupportedFileType.ndjson.extension):
+        data = df.write_ndjson().encode()
+    else:
+        separator = "\t" if extension.startswith(SupportedFileType.tsv.extension) else ","
+        data = df.write_csv(separator=separator).encode()
+    if extension.endswith(Compression.gzip.extension):
+        data = gzip.compress(data)
+    elif extension.endswith(Compression.zstd.extension):
+        zstandard = pytest.importorskip("zstandard")
+        data = zstandard.ZstdCompressor().compress(data)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+        tmp_file.write(data)
+        return tmp_file.name
+
+
+def test_file_type_from_multi_part_extension() -> None:
+    assert SupportedFileType.from_file_path("a.csv.gz") == SupportedFileType.csv
+    assert SupportedFileType.from_file_path("a.tsv.zst") == SupportedFileType.tsv
+    assert SupportedFileType.from_file_path("a.ndjson") == SupportedFileType.ndjson
+    assert Compression.from_file_path("a.ndjson.zst") == Compression.zstd
+    assert Compression.from_file_path("a.csv") is None
+    with pytest.raises(ValueError):
+        SupportedFileType.from_file_path("a.parquet.gz")
+    with pytest.raises(ValueError):
+        SupportedFileType.from_file_path("a.gz")
+
+
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension",),
+    [
+        (".csv.gz",),
+        (".tsv.gz",),
+        (".csv.zst",),
+        (".ndjson",),
+        (".ndjson.gz",),
+        (".ndjson.zst",),
+    ],
+)
+def test_scan_compressed_file(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+    extension: str,
+) -> None:
+    df = make_df(1_000).with_columns(_QUOTED)
+    tmp_file_path = _write(df, extension)
+    # Small chunks put many record boundaries, and quoted newlines, at chunk edges
+    mocker.patch("mcp_server_data_wrangler.tools.decompress._CHUNK_BYTES", 100)
+
+    lf = Data.scan_file(tmp_file_path)
+    assert lf.collect().equals(df)
+    assert lf.select("a").filter(pl.col("a") >= 990).collect()["a"].to_list() == list(range(990, 1000))
+    assert lf.head(5).collect().equals(df.head(5))
+
+    data = Data.from_file(tmp_file_path, streaming=True)
+    assert row_to_dict(data.collect(data.lf.select(pl.col("a", "b").mean()))) == pytest.approx(
+        row_to_dict(df.select(pl.col("a", "b").mean()))
+    )
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+async def test_handlers_and_sampling_on_compressed_file(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    df = make_df(10_000).with_columns(_QUOTED)
+    tmp_file_path = _write(df, ".csv.gz")
+
+    text = json.loads((await handle_data_mean(arguments={"input_data_file_path": tmp_file_path}))[0].text)
+    assert text["mean_values"] == pytest.approx(row_to_dict(df.mean()))
+
+    sample = sample_file(tmp_file_path, SampleSpec(sample_fraction=0.1, seed=1))
+    assert sample.method == ROW_RANGES
+    assert sample.num_clusters > 1
+    assert sample.df.height == pytest.approx(1_000, rel=0.1)
+    assert sample.df.join(df, on=["a"], how="anti").is_empty()
+
+    os.unlink(tmp_file_path)
@@ -1,14 +1,16 @@
 import json
 import os
 import tempfile
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import Any
 
 import polars as pl
 import pytest
 
 from mcp_server_data_wrangler.tools import handle_describe_data
+from mcp_server_data_wrangler.tools.describe_data import DescribeDataInputSchema, describe
 from mcp_server_data_wrangler.tools.model import SupportedFileType
+from mcp_server_data_wrangler.tools.serialization import columns_to_dict
 from mcp_server_data_wrangler.utils.datetime_utils import str_to_datetime
 
 
@@ -50,15 +52,10 @@ async def test_handle_describe_data(
     describe_df = df.describe(percentiles=percentiles, interpolation=interpolation)
 
     # Create expected output
+    describe_columns = columns_to_dict(describe_df)
+    statistic_names = describe_columns.pop("statistic")
     want = {
-        "statistics": {
-            col: {
-                row: str(val) if val is not None else None
-                for row, val in zip(describe_df["statistic"], describe_df[col])
-            }
-            for col in describe_df.columns
-            if col != "statistic"
-        },
+        "statistics": {col: dict(zip(statistic_names, values)) for col, values in describe_columns.items()},
     }
 
     with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
@@ -94,7 +91,7 @@ async def test_handle_describe_data(
             if want_col_stats[stat] is not None:
                 # For numeric values, compare as floats to handle precision differences
                 try:
-                    assert float(col_stats[stat]) == float(want_col_stats[stat])  # type: ignore
+                    assert float(col_stats[stat]) == float(want_col_stats[stat])
                 except (ValueError, TypeError):
                     # For non-numeric values, compare as strings
                     if col == "d" and col_stats[stat] is not None and want_col_stats[stat] is not None:
@@ -107,3 +104,66 @@ async def test_handle_describe_data(
                 assert col_stats[stat] is None
 
     os.unlink(tmp_file_path)
+
+
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(("percentiles",), [([],), ([0.1, 0.5, 0.9],)])
+def test_describe_collects_once(
+    mocker: Any,
+    scope_function: Any,
+    percentiles: list[float],
+) -> None:
+    df = pl.DataFrame({"a": list(range(100)), "b": [f"x{i}" for i in range(100)], "c": [i / 3 for i in range(100)]})
+    with tempfile.NamedTemporaryFile(delete=False, suffix=SupportedFileType.csv.value[1]) as tmp_file:
+        df.write_csv(tmp_file.name)
+        tmp_file_path = tmp_file.name
+    collect = mocker.spy(pl.LazyFrame, "collect")
+    collect_all = mocker.spy(pl, "collect_all")
+
+    # Every statistic is collected together, so the scan of the file is shared
+    lf = pl.scan_csv(tmp_file_path)
+    describe_df = describe(DescribeDataInputSchema(lf=lf, percentiles=percentiles, interpolation="linear"))
+    assert collect_all.call_count == 1
+    assert collect.call_count == 0
+    assert describe_df.equals(df.describe(percentiles=percentiles or None, interpolation="linear"))
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+async def test_handle_describe_data_typed_values(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    df = pl.DataFrame(
+        {
+            "a": [3, 1, None, 2],
+            "c": ["b", "a", "d", None],
+            "d": [date(2024, 1, 3), date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 4)],
+            "t": [timedelta(hours=2), timedelta(hours=1), None, timedelta(hours=3)],
+        }
+    )
+    with tempfile.NamedTemporaryFile(delete=False, suffix=SupportedFileType.parquet.value[1]) as tmp_file:
+        df.write_parquet(tmp_file.name)
+        tmp_file_path = tmp_file.name
+
+    got = await handle_describe_data(arguments={"input_data_file_path": tmp_file_path, "percentiles": [0.5]})
+    statistics = json.loads(got[0].text)["statistics"]
+
+    # Counts are integers and the other values keep the type of their column
+    assert statistics["a"] == {
+        "count": 3,
+        "null_count": 1,
+        "mean": 2.0,
+        "std": 1.0,
+        "min": 1.0,
+        "50%": 2.0,
+        "max": 3.0,
+    }
+    assert (statistics["c"]["count"], statistics["c"]["null_count"]) == (3, 1)
+    assert (statistics["c"]["min"], statistics["c"]["max"], statistics["c"]["mean"]) == ("a", "d", None)
+    assert (statistics["d"]["min"], statistics["d"]["max"]) == ("2024-01-01", "2024-01-04")
+    assert (statistics["t"]["min"], statistics["t"]["max"]) == ("PT1H", "PT3H")
+
+    os.unlink(tmp_file_path)
@@ -0,0 +1,33 @@
+import asyncio
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from mcp_server_data_wrangler.tools.executor import run_blocking
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+async def test_run_blocking_keeps_event_loop_responsive(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    loop_thread = threading.get_ident()
+
+    def blocking() -> int:
+        time.sleep(0.2)
+        return threading.get_ident()
+
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    worker_thread, _ = await asyncio.gather(run_blocking(blocking), ticker())
+    assert worker_thread != loop_thread
+    assert ticks == 5
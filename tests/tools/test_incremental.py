@@ -0,0 +1,163 @@
+import json
+import os
+import tempfile
+from typing import Any, Callable
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools import handle_data_count, handle_data_mean, handle_data_std, handle_data_var
+from mcp_server_data_wrangler.tools.incremental import INCREMENTAL_PATH, ColumnStats, IncrementalStatsStore
+from mcp_server_data_wrangler.tools.model import Data, SupportedFileType
+from mcp_server_data_wrangler.tools.parquet_metadata import SCAN_PATH
+
+
+def _append(file_path: str, df: pl.DataFrame, separator: str) -> None:
+    with open(file_path, "a") as file:
+        file.write(df.write_csv(include_header=False, separator=separator))
+
+
+def _assert_stats(stats: dict[str, ColumnStats], df: pl.DataFrame) -> None:
+    for col in df.columns:
+        assert stats[col].non_null == df[col].count()
+        assert stats[col].null_count == df[col].null_count()
+        assert stats[col].min == df[col].min()
+        assert stats[col].max == df[col].max()
+    for col in ["a", "b"]:
+        assert stats[col].mean() == pytest.approx(df[col].mean())
+        assert stats[col].var() == pytest.approx(df[col].var())
+        assert stats[col].std(ddof=0) == pytest.approx(df[col].std(ddof=0))
+    assert stats["c"].mean() is None
+
+
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension", "separator"),
+    [
+        (SupportedFileType.csv.value[1], ","),
+        (SupportedFileType.tsv.value[1], "\t"),
+    ],
+)
+def test_incremental_stats_append(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+    extension: str,
+    separator: str,
+) -> None:
+    store = IncrementalStatsStore()
+    df = make_df(100)
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+        df.write_csv(tmp_file.name, separator=separator)
+        tmp_file_path = tmp_file.name
+
+    load_file = mocker.spy(Data, "_load_file")
+    stats = store.get(tmp_file_path)
+    assert stats is not None
+    _assert_stats(stats.columns, df)
+    assert load_file.call_count == 1
+
+    # Appended rows are parsed on their own and merged, without reading the file again
+    for size, start in [(50, 100), (1, 150)]:
+        appended = make_df(size, start=start)
+        _append(tmp_file_path, appended, separator)
+        df = pl.concat([df, appended])
+        stats = store.get(tmp_file_path)
+        assert stats is not None
+        _assert_stats(stats.columns, df)
+        assert stats.offset == os.path.getsize(tmp_file_path)
+    assert load_file.call_count == 1
+
+    # A partial last line is left for a later call
+    with open(tmp_file_path, "a") as file:
+        file.write(f"151{separator}15.1")
+    stats = store.get(tmp_file_path)
+    assert stats is not None
+    assert stats.columns["a"].non_null == df.height
+    with open(tmp_file_path, "a") as file:
+        file.write(f"{separator}x151\n")
+    df = pl.concat([df, make_df(1, start=151)])
+    stats = store.get(tmp_file_path)
+    assert stats is not None
+    _assert_stats(stats.columns, df)
+    assert load_file.call_count == 1
+
+    # So is a record whose quoted field spans several lines and is not written to the end yet
+    with open(tmp_file_path, "a") as file:
+        file.write(f'152{separator}15.2{separator}"x\n')
+    stats = store.get(tmp_file_path)
+    assert stats is not None
+    assert stats.columns["a"].non_null == df.height
+    with open(tmp_file_path, "a") as file:
+        file.write('152"\n')
+    df = pl.concat([df, pl.DataFrame({"a": [152], "b": [15.2], "c": ["x\n152"]})])
+    stats = store.get(tmp_file_path)
+    assert stats is not None
+    _assert_stats(stats.columns, df)
+    assert stats.offset == os.path.getsize(tmp_file_path)
+    assert load_file.call_count == 1
+
+    # Rewriting the file recomputes from scratch
+    df = make_df(50, start=1000)
+    df.write_csv(tmp_file_path, separator=separator)
+    stats = store.get(tmp_file_path)
+    assert stats is not None
+    _assert_stats(stats.columns, df)
+    assert load_file.call_count == 2
+
+    # Rows that do not match the inferred schema also recompute from scratch
+    with open(tmp_file_path, "a") as file:
+        file.write(f"1.5{separator}0.5{separator}y\n")
+    df = pl.read_csv(tmp_file_path, separator=separator)
+    stats = store.get(tmp_file_path)
+    assert stats is not None
+    _assert_stats(stats.columns, df)
+    assert load_file.call_count == 3
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+async def test_handlers_use_incremental_stats(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    df = make_df(100)
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp_file:
+        df.write_csv(tmp_file.name)
+        tmp_file_path = tmp_file.name
+
+    arguments = {"input_data_file_path": tmp_file_path}
+    await handle_data_count(arguments=arguments)
+
+    appended = make_df(20, start=100)
+    _append(tmp_file_path, appended, ",")
+    df = pl.concat([df, appended])
+
+    text = json.loads((await handle_data_count(arguments=arguments))[0].text)
+    assert text["counts"] == dict(zip(df.columns, df.count().row(0)))
+    assert text["execution_path"] == INCREMENTAL_PATH
+
+    text = json.loads((await handle_data_mean(arguments=arguments))[0].text)
+    assert text["mean_values"] == pytest.approx(dict(zip(df.columns, df.mean().row(0))))
+    assert text["execution_path"] == INCREMENTAL_PATH
+
+    text = json.loads((await handle_data_std(arguments={**arguments, "ddof": 0}))[0].text)
+    assert text["std_values"] == pytest.approx(dict(zip(df.columns, df.std(ddof=0).row(0))))
+    assert text["execution_path"] == INCREMENTAL_PATH
+
+    text = json.loads((await handle_data_var(arguments=arguments))[0].text)
+    assert text["var_values"] == pytest.approx(dict(zip(df.columns, df.var().row(0))))
+    assert text["execution_path"] == INCREMENTAL_PATH
+    # A filter needs the parsed values
+    text = json.loads(
+        (await handle_data_var(arguments={**arguments, "filter": {"column": "a", "op": ">=", "value": 0}}))[0].text
+    )
+    assert text["var_values"] == pytest.approx(dict(zip(df.columns, df.var().row(0))))
+    assert text["execution_path"] == SCAN_PATH
+
+    os.unlink(tmp_file_path)
@@ -0,0 +1,141 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.configurations import settings
+from mcp_server_data_wrangler.tools.cache import FileFingerprint
+from mcp_server_data_wrangler.tools.ingest import ColumnarCopies, columnar_copies
+from mcp_server_data_wrangler.tools.model import Data, SupportedFileType
+
+
+def _patch_storage(mocker: Any, storage_dir: str, mode: str) -> None:
+    mocker.patch("mcp_server_data_wrangler.tools.ingest.conversions_dir", return_value=Path(storage_dir))
+    mocker.patch.object(settings, "CONVERSION_MODE", mode)
+    mocker.patch.object(settings, "CONVERSION_MIN_BYTES", 0)
+
+
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension", "separator"),
+    [
+        (SupportedFileType.csv.value[1], ","),
+        (SupportedFileType.tsv.value[1], "\t"),
+    ],
+)
+def test_scan_file_reads_columnar_copy(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+    extension: str,
+    separator: str,
+) -> None:
+    df = make_df(1_000)
+
+    with tempfile.TemporaryDirectory() as storage_dir:
+        _patch_storage(mocker, storage_dir, "on_demand")
+        with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+            df.write_csv(tmp_file.name, separator=separator)
+            tmp_file_path = tmp_file.name
+
+        lf = Data.scan_file(tmp_file_path)
+        assert lf.explain().startswith("Parquet SCAN")
+        assert lf.collect().equals(df)
+        assert len(os.listdir(storage_dir)) == 1
+
+        # Rewriting the source replaces its copy
+        df = make_df(500)
+        df.write_csv(tmp_file_path, separator=separator)
+        os.utime(tmp_file_path, ns=(1, 1))
+        lf = Data.scan_file(tmp_file_path)
+        assert lf.collect().equals(df)
+        copies = os.listdir(storage_dir)
+        assert copies == [columnar_copies.copy_path(FileFingerprint.from_path(tmp_file_path)).name]
+
+        os.unlink(tmp_file_path)
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_background_conversion(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    df = make_df(1_000)
+
+    with tempfile.TemporaryDirectory() as storage_dir:
+        _patch_storage(mocker, storage_dir, "background")
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp_file:
+            df.write_csv(tmp_file.name)
+            tmp_file_path = tmp_file.name
+
+        submit = mocker.spy(columnar_copies, "submit")
+        # The first call parses the text while the copy is written in the background
+        lf = Data.scan_file(tmp_file_path)
+        assert lf.explain().startswith("Csv SCAN")
+        assert submit.call_count == 1
+        assert submit.spy_return.result() is not None
+
+        lf = Data.scan_file(tmp_file_path)
+        assert lf.explain().startswith("Parquet SCAN")
+        assert lf.collect().equals(df)
+        assert submit.call_count == 1
+
+        # Small files and the off mode always parse the text
+        mocker.patch.object(settings, "CONVERSION_MODE", "off")
+        assert Data.scan_file(tmp_file_path).explain().startswith("Csv SCAN")
+        mocker.patch.object(settings, "CONVERSION_MODE", "background")
+        mocker.patch.object(settings, "CONVERSION_MIN_BYTES", os.path.getsize(tmp_file_path) + 1)
+        assert Data.scan_file(tmp_file_path).explain().startswith("Csv SCAN")
+        # Files larger than the disk budget of the copies are never converted
+        mocker.patch.object(settings, "CONVERSION_MIN_BYTES", 0)
+        mocker.patch.object(settings, "CONVERSION_MAX_BYTES", os.path.getsize(tmp_file_path) - 1)
+        df.write_csv(tmp_file_path)
+        os.utime(tmp_file_path, ns=(1, 1))
+        assert Data.scan_file(tmp_file_path).explain().startswith("Csv SCAN")
+        assert submit.call_count == 1
+
+        os.unlink(tmp_file_path)
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_conversion_failure_and_eviction(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    copies = ColumnarCopies()
+
+    with tempfile.TemporaryDirectory() as storage_dir:
+        _patch_storage(mocker, storage_dir, "on_demand")
+
+        # Rows that do not match the inferred schema are not converted, and not retried
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".csv", mode="w") as tmp_file:
+            tmp_file.write("a\n" + "1\n" * 200 + "x\n")
+            bad_file_path = tmp_file.name
+        sink_parquet = mocker.spy(pl.LazyFrame, "sink_parquet")
+        assert copies.convert(FileFingerprint.from_path(bad_file_path), lambda: pl.scan_csv(bad_file_path)) is None
+        assert copies.convert(FileFingerprint.from_path(bad_file_path), lambda: pl.scan_csv(bad_file_path)) is None
+        assert sink_parquet.call_count == 1
+        assert os.listdir(storage_dir) == []
+
+        # The least recently used copies are evicted beyond the disk budget
+        paths = []
+        fingerprints = []
+        for _ in range(3):
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp_file:
+                make_df(1_000).write_csv(tmp_file.name)
+                paths.append(tmp_file.name)
+            fingerprints.append(FileFingerprint.from_path(paths[-1]))
+            copy_path = copies.convert(fingerprints[-1], lambda: pl.scan_csv(paths[-1]))
+            assert copy_path is not None
+            mocker.patch.object(settings, "CONVERSION_MAX_BYTES", 2 * copy_path.stat().st_size)
+        assert copies.get(fingerprints[0]) is None
+        assert copies.get(fingerprints[1]) is not None
+        assert copies.get(fingerprints[2]) is not None
+
+        for path in [bad_file_path, *paths]:
+            os.unlink(path)
@@ -0,0 +1,125 @@
+import os
+import tempfile
+from typing import Any
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools.cache import dataframe_cache
+from mcp_server_data_wrangler.tools.model import Data, SupportedFileType
+
+
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension",),
+    [
+        (SupportedFileType.csv.value[1],),
+        (SupportedFileType.tsv.value[1],),
+        (SupportedFileType.parquet.value[1],),
+        (SupportedFileType.arrow.value[1],),
+        (SupportedFileType.feather.value[1],),
+        (SupportedFileType.ipc.value[1],),
+    ],
+)
+def test_data_scan_file_is_lazy(
+    mocker: Any,
+    scope_function: Any,
+    extension: str,
+) -> None:
+    df = pl.DataFrame({"a": list(range(10)), "b": [i / 10 for i in range(10)], "c": [str(i) for i in range(10)]})
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+        if extension == SupportedFileType.csv.value[1]:
+            df.write_csv(tmp_file.name)
+        elif extension == SupportedFileType.tsv.value[1]:
+            df.write_csv(tmp_file.name, separator="\t")
+        elif extension == SupportedFileType.parquet.value[1]:
+            df.write_parquet(tmp_file.name)
+        else:
+            df.write_ipc(tmp_file.name)
+        tmp_file_path = tmp_file.name
+
+    lf = Data.scan_file(tmp_file_path)
+    assert isinstance(lf, pl.LazyFrame)
+
+    # Only the selected column should be read by the scan
+    plan = lf.select(pl.col("a").mean()).explain()
+    assert "PROJECT 1/3 COLUMNS" in plan
+
+    got = lf.select(pl.col("a").mean()).collect()
+    assert got.item() == df["a"].mean()
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension",),
+    [
+        (SupportedFileType.csv.value[1],),
+        (SupportedFileType.parquet.value[1],),
+    ],
+)
+def test_data_from_file_streaming(
+    mocker: Any,
+    scope_function: Any,
+    extension: str,
+) -> None:
+    df = pl.DataFrame({"a": list(range(100)), "b": [i / 10 if i % 3 else None for i in range(100)]})
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+        if extension == SupportedFileType.csv.value[1]:
+            df.write_csv(tmp_file.name)
+        elif extension == SupportedFileType.parquet.value[1]:
+            df.write_parquet(tmp_file.name)
+        tmp_file_path = tmp_file.name
+
+    assert not Data.from_file(tmp_file_path).streaming
+
+    data = Data.from_file(tmp_file_path, streaming=True)
+    assert data.streaming
+    for query, want in [
+        (data.lf.mean(), df.mean()),
+        (data.lf.std(ddof=1), df.std(ddof=1)),
+        (data.lf.count(), df.count()),
+    ]:
+        assert data.collect(query).equals(want)
+
+    # Files above the threshold stream automatically
+    mocker.patch("mcp_server_data_wrangler.tools.model.settings.STREAMING_THRESHOLD_BYTES", 0)
+    assert Data.from_file(tmp_file_path).streaming
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension", "compression"),
+    [
+        (SupportedFileType.arrow.value[1], "uncompressed"),
+        (SupportedFileType.feather.value[1], "zstd"),
+    ],
+)
+def test_data_from_file_ipc_is_memory_mapped(
+    mocker: Any,
+    scope_function: Any,
+    extension: str,
+    compression: str,
+) -> None:
+    df = pl.DataFrame({"a": list(range(100)), "b": [i / 10 if i % 3 else None for i in range(100)]})
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+        df.write_ipc(tmp_file.name, compression=compression)  # type: ignore
+        tmp_file_path = tmp_file.name
+
+    # IPC files are scanned in place rather than copied into the DataFrame cache
+    cache_put = mocker.spy(dataframe_cache, "put")
+    scan_ipc = mocker.spy(pl, "scan_ipc")
+    data = Data.from_file(tmp_file_path)
+    assert not data.streaming
+    assert cache_put.call_count == 0
+    assert scan_ipc.call_args.kwargs["memory_map"] is True
+    assert data.collect(data.lf).equals(df)
+    assert data.collect(data.lf.mean()).equals(df.mean())
+
+    os.unlink(tmp_file_path)
@@ -0,0 +1,118 @@
+import json
+import os
+import tempfile
+from typing import Any, Callable
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools import handle_data_count, handle_data_max, handle_data_min, handle_data_shape
+from mcp_server_data_wrangler.tools.parquet_metadata import METADATA_PATH, MIXED_PATH, SCAN_PATH, ParquetFooter
+from mcp_server_data_wrangler.tools.serialization import row_to_dict, to_json_value
+
+# Temporal, all-null and NaN columns added to the rows of the make_df fixture
+_TYPED_COLUMNS = [
+    pl.datetime(2026, 1, 1, pl.col("a")).alias("d"),
+    pl.date(2026, 1, pl.col("a") + 1).alias("e"),
+    pl.lit(None).alias("f"),
+    pl.when(pl.col("a") == 4).then(float("nan")).otherwise(pl.col("a").cast(pl.Float64)).alias("g"),
+]
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_parquet_footer(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    df = make_df(10).with_columns(_TYPED_COLUMNS)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".parquet") as tmp_file:
+        df.write_parquet(tmp_file.name, row_group_size=3)
+        tmp_file_path = tmp_file.name
+
+    footer = ParquetFooter.from_file(tmp_file_path)
+    assert footer.num_rows == df.height
+    assert footer.data_schema == df.schema
+    assert footer.null_counts == dict(zip(df.columns, df.null_count().row(0)))
+
+    # Strings may be truncated and NaN is ignored by Polars, so both are left to the scan
+    assert set(footer.min_values) == {"a", "b", "d", "e", "f"}
+    min_df, max_df = df.min(), df.max()
+    for col in footer.min_values:
+        assert footer.min_values[col] == min_df[col].item()
+        assert footer.max_values[col] == max_df[col].item()
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+async def test_nanosecond_timestamps_are_scanned(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    # Nanoseconds are not convertible to datetime.datetime, so the footer statistics are not read
+    df = pl.DataFrame(
+        {
+            "a": [1, 2, 3],
+            "t": pl.Series([1_000_000_001, 2_000_000_003, 3_000_000_005]).cast(pl.Datetime("ns")),
+        }
+    )
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".parquet") as tmp_file:
+        df.write_parquet(tmp_file.name)
+        tmp_file_path = tmp_file.name
+
+    footer = ParquetFooter.from_file(tmp_file_path)
+    assert set(footer.min_values) == {"a"}
+    assert footer.null_counts == {"a": 0, "t": 0}
+
+    arguments = {"input_data_file_path": tmp_file_path}
+    text = json.loads((await handle_data_max(arguments=arguments))[0].text)
+    assert text["max_values"] == {col: to_json_value(value) for col, value in df.max().row(0, named=True).items()}
+    assert text["execution_path"] == MIXED_PATH
+    text = json.loads((await handle_data_count(arguments=arguments))[0].text)
+    assert text["counts"] == {"a": 3, "t": 3}
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("statistics", "want_path"),
+    [
+        (True, MIXED_PATH),
+        (False, SCAN_PATH),
+    ],
+)
+async def test_handlers_report_execution_path(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+    statistics: bool,
+    want_path: str,
+) -> None:
+    df = make_df(10).with_columns(_TYPED_COLUMNS)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".parquet") as tmp_file:
+        df.write_parquet(tmp_file.name, row_group_size=3, statistics=statistics)
+        tmp_file_path = tmp_file.name
+
+    arguments = {"input_data_file_path": tmp_file_path}
+
+    text = json.loads((await handle_data_shape(arguments=arguments))[0].text)
+    assert (text["rows"], text["cols"]) == df.shape
+    assert text["execution_path"] == METADATA_PATH
+
+    text = json.loads((await handle_data_count(arguments=arguments))[0].text)
+    assert text["counts"] == dict(zip(df.columns, df.count().row(0)))
+    assert text["execution_path"] == (METADATA_PATH if statistics else SCAN_PATH)
+
+    for handler, key, want_df in [
+        (handle_data_min, "min_values", df.min()),
+        (handle_data_max, "max_values", df.max()),
+    ]:
+        text = json.loads((await handler(arguments=arguments))[0].text)
+        assert text[key] == row_to_dict(want_df)
+        assert text["execution_path"] == want_path
+
+    os.unlink(tmp_file_path)
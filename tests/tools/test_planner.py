@@ -0,0 +1,144 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.configurations import settings
+from mcp_server_data_wrangler.server import call_tool
+from mcp_server_data_wrangler.tools.cache import dataframe_cache
+from mcp_server_data_wrangler.tools.model import Data, SupportedFileType
+from mcp_server_data_wrangler.tools.planner import EAGER, LAZY, METADATA, SAMPLED, STREAMING, plan_call
+
+
+def _write_parquet(df: pl.DataFrame) -> str:
+    with tempfile.NamedTemporaryFile(delete=False, suffix=SupportedFileType.parquet.value[1]) as tmp_file:
+        df.write_parquet(tmp_file.name)
+        return tmp_file.name
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_plan_call_within_budget(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    df = make_df(1_000)
+    tmp_file_path = _write_parquet(df)
+    input_bytes = df.estimated_size()
+
+    plan = plan_call("data_mean", {"input_data_file_path": tmp_file_path})
+    assert plan is not None
+    assert (plan.mode, plan.input_bytes, plan.exact_estimate) == (EAGER, input_bytes, True)
+    # A projection is read lazily and needs only the selected columns
+    plan = plan_call("data_median", {"input_data_file_path": tmp_file_path, "columns": ["a"]})
+    assert plan is not None
+    assert (plan.mode, plan.required_bytes) == (LAZY, 2 * df["a"].estimated_size())
+    plan = plan_call("data_estimated_size", {"input_data_file_path": tmp_file_path})
+    assert plan is not None and plan.mode == METADATA
+    assert plan_call("data_schema", {"input_data_file_path": tmp_file_path}) is None
+    assert plan_call("catalog", {"action": "list", "input_data_file_path": tmp_file_path}) is None
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_plan_call_over_budget(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    tmp_file_path = _write_parquet(make_df(1_000))
+    mocker.patch.object(settings, "MEMORY_BUDGET_BYTES", 4 * 1024)
+    arguments = {"input_data_file_path": tmp_file_path}
+
+    plan = plan_call("data_mean", arguments)
+    assert plan is not None and plan.mode == STREAMING
+    plan = plan_call("data_median", arguments)
+    assert plan is not None
+    assert (plan.mode, plan.adjusted_arguments) == (STREAMING, {"approximate": True})
+    plan = plan_call("describe_data", arguments)
+    assert plan is not None and plan.mode == SAMPLED
+    assert 0.0 < plan.adjusted_arguments["sample_fraction"] < 1.0
+    assert plan.required_bytes <= settings.MEMORY_BUDGET_BYTES
+
+    with pytest.raises(ValueError):
+        plan_call("data_mean", {**arguments, "streaming": False})
+    # Sizes are measured on a prefix, with or without a filter
+    plan = plan_call("data_estimated_size", {**arguments, "filter": {"column": "a", "op": ">", "value": 1}})
+    assert plan is not None and plan.mode == METADATA
+
+    # The footer answers counts and extremes without reading the rows, whatever the budget
+    estimate = mocker.patch("mcp_server_data_wrangler.tools.planner.estimate_file_size")
+    for tool in ("data_count", "data_min", "data_max"):
+        plan = plan_call(tool, {**arguments, "streaming": False})
+        assert plan is not None and plan.mode == METADATA
+    estimate.assert_not_called()
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+async def test_call_tool_reports_plan(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    df = make_df(1_000)
+    tmp_file_path = _write_parquet(df)
+    mocker.patch.object(settings, "CATALOG_ENABLED", False)
+    dataframe_cache.clear()
+    load_file = mocker.spy(Data, "_load_file")
+    arguments = {"input_data_file_path": tmp_file_path, "columns": ["a", "b"]}
+
+    text = json.loads((await call_tool("data_mean", arguments))[0].text)
+    assert text["plan"]["mode"] == LAZY
+    assert text["plan"]["memory_budget_bytes"] == settings.MEMORY_BUDGET_BYTES
+    assert load_file.spy_return.streaming is False
+
+    # Over the budget, the same call streams and order statistics are estimated
+    mocker.patch.object(settings, "MEMORY_BUDGET_BYTES", 4 * 1024)
+    text = json.loads((await call_tool("data_mean", arguments))[0].text)
+    assert text["plan"]["mode"] == STREAMING
+    assert load_file.spy_return.streaming is True
+    assert text["mean_values"] == pytest.approx({"a": df["a"].mean(), "b": df["b"].mean()})
+    text = json.loads((await call_tool("describe_data", {"input_data_file_path": tmp_file_path}))[0].text)
+    assert text["plan"]["mode"] == SAMPLED
+    assert "sample" in text
+
+    with pytest.raises(ValueError):
+        await call_tool("data_mean", {**arguments, "streaming": False})
+
+    text = json.loads((await call_tool("data_count", arguments))[0].text)
+    assert (text["plan"]["mode"], text["execution_path"]) == (METADATA, METADATA)
+
+    dataframe_cache.clear()
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+async def test_call_tool_does_not_plan_catalog(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    with tempfile.TemporaryDirectory() as storage_dir:
+        mocker.patch(
+            "mcp_server_data_wrangler.tools.result_catalog.catalog_path",
+            return_value=Path(storage_dir) / "catalog.sqlite",
+        )
+        tmp_file_path = _write_parquet(make_df(1_000))
+        arguments = {"input_data_file_path": tmp_file_path}
+        await call_tool("data_mean", arguments)
+        os.unlink(tmp_file_path)
+
+        # Results of a deleted file can still be listed and purged
+        text = json.loads((await call_tool("catalog", {"action": "list", **arguments}))[0].text)
+        assert "plan" not in text
+        text = json.loads((await call_tool("catalog", {"action": "purge", **arguments}))[0].text)
+        assert text["purged"] == 1
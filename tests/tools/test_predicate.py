@@ -0,0 +1,173 @@
+import json
+import os
+import tempfile
+from datetime import date, datetime
+from typing import Any, Callable
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools import handle_data_count, handle_data_mean
+from mcp_server_data_wrangler.tools.model import Data, SupportedFileType
+from mcp_server_data_wrangler.tools.predicate import compile_filter, restrict_filter
+from mcp_server_data_wrangler.tools.serialization import row_to_dict
+
+# Columns of each type a filter compares, derived from the rows of the make_df fixture
+_FILTERED_COLUMNS = [
+    (pl.col("a") / 10).alias("amount"),
+    (pl.col("a") % 3).replace_strict({0: "JP", 1: "US", 2: "FR"}).alias("country"),
+    pl.date(2024, 1, 1 + pl.col("a") % 28).alias("day"),
+    pl.datetime(2024, 1, 1, pl.col("a") % 24).alias("at"),
+    pl.when(pl.col("a") % 5 != 0).then(pl.format("n{}", "a")).alias("note"),
+]
+
+
+@pytest.mark.parametrize(
+    ("predicate", "expected"),
+    [
+        ({"column": "country", "op": "==", "value": "JP"}, pl.col("country") == "JP"),
+        ({"column": "amount", "op": ">=", "value": 5}, pl.col("amount") >= 5),
+        ({"column": "country", "op": "in", "value": ["JP", "FR"]}, pl.col("country").is_in(["JP", "FR"])),
+        ({"column": "country", "op": "not_in", "value": ["JP"]}, ~pl.col("country").is_in(["JP"])),
+        ({"column": "note", "op": "is_null"}, pl.col("note").is_null()),
+        ({"column": "day", "op": "<", "value": "2024-01-10"}, pl.col("day") < date(2024, 1, 10)),
+        ({"column": "at", "op": ">", "value": "2024-01-01T12:00:00"}, pl.col("at") > datetime(2024, 1, 1, 12)),
+        (
+            {
+                "or": [
+                    {
+                        "and": [
+                            {"column": "country", "op": "==", "value": "JP"},
+                            {"column": "amount", "op": "<", "value": 3},
+                        ]
+                    },
+                    {"not": {"column": "note", "op": "is_not_null"}},
+                ]
+            },
+            ((pl.col("country") == "JP") & (pl.col("amount") < 3)) | pl.col("note").is_null(),
+        ),
+    ],
+)
+def test_compile_filter(make_df: Callable[..., pl.DataFrame], predicate: dict[str, Any], expected: pl.Expr) -> None:
+    df = make_df(100).select(_FILTERED_COLUMNS)
+    assert df.filter(compile_filter(predicate, df.schema)).equals(df.filter(expected))
+
+
+@pytest.mark.parametrize(
+    ("predicate",),
+    [
+        ({"column": "missing", "op": "==", "value": 1},),
+        ({"column": "amount", "op": "~", "value": 1},),
+        ({"column": "amount", "op": "=="},),
+        ({"column": "amount", "op": "==", "value": None},),
+        ({"column": "country", "op": "in", "value": "JP"},),
+        ({"column": "day", "op": "==", "value": "January"},),
+        ({"and": []},),
+        ({"and": [{"column": "amount", "op": "is_null"}], "or": []},),
+    ],
+)
+def test_compile_filter_errors(make_df: Callable[..., pl.DataFrame], predicate: dict[str, Any]) -> None:
+    with pytest.raises(ValueError):
+        compile_filter(predicate, make_df(1).select(_FILTERED_COLUMNS).schema)
+
+
+def test_restrict_filter() -> None:
+    on_date = {"column": "date", "op": "==", "value": "2024-01-01"}
+    on_amount = {"column": "amount", "op": ">", "value": 1}
+    assert restrict_filter({"and": [on_date, on_amount]}, {"date"}) == on_date
+    assert restrict_filter(on_amount, {"date"}) is None
+    # An 'or' mixing partition and data columns cannot prune anything
+    assert restrict_filter({"or": [on_date, on_amount]}, {"date"}) is None
+
+
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension",),
+    [
+        (SupportedFileType.csv.value[1],),
+        (SupportedFileType.parquet.value[1],),
+    ],
+)
+def test_filter_is_pushed_into_scan(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+    extension: str,
+) -> None:
+    df = make_df(1_000).select(_FILTERED_COLUMNS[:2])
+    with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+        if extension == SupportedFileType.csv.value[1]:
+            df.write_csv(tmp_file.name)
+        else:
+            df.write_parquet(tmp_file.name, row_group_size=100)
+        tmp_file_path = tmp_file.name
+    row_filter = {
+        "and": [{"column": "amount", "op": ">=", "value": 90}, {"column": "country", "op": "==", "value": "JP"}]
+    }
+
+    lf = Data.scan_file(tmp_file_path, row_filter=row_filter).select(pl.col("amount").sum())
+    # The predicate is evaluated by the reader, not by a filter on top of the scan
+    assert "SELECTION" in lf.explain()
+    assert "FILTER" not in lf.explain()
+    assert lf.collect().item() == pytest.approx(
+        df.filter((pl.col("amount") >= 90) & (pl.col("country") == "JP"))["amount"].sum()
+    )
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_filter_prunes_partitions(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    with tempfile.TemporaryDirectory() as root:
+        frames = []
+        for region in range(4):
+            df = make_df(10).select(_FILTERED_COLUMNS).with_columns(region=pl.lit(region, dtype=pl.Int64))
+            os.makedirs(os.path.join(root, f"region={region}"))
+            df.drop("region").write_parquet(os.path.join(root, f"region={region}", "part-0.parquet"))
+            frames.append(df)
+        want = pl.concat(frames)
+
+        scan_file = mocker.spy(Data, "scan_file")
+        row_filter = {
+            "and": [{"column": "region", "op": ">=", "value": 2}, {"column": "country", "op": "==", "value": "JP"}]
+        }
+        lf = Data.scan_file(root, row_filter=row_filter)
+        # Only the files of regions 2 and 3 are scanned
+        assert scan_file.call_count == 1 + 2
+        expected = want.filter((pl.col("region") >= 2) & (pl.col("country") == "JP"))
+        assert lf.collect().sort("region", "amount").equals(expected.select(lf.collect_schema().names()))
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+async def test_handlers_with_filter(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    df = make_df(1_000).select(_FILTERED_COLUMNS)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=SupportedFileType.parquet.value[1]) as tmp_file:
+        df.write_parquet(tmp_file.name)
+        tmp_file_path = tmp_file.name
+    row_filter = {"column": "country", "op": "==", "value": "JP"}
+    filtered_df = df.filter(pl.col("country") == "JP")
+
+    arguments = {"input_data_file_path": tmp_file_path, "columns": ["amount"], "filter": row_filter}
+    text = json.loads((await handle_data_mean(arguments=arguments))[0].text)
+    assert text["mean_values"] == pytest.approx(row_to_dict(filtered_df.select(pl.col("amount").mean())))
+
+    # The Parquet footer counts every row, so a filtered count scans the file
+    text = json.loads((await handle_data_count(arguments=arguments))[0].text)
+    assert text["counts"] == {"amount": filtered_df.height}
+    assert text["execution_path"] == "scan"
+
+    # A sample of the whole file filtered to the matching rows gives the exact answer
+    text = json.loads((await handle_data_mean(arguments={**arguments, "sample_fraction": 1.0}))[0].text)
+    assert text["mean_values"] == pytest.approx({"amount": filtered_df["amount"].mean()})
+    assert text["sample"]["estimated_total_rows"] == filtered_df.height
+
+    os.unlink(tmp_file_path)
@@ -0,0 +1,137 @@
+import json
+import os
+import tempfile
+from typing import Any, Callable
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools import (
+    handle_data_count,
+    handle_data_mean,
+    handle_data_schema,
+    handle_data_shape,
+    handle_describe_data,
+)
+from mcp_server_data_wrangler.tools.cache import dataframe_cache
+from mcp_server_data_wrangler.tools.incremental import INCREMENTAL_PATH
+from mcp_server_data_wrangler.tools.model import Data, SupportedFileType
+from mcp_server_data_wrangler.tools.parquet_metadata import METADATA_PATH
+from mcp_server_data_wrangler.tools.projection import resolve_columns
+from mcp_server_data_wrangler.tools.serialization import row_to_dict
+
+# Columns named and typed for patterns and selectors, derived from the rows of the make_df fixture
+_NAMED_COLUMNS = [
+    pl.col("a").alias("id"),
+    (pl.col("a") / 10).alias("price_net"),
+    (pl.col("a") / 8).alias("price_gross"),
+    pl.col("c").alias("name"),
+    pl.date(2024, 1, 1 + pl.col("a") % 28).alias("day"),
+]
+
+
+def test_resolve_columns(make_df: Callable[..., pl.DataFrame]) -> None:
+    schema = make_df(1).select(_NAMED_COLUMNS).schema
+    assert resolve_columns(schema, None) is None
+    # Selected columns are returned in schema order
+    assert resolve_columns(schema, ["name", "id"]) == ["id", "name"]
+    assert resolve_columns(schema, ["^price_.*$"]) == ["price_net", "price_gross"]
+    assert resolve_columns(schema, [{"selector": "numeric"}]) == ["id", "price_net", "price_gross"]
+    assert resolve_columns(schema, [{"selector": "temporal"}, "name"]) == ["name", "day"]
+    with pytest.raises(ValueError):
+        resolve_columns(schema, ["missing"])
+    with pytest.raises(ValueError):
+        resolve_columns(schema, ["^missing_.*$"])
+    with pytest.raises(ValueError):
+        resolve_columns(schema, [{"selector": "decimal"}])
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_from_file_pushes_projection_into_scan(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    df = make_df(100).select(_NAMED_COLUMNS)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=SupportedFileType.parquet.value[1]) as tmp_file:
+        df.write_parquet(tmp_file.name)
+        tmp_file_path = tmp_file.name
+    dataframe_cache.clear()
+    put = mocker.spy(dataframe_cache, "put")
+
+    data = Data.from_file(tmp_file_path, columns=["^price_.*$"])
+    assert "PROJECT 2/5 COLUMNS" in data.lf.explain()
+    assert data.lf.collect().equals(df.select("price_net", "price_gross"))
+    # A projection never loads the whole file into the cache
+    assert put.call_count == 0
+
+    # Once the file is cached, projections are served from memory
+    Data.from_file(tmp_file_path)
+    assert put.call_count == 1
+    data = Data.from_file(tmp_file_path, columns=["id"])
+    assert "Parquet SCAN" not in data.lf.explain()
+    assert data.lf.collect().equals(df.select("id"))
+
+    dataframe_cache.clear()
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension",),
+    [
+        (SupportedFileType.csv.value[1],),
+        (SupportedFileType.parquet.value[1],),
+    ],
+)
+async def test_handlers_with_columns(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+    extension: str,
+) -> None:
+    df = make_df(100).select(_NAMED_COLUMNS)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+        if extension == SupportedFileType.csv.value[1]:
+            df.write_csv(tmp_file.name)
+        else:
+            df.write_parquet(tmp_file.name)
+        tmp_file_path = tmp_file.name
+    columns = ["^price_.*$", "id"]
+    selected_df = df.select("id", "price_net", "price_gross")
+
+    text = json.loads(
+        (await handle_data_mean(arguments={"input_data_file_path": tmp_file_path, "columns": columns}))[0].text
+    )
+    assert text["mean_values"] == pytest.approx(row_to_dict(selected_df.mean()))
+
+    # Answers from the Parquet footer and from incremental statistics are projected as well
+    text = json.loads(
+        (await handle_data_count(arguments={"input_data_file_path": tmp_file_path, "columns": columns}))[0].text
+    )
+    assert text["counts"] == {col: 100 for col in selected_df.columns}
+    assert text["execution_path"] == (
+        METADATA_PATH if extension == SupportedFileType.parquet.value[1] else INCREMENTAL_PATH
+    )
+    arguments = {"input_data_file_path": tmp_file_path, "columns": [{"selector": "float"}]}
+    text = json.loads((await handle_data_schema(arguments=arguments))[0].text)
+    assert text["schema"] == {"price_net": "Float64", "price_gross": "Float64"}
+    text = json.loads((await handle_data_shape(arguments=arguments))[0].text)
+    assert (text["rows"], text["cols"]) == (100, 2)
+
+    text = json.loads(
+        (await handle_describe_data(arguments={"input_data_file_path": tmp_file_path, "columns": ["name"]}))[0].text
+    )
+    assert set(text["statistics"]) == {"name"}
+
+    text = json.loads(
+        (
+            await handle_data_mean(
+                arguments={"input_data_file_path": tmp_file_path, "columns": ["id"], "sample_fraction": 1.0}
+            )
+        )[0].text
+    )
+    assert text["mean_values"] == pytest.approx({"id": df["id"].mean()})
+
+    os.unlink(tmp_file_path)
@@ -0,0 +1,80 @@
+from datetime import date, datetime
+from typing import Any
+
+import numpy as np
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools.quantiles import INTERPOLATIONS, multi_quantile_query, quantile_frame
+
+
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(("interpolation",), [(interpolation,) for interpolation in INTERPOLATIONS])
+def test_quantile_frame_matches_polars(
+    mocker: Any,
+    scope_function: Any,
+    interpolation: str,
+) -> None:
+    rng = np.random.default_rng(0)
+    quantiles = [0.0, 0.01, 0.1, 0.25, 1 / 3, 0.5, 0.75, 0.9, 0.99, 1.0]
+    for size in [0, 1, 2, 7, 33]:
+        values = rng.normal(size=size)
+        nulls = rng.random(size) < 0.2
+        df = pl.DataFrame(
+            {
+                "a": [None if null else float(value) for value, null in zip(values, nulls)],
+                "b": [None if null else int(value * 100) for value, null in zip(values, nulls)],
+                "c": [f"x{i}" for i in range(size)],
+            },
+            schema={"a": pl.Float64, "b": pl.Int64, "c": pl.String},
+        )
+
+        result_df = multi_quantile_query(df.lazy(), quantiles, interpolation).collect()
+        got = quantile_frame(result_df, df.schema, quantiles, interpolation)
+
+        assert got.columns == df.columns
+        for k, quantile in enumerate(quantiles):
+            assert got.row(k) == df.quantile(quantile, interpolation=interpolation).row(0)  # type: ignore
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_quantile_frame_temporal(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    df = pl.DataFrame(
+        {
+            "d": [date(2024, 1, i) for i in range(1, 8)],
+            "t": [datetime(2024, 1, i, 3) for i in range(1, 8)],
+        }
+    )
+    quantiles = [0.3, 0.5]
+
+    got = quantile_frame(
+        multi_quantile_query(df.lazy(), quantiles, "linear", temporal=True).collect(),
+        df.schema,
+        quantiles,
+        "linear",
+    )
+    assert got.schema == df.schema
+    for k, quantile in enumerate(quantiles):
+        want = df.select(
+            pl.col(col).to_physical().quantile(quantile, "linear").cast(df.schema[col]) for col in df.columns
+        )
+        assert got.row(k) == want.row(0)
+
+    # Without temporal, temporal columns are null like LazyFrame.quantile
+    got = quantile_frame(multi_quantile_query(df.lazy(), quantiles).collect(), df.schema, quantiles)
+    assert got.null_count().row(0) == (2, 2)
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_multi_quantile_query_invalid(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    lf = pl.LazyFrame({"a": [1, 2, 3]})
+    with pytest.raises(ValueError):
+        multi_quantile_query(lf, [1.5])
+    with pytest.raises(ValueError):
+        multi_quantile_query(lf, [0.5], interpolation="cubic")
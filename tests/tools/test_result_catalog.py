@@ -0,0 +1,110 @@
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.server import call_tool
+from mcp_server_data_wrangler.tools.result_catalog import ResultCatalog
+
+
+def _write_csv(directory: str, name: str, rows: int) -> str:
+    file_path = os.path.join(directory, name)
+    pl.DataFrame({"a": list(range(rows)), "b": [i / 10 for i in range(rows)]}).write_csv(file_path)
+    return file_path
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_result_catalog_get_put(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    with tempfile.TemporaryDirectory() as storage_dir:
+        catalog = ResultCatalog(Path(storage_dir) / "catalog.sqlite", max_bytes=1024 * 1024, ttl_seconds=3600)
+        file_path = _write_csv(storage_dir, "input.csv", 10)
+        arguments = {"input_data_file_path": file_path, "ddof": 1}
+
+        assert catalog.get("data_std", arguments) is None
+        assert catalog.put("data_std", arguments, {"std_values": {"a": 1.0}})
+        assert catalog.get("data_std", arguments) == {"std_values": {"a": 1.0}}
+        # Argument order and surrounding whitespace do not matter
+        assert catalog.get("data_std", {"ddof": 1, "input_data_file_path": f" {file_path} "}) is not None
+        assert catalog.get("data_std", {**arguments, "ddof": 0}) is None
+        assert catalog.get("data_var", arguments) is None
+
+        # Persisted across instances
+        reopened = ResultCatalog(catalog.path, max_bytes=1024 * 1024, ttl_seconds=3600)
+        assert reopened.get("data_std", arguments) is not None
+
+        # A changed input file is a miss
+        _write_csv(storage_dir, "input.csv", 20)
+        assert catalog.get("data_std", arguments) is None
+
+        # Calls without an input file, and per-row tools, are not stored
+        assert not catalog.put("catalog", {}, {})
+        assert not catalog.put("data_mean_horizontal", arguments, {})
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_result_catalog_eviction(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    with tempfile.TemporaryDirectory() as storage_dir:
+        result = {"values": "x" * 100}
+        size = len(json.dumps(result))
+        catalog = ResultCatalog(Path(storage_dir) / "catalog.sqlite", max_bytes=size * 2, ttl_seconds=3600)
+        file_paths = [_write_csv(storage_dir, f"input{i}.csv", 10) for i in range(3)]
+
+        catalog.put("data_mean", {"input_data_file_path": file_paths[0]}, result)
+        catalog.put("data_mean", {"input_data_file_path": file_paths[1]}, result)
+        time.sleep(0.01)
+        assert catalog.get("data_mean", {"input_data_file_path": file_paths[0]}) is not None
+
+        # file_paths[1] is the least recently used entry
+        time.sleep(0.01)
+        catalog.put("data_mean", {"input_data_file_path": file_paths[2]}, result)
+        assert catalog.get("data_mean", {"input_data_file_path": file_paths[1]}) is None
+        assert catalog.get("data_mean", {"input_data_file_path": file_paths[0]}) is not None
+        assert catalog.stats()["entries"] == 2
+        assert catalog.stats()["current_bytes"] == size * 2
+
+        # Expired entries are not returned and can be purged
+        catalog.ttl_seconds = 0
+        time.sleep(0.01)
+        assert catalog.get("data_mean", {"input_data_file_path": file_paths[0]}) is None
+        assert catalog.purge(expired_only=True) == 2
+        assert catalog.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+async def test_call_tool_uses_catalog(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    with tempfile.TemporaryDirectory() as storage_dir:
+        mocker.patch(
+            "mcp_server_data_wrangler.tools.result_catalog.catalog_path",
+            return_value=Path(storage_dir) / "catalog.sqlite",
+        )
+        file_path = _write_csv(storage_dir, "input.csv", 10)
+        arguments = {"input_data_file_path": file_path}
+
+        first = json.loads((await call_tool("data_shape", arguments))[0].text)
+        compute = mocker.patch("mcp_server_data_wrangler.tools.data_shape.DataShapeInputSchema.from_args")
+        second = json.loads((await call_tool("data_shape", arguments))[0].text)
+        assert second == first
+        compute.assert_not_called()
+
+        text = json.loads((await call_tool("catalog", {"action": "list"}))[0].text)
+        assert [entry["tool"] for entry in text["results"]] == ["data_shape"]
+        text = json.loads((await call_tool("catalog", {"action": "purge", "tool": "data_shape"}))[0].text)
+        assert text["purged"] == 1
+        assert text["entries"] == 0
+        with pytest.raises(ValueError):
+            await call_tool("catalog", {"action": "drop"})
@@ -0,0 +1,96 @@
+import io
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.configurations import settings
+from mcp_server_data_wrangler.server import list_resources, read_resource
+from mcp_server_data_wrangler.tools import handle_data_mean_horizontal
+from mcp_server_data_wrangler.tools.result_store import read_result_resource, results_dir, spill_result
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("output", "inline_max_rows", "want_resource"),
+    [
+        ("resource", 10_000, True),
+        ("inline", 1, False),
+        ("auto", 5, True),
+        ("auto", 10_000, False),
+    ],
+)
+async def test_spill_horizontal_result(
+    mocker: Any,
+    scope_function: Any,
+    output: str,
+    inline_max_rows: int,
+    want_resource: bool,
+) -> None:
+    df = pl.DataFrame({"a": list(range(10)), "b": [i / 10 for i in range(10)]})
+    want = df.mean_horizontal()
+
+    with tempfile.TemporaryDirectory() as storage_dir:
+        mocker.patch("mcp_server_data_wrangler.tools.result_store.results_dir", return_value=Path(storage_dir))
+        mocker.patch("mcp_server_data_wrangler.tools.result_store.settings.INLINE_RESULT_MAX_ROWS", inline_max_rows)
+        tmp_file_path = os.path.join(storage_dir, "input.csv")
+        df.write_csv(tmp_file_path)
+
+        got = await handle_data_mean_horizontal(arguments={"input_data_file_path": tmp_file_path, "output": output})
+        text = json.loads(got[0].text)
+
+        if not want_resource:
+            assert "resource" not in text
+            assert len(text["mean_values"]) == df.height
+            return
+
+        assert "mean_values" not in text
+        assert text["summary"]["rows"] == df.height
+        assert float(text["summary"]["mean"]) == pytest.approx(want.mean())
+
+        uri = text["resource"]["uri"]
+        assert [str(resource.uri) for resource in await list_resources()] == [uri]
+        contents = await read_resource(uri)
+        got_df = pl.read_parquet(io.BytesIO(contents[0].content))
+        assert got_df.to_series().equals(want)
+
+        with pytest.raises(ValueError):
+            read_result_resource(uri.replace(text["resource"]["uri"].split("/")[-1], "../input.csv"))
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_stored_results_are_evicted(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    series = pl.Series("mean", [i / 10 for i in range(1_000)])
+
+    def stored() -> list[str]:
+        return sorted(path.name for path in results_dir().glob("*.parquet"))
+
+    uris = [spill_result(series, "data_mean_horizontal")["resource"]["uri"] for _ in range(2)]
+    size = spill_result(series, "data_mean_horizontal")["resource"]["size"]
+    assert len(stored()) == 3
+
+    # Above the budget, the least recently read results are deleted first
+    time.sleep(0.01)
+    read_result_resource(uris[0])
+    mocker.patch.object(settings, "RESULTS_MAX_BYTES", 3 * size)
+    uri = spill_result(series, "data_mean_horizontal")["resource"]["uri"]
+    assert uris[1].split("/")[-1] not in stored()
+    assert {uris[0].split("/")[-1], uri.split("/")[-1]} <= set(stored())
+    assert len(stored()) == 3
+
+    # Results unread for longer than the time to live are deleted
+    mocker.patch.object(settings, "RESULTS_TTL_SECONDS", 0.0)
+    time.sleep(0.01)
+    uri = spill_result(series, "data_mean_horizontal")["resource"]["uri"]
+    assert stored() == [uri.split("/")[-1]]
+    with pytest.raises(ValueError):
+        read_result_resource(uris[0])
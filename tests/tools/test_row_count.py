@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+from typing import Any
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools import handle_data_shape
+from mcp_server_data_wrangler.tools.model import Data, SupportedFileType
+from mcp_server_data_wrangler.tools.row_count import ROW_COUNT_PATH, count_csv_rows, record_starts
+
+
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("content",),
+    [
+        (b"a,b\n1,2\n3,4\n",),
+        (b"a,b\n1,2\n3,4",),
+        (b"a,b\r\n1,2\r\n3,4\r\n",),
+        (b"a,b\n1,2\n\n3,4\n\n",),
+        (b"a,b\n",),
+        (b'a,b\n1,"x\ny"\n3,"q""\n"\n',),
+        (b'"a\nb",c\n1,"\n\n\n"\n2,3',),
+    ],
+)
+@pytest.mark.parametrize(("block_bytes",), [(16 * 1024 * 1024,), (1,), (3,)])
+def test_count_csv_rows(
+    mocker: Any,
+    scope_function: Any,
+    content: bytes,
+    block_bytes: int,
+) -> None:
+    # Tiny blocks split quoted fields and line endings across block boundaries
+    mocker.patch("mcp_server_data_wrangler.tools.row_count._BLOCK_BYTES", block_bytes)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=SupportedFileType.csv.value[1]) as tmp_file:
+        tmp_file.write(content)
+        tmp_file_path = tmp_file.name
+
+    assert count_csv_rows(tmp_file_path) == pl.read_csv(tmp_file_path).height
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(("block_bytes",), [(16 * 1024 * 1024,), (1,), (3,)])
+def test_record_starts(
+    mocker: Any,
+    scope_function: Any,
+    block_bytes: int,
+) -> None:
+    mocker.patch("mcp_server_data_wrangler.tools.row_count._BLOCK_BYTES", block_bytes)
+    content = b'a,b\n1,"x\ny"\n3,"q""\n"\n5,6'
+    with tempfile.NamedTemporaryFile(delete=False, suffix=SupportedFileType.csv.value[1]) as tmp_file:
+        tmp_file.write(content)
+        tmp_file_path = tmp_file.name
+
+    # Records start at offsets 4, 12 and 21; the newlines at 8 and 18 are quoted
+    offsets = [len(content), 21, 0, 4, 5, 9, 12, 13, 19, 22]
+    assert record_starts(tmp_file_path, offsets) == [len(content), 21, 0, 4, 12, 12, 12, 21, 21, len(content)]
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+async def test_handle_data_shape_counts_rows_without_parsing(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    df = pl.DataFrame(
+        {
+            "id": list(range(1_000)),
+            "comment": [f'line one\nline "two" of {i}' if i % 7 == 0 else f"c{i}" for i in range(1_000)],
+            "price": [i / 10 for i in range(1_000)],
+        }
+    )
+    with tempfile.NamedTemporaryFile(delete=False, suffix=SupportedFileType.csv.value[1]) as tmp_file:
+        df.write_csv(tmp_file.name)
+        tmp_file_path = tmp_file.name
+    from_file = mocker.spy(Data, "from_file")
+
+    text = json.loads((await handle_data_shape(arguments={"input_data_file_path": tmp_file_path}))[0].text)
+    assert (text["rows"], text["cols"]) == df.shape
+    assert text["execution_path"] == ROW_COUNT_PATH
+    arguments: dict[str, Any] = {"input_data_file_path": tmp_file_path, "columns": ["id", "price"]}
+    text = json.loads((await handle_data_shape(arguments=arguments))[0].text)
+    assert (text["rows"], text["cols"]) == (1_000, 2)
+    assert from_file.call_count == 0
+
+    # A filter needs the parsed values
+    arguments = {"input_data_file_path": tmp_file_path, "filter": {"column": "id", "op": "<", "value": 10}}
+    text = json.loads((await handle_data_shape(arguments=arguments))[0].text)
+    assert text["rows"] == 10
+    assert text["execution_path"] != ROW_COUNT_PATH
+
+    os.unlink(tmp_file_path)
@@ -0,0 +1,215 @@
+import json
+import os
+import tempfile
+from typing import Any, Callable
+
+import numpy as np
+import polars as pl
+import pyarrow.parquet as pq  # type: ignore
+import pytest
+
+from mcp_server_data_wrangler.tools import (
+    handle_data_mean,
+    handle_data_quantile,
+    handle_data_std,
+    handle_describe_data,
+)
+from mcp_server_data_wrangler.tools.model import SupportedFileType
+from mcp_server_data_wrangler.tools.sampling import (
+    CSV_BYTE_RANGES,
+    PARQUET_ROW_GROUPS,
+    ROW_RANGES,
+    SampleSpec,
+    estimate_means,
+    sample_file,
+    t_critical_value,
+)
+
+
+def _write(df: pl.DataFrame, extension: str) -> str:
+    with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
+        if extension == SupportedFileType.csv.value[1]:
+            df.write_csv(tmp_file.name)
+        elif extension == SupportedFileType.tsv.value[1]:
+            df.write_csv(tmp_file.name, separator="\t")
+        elif extension == SupportedFileType.parquet.value[1]:
+            df.write_parquet(tmp_file.name, row_group_size=1_000)
+        else:
+            df.write_ipc(tmp_file.name)
+        return tmp_file.name
+
+
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension", "method"),
+    [
+        (SupportedFileType.csv.value[1], CSV_BYTE_RANGES),
+        (SupportedFileType.tsv.value[1], CSV_BYTE_RANGES),
+        (SupportedFileType.parquet.value[1], PARQUET_ROW_GROUPS),
+        (SupportedFileType.arrow.value[1], ROW_RANGES),
+    ],
+)
+def test_sample_file(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+    extension: str,
+    method: str,
+) -> None:
+    df = make_df(100_000)
+    tmp_file_path = _write(df, extension)
+
+    sample = sample_file(tmp_file_path, SampleSpec(sample_fraction=0.1, seed=1))
+    assert sample.method == method
+    assert sample.df.schema == df.schema
+    assert sample.num_clusters > 1
+    assert len(sample.clusters) == sample.df.height
+    assert 5_000 <= sample.df.height <= 20_000
+    assert sample.estimated_total_rows == pytest.approx(df.height, rel=0.05)
+
+    # Every sampled row is a whole row of the file, read at most once
+    assert sample.df.sort("a").equals(df.join(sample.df, on="a", how="semi"))
+    assert sample.df["a"].n_unique() == sample.df.height
+
+    # The sample depends only on the seed
+    assert sample_file(tmp_file_path, SampleSpec(sample_fraction=0.1, seed=1)).df.equals(sample.df)
+    assert not sample_file(tmp_file_path, SampleSpec(sample_fraction=0.1, seed=2)).df.equals(sample.df)
+
+    # The whole file is read when the sample is as large as the file
+    sample = sample_file(tmp_file_path, SampleSpec(sample_fraction=1.0))
+    assert sample.df.sort("a").equals(df)
+    mean, standard_error = estimate_means(sample)["b"]
+    assert mean == pytest.approx(df["b"].mean())
+    assert standard_error == pytest.approx(0.0, abs=1e-12)
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+async def test_sample_csv_with_quoted_newlines(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    # Byte ranges start and end inside quoted fields spanning several lines
+    df = make_df(20_000).with_columns(
+        pl.when(pl.col("a") % 3 == 0)
+        .then(pl.format('line1\n"{}"\n\nline4', pl.col("c")))
+        .otherwise(pl.col("c"))
+        .alias("c")
+    )
+    tmp_file_path = _write(df, SupportedFileType.csv.value[1])
+
+    sample = sample_file(tmp_file_path, SampleSpec(sample_fraction=0.2, seed=1))
+    assert sample.df.height > 0
+    assert sample.df.sort("a").equals(df.join(sample.df, on="a", how="semi"))
+    assert sample.df["a"].n_unique() == sample.df.height
+    assert sample_file(tmp_file_path, SampleSpec(sample_fraction=1.0)).df.sort("a").equals(df)
+
+    arguments = {"input_data_file_path": tmp_file_path, "columns": ["a"], "sample_rows": 5_000}
+    text = json.loads((await handle_data_mean(arguments=arguments))[0].text)
+    assert text["sample"]["method"] == CSV_BYTE_RANGES
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_sample_parquet_row_groups(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    df = make_df(30_000)
+    tmp_file_path = _write(df, SupportedFileType.parquet.value[1])
+
+    # Whole row groups are sub-sampled to the requested fraction, even when only two are read
+    small = sample_file(tmp_file_path, SampleSpec(sample_fraction=0.01))
+    large = sample_file(tmp_file_path, SampleSpec(sample_fraction=0.05))
+    assert small.num_clusters == 2
+    assert small.df.height == pytest.approx(300, abs=2)
+    assert large.df.height == pytest.approx(1_500, abs=2)
+    assert small.fraction == small.df.height / df.height
+
+    # Only the selected and filtered columns are decoded
+    read_row_group = mocker.spy(pq.ParquetFile, "read_row_group")
+    sample = sample_file(
+        tmp_file_path, SampleSpec(sample_fraction=0.1), columns=["b"], row_filter={"column": "a", "op": ">", "value": 5}
+    )
+    assert sample.df.columns == ["b"]
+    assert all(call.kwargs["columns"] == ["a", "b"] for call in read_row_group.call_args_list)
+
+    os.unlink(tmp_file_path)
+
+
+def test_t_critical_value() -> None:
+    # The intervals of samples with few clusters are widened by the t distribution
+    assert t_critical_value(1) == pytest.approx(12.706, abs=1e-3)
+    assert t_critical_value(2) == pytest.approx(4.303, abs=1e-3)
+    assert t_critical_value(9) == pytest.approx(2.262, abs=1e-3)
+    assert t_critical_value(30) == pytest.approx(2.042, abs=1e-3)
+    assert t_critical_value(10_000) == pytest.approx(1.960, abs=1e-3)
+
+
+def test_sample_spec() -> None:
+    assert SampleSpec.from_args({"input_data_file_path": "a.csv", "seed": 1}) is None
+    assert SampleSpec.from_args({"sample_rows": 10, "seed": 1}) == SampleSpec(sample_rows=10, seed=1)
+    assert SampleSpec(sample_fraction=0.5).target_rows(11) == 6
+    with pytest.raises(ValueError):
+        SampleSpec(sample_rows=10, sample_fraction=0.5)
+    with pytest.raises(ValueError):
+        SampleSpec(sample_fraction=0.0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(
+    ("extension",),
+    [
+        (SupportedFileType.csv.value[1],),
+        (SupportedFileType.parquet.value[1],),
+    ],
+)
+async def test_handlers_with_sample(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+    extension: str,
+) -> None:
+    # Normally distributed values, so the intervals and the standard deviation are known
+    df = make_df(100_000).with_columns(b=pl.Series(np.random.default_rng(0).normal(10.0, 2.0, 100_000)))
+    tmp_file_path = _write(df, extension)
+    arguments = {"input_data_file_path": tmp_file_path, "sample_rows": 20_000, "seed": 7}
+
+    text = json.loads((await handle_data_mean(arguments=arguments))[0].text)
+    low, high = text["confidence_intervals"]["b"]
+    assert low <= text["mean_values"]["b"] <= high
+    assert high - low < 0.2
+    assert text["standard_errors"]["b"] > 0
+    assert text["mean_values"]["c"] is None
+    assert text["confidence_intervals"]["c"] is None
+    assert text["sample"]["seed"] == 7
+    assert text["sample"]["confidence_level"] == 0.95
+
+    text = json.loads((await handle_data_std(arguments={**arguments, "ddof": 0}))[0].text)
+    low, high = text["confidence_intervals"]["b"]
+    assert low <= text["std_values"]["b"] <= high
+    assert text["std_values"]["b"] == pytest.approx(2.0, rel=0.05)
+
+    text = json.loads((await handle_data_quantile(arguments={**arguments, "quantiles": [0.25, 0.75]}))[0].text)
+    for quantile in ["0.25", "0.75"]:
+        low, high = text["confidence_intervals"][quantile]["b"]
+        assert low <= text["quantile_values"][quantile]["b"] <= high
+    assert text["quantile_values"]["0.75"]["b"] == pytest.approx(df["b"].quantile(0.75), rel=0.05)
+
+    text = json.loads((await handle_data_quantile(arguments=arguments))[0].text)
+    assert text["quantile_values"]["b"] == pytest.approx(df["b"].median(), rel=0.05)
+    assert len(text["confidence_intervals"]["b"]) == 2
+
+    text = json.loads((await handle_describe_data(arguments=arguments))[0].text)
+    assert text["statistics"]["b"]["count"] == text["sample"]["rows"]
+    assert text["statistics"]["b"]["mean"] == pytest.approx(df["b"].mean(), rel=0.05)
+    assert set(text["confidence_intervals"]["b"]) == {"mean", "std", "25%", "50%", "75%"}
+    assert text["confidence_intervals"]["c"]["mean"] is None
+
+    os.unlink(tmp_file_path)
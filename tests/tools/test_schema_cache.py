@@ -0,0 +1,156 @@
+import gzip
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.configurations import settings
+from mcp_server_data_wrangler.tools import handle_data_max, handle_data_mean, handle_data_schema
+from mcp_server_data_wrangler.tools.cache import FileFingerprint, dataframe_cache
+from mcp_server_data_wrangler.tools.decompress import Compression
+from mcp_server_data_wrangler.tools.model import Data, SupportedFileType
+from mcp_server_data_wrangler.tools.parquet_metadata import METADATA_PATH
+from mcp_server_data_wrangler.tools.schema_cache import SchemaCache, parse_dtype
+
+# Text whose inferred type depends on the rows read, derived from the rows of the make_df fixture
+_TEXT_COLUMNS = [
+    # Integers in the first rows, floats further down
+    pl.when(pl.col("a") < 500).then(pl.col("a").cast(pl.String)).otherwise(pl.format("{}.5", "a")).alias("amount"),
+    (pl.col("a") % 1000).cast(pl.String).str.zfill(5).alias("zip"),
+    pl.col("c").alias("name"),
+]
+
+
+@pytest.mark.parametrize(
+    ("dtype",),
+    [
+        (pl.Int64(),),
+        (pl.String(),),
+        (pl.Date(),),
+        (pl.Datetime(time_unit="ms", time_zone="UTC"),),
+        (pl.Decimal(10, 2),),
+    ],
+)
+def test_parse_dtype(dtype: pl.DataType) -> None:
+    assert parse_dtype(str(dtype)) == dtype
+
+
+@pytest.mark.parametrize(("name",), [("Text",), ("DataFrame",), ("Datetime(unit=",), ("Datetime(print(1))",)])
+def test_parse_dtype_errors(name: str) -> None:
+    with pytest.raises(ValueError):
+        parse_dtype(name)
+
+
+def _write_csv(df: pl.DataFrame, file_path: str) -> None:
+    if file_path.endswith(Compression.gzip.extension):
+        with gzip.open(file_path, "wb") as file:
+            file.write(df.write_csv().encode())
+    else:
+        df.write_csv(file_path)
+
+
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(("suffix",), [(SupportedFileType.csv.value[1],), (f"{SupportedFileType.csv.value[1]}.gz",)])
+def test_schema_is_persisted_and_reinferred_on_change(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+    suffix: str,
+) -> None:
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        tmp_file_path = tmp_file.name
+    _write_csv(make_df(1_000).select(_TEXT_COLUMNS), tmp_file_path)
+
+    # Inference looks past the first 100 rows, so the column is not cut to integers
+    schema = Data.csv_schema(tmp_file_path)
+    assert schema["amount"] == pl.Float64
+    sidecar = json.loads(SchemaCache.sidecar_path(FileFingerprint.from_path(tmp_file_path)).read_text())
+    assert sidecar["schema"]["amount"] == "Float64"
+
+    # A new process reads the sidecar instead of inferring again
+    infer = mocker.Mock(side_effect=AssertionError("schema inferred again"))
+    assert SchemaCache().get(FileFingerprint.from_path(tmp_file_path), infer) == schema
+    infer.assert_not_called()
+
+    # Rewriting the file invalidates the sidecar
+    _write_csv(pl.DataFrame({"amount": ["a", "b"]}), tmp_file_path)
+    assert Data.csv_schema(tmp_file_path) == pl.Schema({"amount": pl.String})
+
+    os.unlink(tmp_file_path)
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_sidecars_are_evicted(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+    storage_path: Path,
+) -> None:
+    with tempfile.TemporaryDirectory() as data_dir:
+        file_paths = [os.path.join(data_dir, f"input{i}.csv") for i in range(3)]
+        for file_path in file_paths:
+            _write_csv(make_df(10).select(_TEXT_COLUMNS), file_path)
+        Data.csv_schema(file_paths[0])
+        sidecar_bytes = SchemaCache.sidecar_path(FileFingerprint.from_path(file_paths[0])).stat().st_size
+        mocker.patch.object(settings, "SCHEMA_CACHE_MAX_BYTES", 2 * sidecar_bytes)
+
+        Data.csv_schema(file_paths[1])
+        time.sleep(0.01)
+        # Reading a sidecar in a new process marks it as used
+        SchemaCache().get(FileFingerprint.from_path(file_paths[0]), mocker.Mock())
+        time.sleep(0.01)
+        Data.csv_schema(file_paths[2])
+
+        # The least recently used sidecar is evicted
+        assert sorted(path.name for path in (storage_path / "schemas").glob("*.json")) == sorted(
+            SchemaCache.sidecar_path(FileFingerprint.from_path(file_path)).name
+            for file_path in (file_paths[0], file_paths[2])
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("scope_function")
+async def test_handlers_with_dtypes(
+    mocker: Any,
+    scope_function: Any,
+    make_df: Callable[..., pl.DataFrame],
+) -> None:
+    df = make_df(1_000).select(_TEXT_COLUMNS)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=SupportedFileType.csv.value[1]) as tmp_file:
+        df.write_csv(tmp_file.name)
+        tmp_file_path = tmp_file.name
+    dataframe_cache.clear()
+    put = mocker.spy(dataframe_cache, "put")
+
+    # The schema is answered from the cached schema without loading the file
+    text = json.loads((await handle_data_schema(arguments={"input_data_file_path": tmp_file_path}))[0].text)
+    assert text["schema"] == {"amount": "Float64", "zip": "Int64", "name": "String"}
+    assert text["execution_path"] == METADATA_PATH
+    assert put.call_count == 0
+
+    arguments = {"input_data_file_path": tmp_file_path, "dtypes": {"zip": "String"}}
+    text = json.loads((await handle_data_schema(arguments=arguments))[0].text)
+    assert text["schema"]["zip"] == "String"
+    # Leading zeros are kept when the column is read as strings
+    text = json.loads((await handle_data_max(arguments={**arguments, "columns": ["zip"]}))[0].text)
+    assert text["max_values"] == {"zip": df["zip"].max()}
+    # Sampled byte ranges are parsed with the overridden schema too
+    text = json.loads(
+        (await handle_data_mean(arguments={**arguments, "columns": ["amount"], "sample_fraction": 1.0}))[0].text
+    )
+    assert text["mean_values"] == pytest.approx({"amount": df["amount"].cast(pl.Float64).mean()})
+    # Overrides never load the file into the cache
+    assert put.call_count == 0
+
+    with pytest.raises(ValueError):
+        await handle_data_schema(arguments={"input_data_file_path": tmp_file_path, "dtypes": {"missing": "Int64"}})
+    with pytest.raises(ValueError):
+        await handle_data_schema(arguments={"input_data_file_path": tmp_file_path, "dtypes": {"zip": "Text"}})
+
+    dataframe_cache.clear()
+    os.unlink(tmp_file_path)
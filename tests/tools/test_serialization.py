@@ -0,0 +1,83 @@
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools.serialization import (
+    columns_to_dict,
+    dumps,
+    row_to_dict,
+    series_to_list,
+    to_json_value,
+)
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_row_to_dict_native_types(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    df = pl.DataFrame(
+        {
+            "int": [1],
+            "float": [0.5],
+            "nan": [float("nan")],
+            "inf": [float("inf")],
+            "bool": [True],
+            "str": ["x"],
+            "null": [None],
+            "date": [date(2024, 1, 2)],
+            "datetime": [datetime(2024, 1, 2, 3, 4, 5, 6000)],
+            "datetime_tz": [datetime(2024, 1, 2, 3, 4, 5)],
+            "duration": [timedelta(hours=1)],
+            "decimal": [Decimal("1.25")],
+            "categorical": ["c"],
+        },
+        schema_overrides={"decimal": pl.Decimal(10, 2), "categorical": pl.Categorical},
+    ).with_columns(pl.col("datetime_tz").dt.replace_time_zone("UTC"))
+
+    got = row_to_dict(df)
+    assert got == {
+        "int": 1,
+        "float": 0.5,
+        "nan": None,
+        "inf": None,
+        "bool": True,
+        "str": "x",
+        "null": None,
+        "date": "2024-01-02",
+        "datetime": "2024-01-02T03:04:05.006",
+        "datetime_tz": "2024-01-02T03:04:05+00:00",
+        "duration": "PT1H",
+        "decimal": 1.25,
+        "categorical": "c",
+    }
+    assert json.loads(dumps(got)) == got
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_columns_and_series(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    df = pl.DataFrame({"a": [1.0, float("nan"), None], "b": ["x", "y", "z"]})
+    assert columns_to_dict(df) == {"a": [1.0, None, None], "b": ["x", "y", "z"]}
+    assert series_to_list(df["a"]) == [1.0, None, None]
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_to_json_value(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    assert to_json_value(1) == 1
+    assert to_json_value(float("-inf")) is None
+    assert to_json_value(date(2024, 1, 2)) == "2024-01-02"
+    assert to_json_value(datetime(2024, 1, 2, 3, 4, 5)) == "2024-01-02T03:04:05"
+    assert to_json_value(Decimal("1.5")) == 1.5
+    assert to_json_value(timedelta(hours=1, seconds=30)) == "PT1H30S"
+    assert to_json_value(b"ab") == "6162"
+    assert to_json_value(None) is None
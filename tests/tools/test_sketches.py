@@ -0,0 +1,113 @@
+from typing import Any
+
+import numpy as np
+import polars as pl
+import pytest
+
+from mcp_server_data_wrangler.tools.sketches import HyperLogLog, KLLSketch
+
+
+def _rank_errors(sketch: KLLSketch, values: np.ndarray, quantiles: list[float]) -> list[float]:
+    sorted_values = np.sort(values)
+    errors = []
+    for quantile, estimate in zip(quantiles, sketch.quantiles(quantiles)):
+        assert estimate is not None
+        errors.append(abs(float(np.searchsorted(sorted_values, estimate)) / values.size - quantile))
+    return errors
+
+
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(("rank_error",), [(0.05,), (0.01,)])
+def test_kll_sketch_rank_error(
+    mocker: Any,
+    scope_function: Any,
+    rank_error: float,
+) -> None:
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(size=200_000)
+    quantiles = [0.01, 0.1, 0.5, 0.9, 0.99]
+
+    sketch = KLLSketch(KLLSketch.k_for_rank_error(rank_error), seed=0)
+    for batch in np.array_split(values, 13):
+        sketch.update(batch)
+
+    assert sketch.count == values.size
+    assert sketch.rank_error() <= rank_error
+    assert max(_rank_errors(sketch, values, quantiles)) <= rank_error
+    # Memory is bounded by the sketch size, not by the number of values
+    assert sum(level.size for level in sketch.levels) < values.size / 50
+    assert sketch.quantiles([0.0, 1.0]) == [values.min(), values.max()]
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_kll_sketch_merge(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=100_000)
+    k = KLLSketch.k_for_rank_error(0.01)
+
+    sketches = [KLLSketch(k, seed=i) for i in range(4)]
+    for sketch, batch in zip(sketches, np.array_split(values, 4)):
+        sketch.update(batch)
+    merged = KLLSketch(k, seed=4)
+    for sketch in sketches:
+        merged.merge(sketch)
+
+    assert merged.count == values.size
+    assert max(_rank_errors(merged, values, [0.25, 0.5, 0.75])) <= merged.rank_error()
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_kll_sketch_empty(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    sketch = KLLSketch()
+    sketch.update(np.array([np.nan]))
+    assert sketch.count == 0
+    assert sketch.quantiles([0.5]) == [None]
+
+    with pytest.raises(ValueError):
+        KLLSketch.k_for_rank_error(0.0)
+
+
+@pytest.mark.usefixtures("scope_function")
+@pytest.mark.parametrize(("precision", "n"), [(10, 100), (12, 5_000), (14, 300_000)])
+def test_hyperloglog_estimate(
+    mocker: Any,
+    scope_function: Any,
+    precision: int,
+    n: int,
+) -> None:
+    hashes = pl.Series([f"v{i}" for i in range(n)] * 2).hash(seed=0).to_numpy()
+
+    sketch = HyperLogLog(precision)
+    for batch in np.array_split(hashes, 7):
+        sketch.update(batch)
+
+    # Well within four standard errors
+    assert abs(sketch.estimate() - n) <= 4 * sketch.relative_error() * n + 1
+
+
+@pytest.mark.usefixtures("scope_function")
+def test_hyperloglog_merge(
+    mocker: Any,
+    scope_function: Any,
+) -> None:
+    hashes = pl.Series(range(100_000)).hash(seed=0).to_numpy()
+
+    whole = HyperLogLog(12)
+    whole.update(hashes)
+    left, right = HyperLogLog(12), HyperLogLog(12)
+    left.update(hashes[:60_000])
+    right.update(hashes[40_000:])
+    left.merge(right)
+
+    assert np.array_equal(left.registers, whole.registers)
+    assert HyperLogLog(12).estimate() == 0
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(10))
+    with pytest.raises(ValueError):
+        HyperLogLog(3)